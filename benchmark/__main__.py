@@ -0,0 +1,4 @@
+import sys
+from benchmark.cli import main
+
+sys.exit(main())
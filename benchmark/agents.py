@@ -0,0 +1,79 @@
+from typing import Dict, Any, Optional
+import asyncio
+import time
+import aiohttp
+from benchmark.telemetry import current_call
+
+class HTTPAgent:
+    """Agent served over HTTP
+
+    ``analyze`` and ``act`` POST their arguments as JSON to the agent
+    endpoint, tagged with the method name, and return the decoded JSON
+    response. A shared ``aiohttp.ClientSession`` can be passed in so many
+    agents reuse one connection pool.
+
+    Connection errors, timeouts and 5xx responses are retried up to
+    ``max_retries`` times with exponential backoff. Under an instrumented
+    call, time to first byte and retries are reported to its CallRecord.
+    Responses are only cached or reused by regression runs when the
+    endpoint is declared ``deterministic`` and reports a ``version``;
+    sampling endpoints must keep the default.
+    """
+
+    def __init__(self,
+                 url: str,
+                 agent_id: Optional[str] = None,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 timeout: float = 300.0,
+                 version: Optional[str] = None,
+                 deterministic: bool = False,
+                 max_retries: int = 0,
+                 retry_backoff: float = 0.5):
+        self.url = url
+        self.id = agent_id or url
+        self.version = version
+        self.deterministic = deterministic
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._session = session
+        self._owns_session = session is None
+
+    async def analyze(self, data: Any, prompt: str) -> Any:
+        return await self._call("analyze", {"data": data, "prompt": prompt})
+
+    async def act(self, data: Any, opponent_actions: Optional[Dict[str, Any]] = None) -> Any:
+        return await self._call("act", {"data": data, "opponent_actions": opponent_actions})
+
+    async def close(self):
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _call(self, method: str, payload: Dict[str, Any]) -> Any:
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+
+        call = current_call()
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                async with self._session.post(
+                    self.url,
+                    json={"method": method, **payload},
+                    timeout=self.timeout
+                ) as response:
+                    if call:
+                        # Headers are in, so the first byte has arrived
+                        call.ttfb = time.perf_counter() - started
+                    response.raise_for_status()
+                    return await response.json()
+            except aiohttp.ClientResponseError as e:
+                if e.status < 500 or attempt == self.max_retries:
+                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+            if call:
+                call.retries += 1
+            await asyncio.sleep(self.retry_backoff * 2 ** attempt)
@@ -0,0 +1,90 @@
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
+import math
+
+@dataclass
+class RunningStat:
+    """Running count, mean and variance (Welford) of a single metric"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    total: float = 0.0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+
+    def update(self, value: float):
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": math.sqrt(self.variance),
+            "total": self.total,
+            "min": self.minimum if self.count else 0.0,
+            "max": self.maximum if self.count else 0.0
+        }
+
+class MetricAggregator:
+    """Incrementally aggregates per-participant metrics round by round
+
+    Round metrics are expected as ``{participant: {metric: value}}``; a bare
+    number per participant is tracked as the ``score`` metric. Non-numeric
+    values are ignored.
+    """
+
+    def __init__(self):
+        self.rounds = 0
+        self._stats: Dict[str, Dict[str, RunningStat]] = {}
+
+    def update(self, round_metrics: Dict[str, Any]):
+        """Fold one round's metrics into the running totals"""
+        self.rounds += 1
+        for participant, metrics in round_metrics.items():
+            if not isinstance(metrics, dict):
+                metrics = {"score": metrics}
+
+            stats = self._stats.setdefault(participant, {})
+            for metric, value in metrics.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                stats.setdefault(metric, RunningStat()).update(float(value))
+
+    def final_scores(self) -> Dict[str, Dict[str, float]]:
+        """Mean of every metric per participant"""
+        return {
+            participant: {metric: stat.mean for metric, stat in stats.items()}
+            for participant, stats in self._stats.items()
+        }
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Full running statistics per participant and metric"""
+        return {
+            participant: {metric: stat.to_dict() for metric, stat in stats.items()}
+            for participant, stats in self._stats.items()
+        }
+
+    def standings(self, metric: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Live standings ordered by one metric, or by the sum of metric means"""
+        entries = []
+        for participant, stats in self._stats.items():
+            if metric is None:
+                score = sum(stat.mean for stat in stats.values())
+            else:
+                score = stats[metric].mean if metric in stats else 0.0
+            entries.append({"participant": participant, "score": score})
+
+        entries.sort(key=lambda entry: entry["score"], reverse=True)
+        for rank, entry in enumerate(entries, 1):
+            entry["rank"] = rank
+        return entries
@@ -1,7 +1,13 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Sequence, Union, Callable, Awaitable
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
+import asyncio
+from benchmark.battle.aggregation import MetricAggregator
+from benchmark.battle.replay import ReplayWriter, ReplayReader
+from benchmark.results import fingerprint
+from benchmark.telemetry import CallTelemetry
+from benchmark.trajectories import TrajectoryWriter
 
 class BattleMode(Enum):
     HEAD_TO_HEAD = "head_to_head"
@@ -21,77 +27,240 @@ class AgentBattle:
     def __init__(self, 
                  category: str,
                  max_rounds: int = 10,
-                 environment: str = "competitive"):
+                 environment: str = "competitive",
+                 turn_order: Optional[Sequence[Union[str, Sequence[str]]]] = None,
+                 response_cache=None,
+                 round_evaluator: Optional[Callable[[Dict[str, Any], List[str]], Awaitable[Dict[str, Any]]]] = None):
         self.category = category
         self.max_rounds = max_rounds
         self.environment = environment
+        # Competitive turn order: each entry is an agent ID or a group of IDs
+        # acting together, seeing only the actions of earlier entries
+        self.turn_order = turn_order
+        # Optional ResponseCache for agents answering deterministically
+        self.response_cache = response_cache
+        # Scores a round's actions per agent and metric, unless a subclass
+        # overrides _evaluate_round
+        self.round_evaluator = round_evaluator
         self.agents: Dict[str, Any] = {}
+        self.aggregator = MetricAggregator()
+        self.telemetry = CallTelemetry()
         
     def register_agent(self, agent_id: str, agent: Any):
         """Register an agent for battle"""
         self.agents[agent_id] = agent
         
+    @property
+    def scores_rounds(self) -> bool:
+        """Whether rounds can be scored, checked before any agent is called"""
+        return self.round_evaluator is not None or overrides_evaluation(type(self))
+        
+    def check_round_evaluator(self):
+        """Raise ValueError when this battle has no way to score its rounds"""
+        if not self.scores_rounds:
+            raise ValueError(
+                f"{type(self).__name__} needs a round_evaluator or an _evaluate_round override"
+            )
+        
     async def run_competition(self, 
                             data_source: Any,
-                            metrics: List[str]) -> Dict[str, Any]:
-        """Run head-to-head competition"""
+                            metrics: List[str],
+                            log_path: Optional[str] = None,
+                            trajectory_dir: Optional[str] = None) -> Dict[str, Any]:
+        """Run head-to-head competition
+        
+        Per-agent metrics are aggregated as each round finishes. When
+        ``log_path`` is given, full round records are written to a compressed
+        replay log there instead of being kept in ``results["rounds"]``.
+        With ``trajectory_dir``, every agent action is also recorded in the
+        agent's trajectory, indexed by round. Latency and token usage of
+        every agent call are summarized per agent in ``results["telemetry"]``.
+        """
+        self.check_round_evaluator()
         results = {
             "timestamp": datetime.now().isoformat(),
             "category": self.category,
             "rounds": [],
             "final_scores": {}
         }
+        self.aggregator = MetricAggregator()
+        self.telemetry = CallTelemetry()
+        round_log = ReplayWriter(log_path) if log_path else None
+        trajectories = TrajectoryWriter(trajectory_dir) if trajectory_dir else None
         
-        for round_num in range(self.max_rounds):
-            round_results = await self._run_round(
-                round_num=round_num,
-                data_source=data_source,
-                metrics=metrics
-            )
-            results["rounds"].append(round_results)
+        # Round k+1 data is fetched while round k is being evaluated
+        next_data = (
+            asyncio.ensure_future(self._get_round_data(data_source, 0))
+            if self.max_rounds > 0 else None
+        )
+        
+        try:
+            for round_num in range(self.max_rounds):
+                data = await next_data
+                agent_actions = await self._collect_actions(data)
+                if trajectories:
+                    for agent_id, action in agent_actions.items():
+                        trajectories.record(agent_id, "action", action, round=round_num)
+                        trajectories.finish(agent_id, round=round_num)
+                
+                if round_num + 1 < self.max_rounds:
+                    next_data = asyncio.ensure_future(
+                        self._get_round_data(data_source, round_num + 1)
+                    )
+                    
+                round_results = {
+                    "round": round_num,
+                    "agent_actions": agent_actions,
+                    "metrics": await self._evaluate_round(agent_actions, metrics)
+                }
+                self.aggregator.update(round_results["metrics"])
+                
+                if round_log:
+                    round_log.append(round_results)
+                else:
+                    results["rounds"].append(round_results)
+        finally:
+            # A round that failed leaves the next round's fetch in flight
+            if next_data is not None:
+                next_data.cancel()
+            if round_log:
+                round_log.close()
+            if trajectories:
+                trajectories.close()
             
-        results["final_scores"] = self._calculate_final_scores(results["rounds"])
+        results["rounds_played"] = self.aggregator.rounds
+        results["final_scores"] = self.aggregator.final_scores()
+        results["telemetry"] = self.telemetry.by_participant("agent")
+        if log_path:
+            results["round_log"] = log_path
         return results
     
+    def get_standings(self, metric: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Live standings of the current or last competition"""
+        return self.aggregator.standings(metric)
+    
     async def _run_round(self,
                         round_num: int,
                         data_source: Any,
                         metrics: List[str]) -> Dict[str, Any]:
         """Run a single competition round"""
-        round_results = {
+        data = await self._get_round_data(data_source, round_num)
+        agent_actions = await self._collect_actions(data)
+        
+        return {
             "round": round_num,
-            "agent_actions": {},
-            "metrics": {}
+            "agent_actions": agent_actions,
+            "metrics": await self._evaluate_round(agent_actions, metrics)
         }
-        
-        # Get round data
-        data = await data_source.get_data({
+    
+    async def _evaluate_round(self,
+                              agent_actions: Dict[str, Any],
+                              metrics: List[str]) -> Dict[str, Dict[str, float]]:
+        """Score every agent's round action on each metric"""
+        return await self.round_evaluator(agent_actions, metrics)
+    
+    async def _get_round_data(self, data_source: Any, round_num: int) -> Dict[str, Any]:
+        """Fetch the data for a round"""
+        return await data_source.get_data({
             "round": round_num,
             "competitive": True
         })
+    
+    async def _collect_actions(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Have every agent act on the round data"""
+        if self.environment != "competitive":
+            # Agents are independent, so they can all act at once
+            agent_ids = list(self.agents)
+            actions = await asyncio.gather(*[
+                self._agent(agent_id).act(data, opponent_actions=None)
+                for agent_id in agent_ids
+            ])
+            return dict(zip(agent_ids, actions))
         
-        # Each agent takes action
-        for agent_id, agent in self.agents.items():
-            action = await agent.act(
-                data,
-                opponent_actions=round_results["agent_actions"]
-                if self.environment == "competitive" else None
-            )
-            round_results["agent_actions"][agent_id] = action
+        # Competitive agents act in turn order; agents sharing a turn act
+        # concurrently and see the actions of all earlier turns
+        agent_actions = {}
+        for turn in self._get_turns():
+            visible_actions = dict(agent_actions)
+            actions = await asyncio.gather(*[
+                self._agent(agent_id).act(data, opponent_actions=visible_actions)
+                for agent_id in turn
+            ])
+            agent_actions.update(zip(turn, actions))
             
-        # Evaluate round
-        round_results["metrics"] = await self._evaluate_round(
-            round_results["agent_actions"],
-            metrics
-        )
+        return agent_actions
+    
+    def _agent(self, agent_id: str) -> Any:
+        """Registered agent with its calls recorded in the battle telemetry"""
+        agent = self.telemetry.instrument(self.agents[agent_id], "agent", agent_id)
+        if self.response_cache:
+            # Round data and visible opponent actions are part of the key
+            scope = fingerprint({"battle": self.category, "environment": self.environment})
+            agent = self.response_cache.wrap(agent, scope)
+        return agent
+    
+    def _get_turns(self) -> List[List[str]]:
+        """Resolve the configured turn order into groups of agent IDs
         
-        return round_results
+        Every registered agent must appear exactly once.
+        """
+        if self.turn_order is None:
+            return [[agent_id] for agent_id in self.agents]
+        
+        turns = []
+        for entry in self.turn_order:
+            turn = [entry] if isinstance(entry, str) else list(entry)
+            unknown = [agent_id for agent_id in turn if agent_id not in self.agents]
+            if unknown:
+                raise ValueError(f"Unknown agents in turn order: {unknown}")
+            turns.append(turn)
+            
+        ordered = [agent_id for turn in turns for agent_id in turn]
+        duplicated = sorted({agent_id for agent_id in ordered if ordered.count(agent_id) > 1})
+        if duplicated:
+            raise ValueError(f"Agents listed more than once in turn order: {duplicated}")
+        missing = [agent_id for agent_id in self.agents if agent_id not in ordered]
+        if missing:
+            raise ValueError(f"Agents missing from turn order: {missing}")
+        return turns
+    
+    async def run_tournament(self,
+                             data_source: Any,
+                             metrics: List[str],
+                             **tournament_options) -> Dict[str, Any]:
+        """Rank registered agents with a Swiss-system tournament
+        
+        Matches are scored like this battle's rounds, unless a
+        ``round_evaluator`` or ``battle_factory`` is passed in.
+        """
+        from benchmark.battle.tournament import SwissTournament
+        
+        if self.scores_rounds:
+            tournament_options.setdefault("round_evaluator", self._evaluate_round)
+        tournament = SwissTournament(
+            category=self.category,
+            agents=self.agents,
+            rounds_per_match=self.max_rounds,
+            environment=self.environment,
+            **tournament_options
+        )
+        results = await tournament.run(data_source, metrics)
+        results["mode"] = BattleMode.TOURNAMENT.value
+        return results
     
     def generate_report(self, results: Dict[str, Any]) -> Dict[str, Any]:
         """Generate battle report with insights"""
+        if results.get("round_log") and not results.get("rounds"):
+            # Stream rounds from the replay log instead of loading them all
+            results = dict(results, rounds=ReplayReader(results["round_log"]))
+            
         return {
             "summary": self._generate_summary(results),
             "detailed_metrics": self._analyze_metrics(results),
             "agent_strategies": self._analyze_strategies(results),
             "recommendations": self._generate_recommendations(results)
-        } 
\ No newline at end of file
+        } 
+
+def overrides_evaluation(battle_class: type) -> bool:
+    """Whether a battle class scores rounds without a round_evaluator"""
+    return battle_class._evaluate_round is not AgentBattle._evaluate_round
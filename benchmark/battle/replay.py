@@ -0,0 +1,108 @@
+from typing import Dict, Any, Iterator, Optional
+import json
+import os
+import struct
+import zlib
+
+_LENGTH = struct.Struct(">I")
+_OFFSET = struct.Struct(">Q")
+
+def _index_path(path: str) -> str:
+    return f"{path}.idx"
+
+class ReplayWriter:
+    """Appends compressed battle records to a replay log
+
+    Each record (one round or stage) is stored as a length-prefixed zlib
+    frame. A fixed-width sidecar index holds the byte offset of every frame,
+    so readers can seek to any record without scanning the log.
+
+    An existing log is truncated, so it holds only the run being written.
+    With ``resume``, records are appended after those already indexed.
+    """
+
+    def __init__(self, path: str, compression_level: int = 6, resume: bool = False):
+        self.path = path
+        self.compression_level = compression_level
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        mode = "ab" if resume else "wb"
+        self._data = open(path, mode)
+        self._index = open(_index_path(path), mode)
+        if resume:
+            # Drop a partially written offset left by an interrupted append
+            size = self._index.tell()
+            self._index.truncate(size - size % _OFFSET.size)
+
+    def append(self, record: Dict[str, Any]):
+        payload = json.dumps(record, default=str, separators=(",", ":")).encode("utf-8")
+        frame = zlib.compress(payload, self.compression_level)
+        offset = self._data.tell()
+
+        self._data.write(_LENGTH.pack(len(frame)))
+        self._data.write(frame)
+        self._data.flush()
+
+        # The index is only written once the frame is on disk
+        self._index.write(_OFFSET.pack(offset))
+        self._index.flush()
+
+    def close(self):
+        self._data.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ReplayReader:
+    """Random-access reader for a replay log written by ReplayWriter"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __len__(self) -> int:
+        return os.path.getsize(_index_path(self.path)) // _OFFSET.size
+
+    def __getitem__(self, position: int) -> Dict[str, Any]:
+        if position < 0:
+            position += len(self)
+        return self.read(position)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_range()
+
+    def read(self, position: int) -> Dict[str, Any]:
+        """Read a single record by position"""
+        if not 0 <= position < len(self):
+            raise IndexError(f"Replay record out of range: {position}")
+
+        with open(self.path, "rb") as data, open(_index_path(self.path), "rb") as index:
+            return self._read_frame(data, self._offset(index, position))
+
+    def iter_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Stream records in ``[start, stop)``, one frame in memory at a time"""
+        count = len(self)
+        stop = count if stop is None else min(stop, count)
+        if start >= stop:
+            return
+
+        with open(self.path, "rb") as data, open(_index_path(self.path), "rb") as index:
+            data.seek(self._offset(index, start))
+            for _ in range(start, stop):
+                yield self._read_frame(data)
+
+    @staticmethod
+    def _offset(index, position: int) -> int:
+        index.seek(position * _OFFSET.size)
+        return _OFFSET.unpack(index.read(_OFFSET.size))[0]
+
+    @staticmethod
+    def _read_frame(data, offset: Optional[int] = None) -> Dict[str, Any]:
+        if offset is not None:
+            data.seek(offset)
+        (length,) = _LENGTH.unpack(data.read(_LENGTH.size))
+        return json.loads(zlib.decompress(data.read(length)))
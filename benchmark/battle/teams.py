@@ -1,5 +1,14 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from dataclasses import dataclass
+import asyncio
+import json
+import os
+from benchmark.battle.aggregation import MetricAggregator
+from benchmark.battle.replay import ReplayWriter
+from benchmark.response_cache import agent_key
+from benchmark.results import fingerprint
+from benchmark.telemetry import CallTelemetry
+from benchmark.trajectories import TrajectoryWriter
 
 @dataclass
 class AITeam:
@@ -28,32 +37,83 @@ class TeamBattle:
     def __init__(self,
                  teams: List[AITeam],
                  scenario: BusinessScenario,
-                 collaboration_enabled: bool = True):
+                 collaboration_enabled: bool = True,
+                 checkpoint_dir: Optional[str] = None):
         self.teams = teams
         self.scenario = scenario
         self.collaboration_enabled = collaboration_enabled
+        self.checkpoint_dir = checkpoint_dir
+        self.aggregator = MetricAggregator()
+        self.telemetry = CallTelemetry()
         
-    async def execute(self) -> Dict[str, Any]:
-        """Run full team competition"""
+    async def execute(self,
+                      log_path: Optional[str] = None,
+                      resume: bool = True,
+                      trajectory_dir: Optional[str] = None) -> Dict[str, Any]:
+        """Run full team competition
+        
+        Team metrics are aggregated as each stage finishes. When ``log_path``
+        is given, full stage records are written to a compressed replay log
+        there instead of being kept in ``results["stages"]``. With a ``checkpoint_dir``, every
+        completed stage is checkpointed and, when ``resume`` is set, stages
+        already checkpointed are loaded instead of being run again. The
+        checkpoints are deleted once every stage has completed, so only an
+        interrupted execution can be resumed.
+        ``trajectory_dir`` records every team action, indexed by stage.
+        Latency and token usage of agent calls made in this execution are
+        summarized per ``team/role`` in ``results["telemetry"]``.
+        """
         results = {
             "scenario": self.scenario.name,
             "teams": {},
             "stages": []
         }
+        self.aggregator = MetricAggregator()
+        self.telemetry = CallTelemetry()
+        stage_log = ReplayWriter(log_path) if log_path else None
+        trajectories = TrajectoryWriter(trajectory_dir) if trajectory_dir else None
         
         # Parse duration into stages
         total_stages = self._parse_duration(self.scenario.duration)
         
         # Run each stage
-        for stage in range(total_stages):
-            stage_results = await self._run_stage(stage)
-            results["stages"].append(stage_results)
+        try:
+            for stage in range(total_stages):
+                stage_results = self._load_checkpoint(stage) if resume else None
+                if stage_results is None:
+                    stage_results = await self._run_stage(stage)
+                    self._save_checkpoint(stage, stage_results)
+                    if trajectories:
+                        for team_name, team_action in stage_results["team_actions"].items():
+                            trajectories.record(team_name, "team_action", team_action, round=stage)
+                            trajectories.finish(team_name, round=stage)
+                self.aggregator.update(stage_results["metrics"])
+                
+                # Restored stages are logged too, so the log covers the scenario
+                if stage_log:
+                    stage_log.append(stage_results)
+                else:
+                    results["stages"].append(stage_results)
+                    
+            self._clear_checkpoints(total_stages)
+        finally:
+            if stage_log:
+                stage_log.close()
+            if trajectories:
+                trajectories.close()
             
-        # Calculate final results
-        results["teams"] = self._calculate_team_results(results["stages"])
+        # Final results come from the running aggregates
+        results["teams"] = self.aggregator.summary()
+        results["telemetry"] = self.telemetry.by_participant("agent")
+        if log_path:
+            results["stage_log"] = log_path
         
         return results
     
+    def get_standings(self, metric: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Live team standings of the current or last scenario"""
+        return self.aggregator.standings(metric)
+    
     async def _run_stage(self, stage: int) -> Dict[str, Any]:
         """Run a single stage of the competition"""
         stage_data = await self.scenario.get_stage_data(stage)
@@ -63,14 +123,25 @@ class TeamBattle:
             "metrics": {}
         }
         
-        for team in self.teams:
-            # Get team actions
-            team_action = await self._get_team_action(
-                team,
-                stage_data,
-                stage_results["team_actions"] if self.collaboration_enabled else None
-            )
-            stage_results["team_actions"][team.name] = team_action
+        if self.collaboration_enabled:
+            for team in self.teams:
+                # Get team actions
+                team_action = await self._get_team_action(
+                    team,
+                    stage_data,
+                    stage_results["team_actions"]
+                )
+                stage_results["team_actions"][team.name] = team_action
+        else:
+            # Teams are independent, so they can all act at once
+            team_actions = await asyncio.gather(*[
+                self._get_team_action(team, stage_data)
+                for team in self.teams
+            ])
+            stage_results["team_actions"] = {
+                team.name: team_action
+                for team, team_action in zip(self.teams, team_actions)
+            }
             
         # Evaluate stage
         stage_results["metrics"] = await self._evaluate_stage(
@@ -90,4 +161,86 @@ class TeamBattle:
             return await self._get_collaborative_action(team, stage_data, other_actions)
         else:
             # Agents act independently
-            return await self._get_independent_actions(team, stage_data) 
\ No newline at end of file
+            return await self._get_independent_actions(team, stage_data)
+    
+    async def _get_independent_actions(self,
+                                       team: AITeam,
+                                       stage_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Get actions from every team agent, run in parallel"""
+        roles = list(team.agents)
+        actions = await asyncio.gather(*[
+            self._agent(team, role).act(stage_data)
+            for role in roles
+        ])
+        return dict(zip(roles, actions))
+    
+    def _agent(self, team: AITeam, role: str) -> Any:
+        """Team agent with its calls recorded in the scenario telemetry"""
+        return self.telemetry.instrument(team.agents[role], "agent", f"{team.name}/{role}")
+    
+    def _checkpoint_path(self, stage: int) -> str:
+        return os.path.join(self.checkpoint_dir, f"stage_{stage:05d}.json")
+    
+    def _fingerprint(self) -> str:
+        """Identity of the scenario and teams a checkpoint belongs to"""
+        return fingerprint({
+            "scenario": {
+                "name": self.scenario.name,
+                "duration": self.scenario.duration,
+                "objectives": self.scenario.objectives,
+                "constraints": self.scenario.constraints
+            },
+            "teams": [
+                {
+                    "name": team.name,
+                    "strategy": team.team_strategy,
+                    "agents": {role: agent_key(agent) for role, agent in team.agents.items()}
+                }
+                for team in self.teams
+            ],
+            "collaboration_enabled": self.collaboration_enabled
+        })
+    
+    def _load_checkpoint(self, stage: int) -> Optional[Dict[str, Any]]:
+        """Load a completed stage, if it was checkpointed for this scenario
+        
+        Checkpoints of another scenario or team line-up are ignored, and
+        overwritten once the stage is run again.
+        """
+        if not self.checkpoint_dir:
+            return None
+        
+        path = self._checkpoint_path(stage)
+        if not os.path.exists(path):
+            return None
+        
+        with open(path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("fingerprint") != self._fingerprint():
+            return None
+        return checkpoint["stage_results"]
+    
+    def _save_checkpoint(self, stage: int, stage_results: Dict[str, Any]):
+        """Checkpoint a completed stage atomically"""
+        if not self.checkpoint_dir:
+            return
+        
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        path = self._checkpoint_path(stage)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "fingerprint": self._fingerprint(),
+                "stage_results": stage_results
+            }, f, default=str)
+        os.replace(tmp_path, path)
+    
+    def _clear_checkpoints(self, total_stages: int):
+        """Delete the stage checkpoints of a completed scenario"""
+        if not self.checkpoint_dir:
+            return
+        
+        for stage in range(total_stages):
+            path = self._checkpoint_path(stage)
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,269 @@
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
+from dataclasses import dataclass
+from datetime import datetime
+import asyncio
+import math
+from benchmark.battle.core import AgentBattle, overrides_evaluation
+from benchmark.telemetry import CallTelemetry
+
+@dataclass
+class AgentRating:
+    agent_id: str
+    rating: float = 1500.0
+    points: float = 0.0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    byes: int = 0
+
+    @property
+    def matches(self) -> int:
+        return self.wins + self.draws + self.losses
+
+class EloRating:
+    """Incremental Elo rating updates"""
+
+    def __init__(self, k_factor: float = 32.0, scale: float = 400.0):
+        self.k_factor = k_factor
+        self.scale = scale
+
+    def expected_score(self, rating_a: float, rating_b: float) -> float:
+        """Probability that A beats B"""
+        return 1.0 / (1.0 + 10 ** ((rating_b - rating_a) / self.scale))
+
+    def update(self, a: AgentRating, b: AgentRating, score_a: float):
+        """Update both ratings from A's match score (1 win, 0.5 draw, 0 loss)"""
+        expected_a = self.expected_score(a.rating, b.rating)
+        delta = self.k_factor * (score_a - expected_a)
+        a.rating += delta
+        b.rating -= delta
+
+class SwissTournament:
+    """Ranks agents with Swiss-system pairing instead of a full round robin
+
+    Each round pairs agents with similar standings that have not met yet, so
+    N agents are ranked in roughly N/2 * log2(N) matches. Independent matches
+    within a round run concurrently, and the tournament stops early once the
+    ranking has not changed for ``patience`` consecutive rounds.
+
+    Each match is an AgentBattle scored by ``round_evaluator``; a
+    ``battle_factory`` taking the AgentBattle keyword arguments can build
+    a battle subclass instead.
+    """
+
+    def __init__(self,
+                 category: str,
+                 agents: Dict[str, Any],
+                 max_rounds: Optional[int] = None,
+                 rounds_per_match: int = 1,
+                 environment: str = "competitive",
+                 rating: Optional[EloRating] = None,
+                 patience: int = 2,
+                 max_concurrency: int = 8,
+                 draw_margin: float = 0.0,
+                 score_fn: Optional[Callable[[Any], float]] = None,
+                 round_evaluator: Optional[Callable[[Dict[str, Any], List[str]], Awaitable[Dict[str, Any]]]] = None,
+                 battle_factory: Callable[..., AgentBattle] = AgentBattle):
+        self.category = category
+        self.agents = agents
+        self.max_rounds = max_rounds or self._default_rounds(len(agents))
+        self.rounds_per_match = rounds_per_match
+        self.environment = environment
+        self.rating = rating or EloRating()
+        self.patience = patience
+        self.max_concurrency = max_concurrency
+        self.draw_margin = draw_margin
+        self.score_fn = score_fn or _total_score
+        self.round_evaluator = round_evaluator
+        self.battle_factory = battle_factory
+        # Fail before any match rather than after a round of agent calls;
+        # factories other than battle classes are trusted to score rounds
+        if (round_evaluator is None
+                and isinstance(battle_factory, type)
+                and not overrides_evaluation(battle_factory)):
+            raise ValueError(
+                "SwissTournament needs a round_evaluator or a battle_factory "
+                "whose battles override _evaluate_round"
+            )
+
+        self.ratings = {agent_id: AgentRating(agent_id) for agent_id in agents}
+        self._played = set()
+        # Agent calls of every match, for per-agent latency and usage
+        self.telemetry = CallTelemetry()
+
+    async def run(self, data_source: Any, metrics: List[str]) -> Dict[str, Any]:
+        """Run the tournament and return standings with match history"""
+        results = {
+            "timestamp": datetime.now().isoformat(),
+            "category": self.category,
+            "rounds": [],
+            "standings": [],
+            "stopped_early": False
+        }
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        previous_order = None
+        stable_rounds = 0
+
+        for round_num in range(self.max_rounds):
+            pairs, bye = self._pair_round()
+            if not pairs:
+                break
+
+            # Matches within a round are independent of each other
+            matches = await asyncio.gather(*[
+                self._run_match(a, b, data_source, metrics, semaphore)
+                for a, b in pairs
+            ])
+            for match in matches:
+                self._record_match(match)
+            if bye:
+                self.ratings[bye].points += 1.0
+                self.ratings[bye].byes += 1
+
+            results["rounds"].append({
+                "round": round_num,
+                "matches": matches,
+                "bye": bye
+            })
+
+            # Stop once the ranking stays stable for enough rounds
+            order = [entry.agent_id for entry in self._sorted_ratings()]
+            stable_rounds = stable_rounds + 1 if order == previous_order else 0
+            previous_order = order
+            if stable_rounds >= self.patience:
+                results["stopped_early"] = round_num + 1 < self.max_rounds
+                break
+
+        results["standings"] = self.get_standings()
+        results["telemetry"] = self.telemetry.by_participant("agent")
+        return results
+
+    def get_standings(self) -> List[Dict[str, Any]]:
+        """Current standings ordered by rating"""
+        return [
+            {
+                "rank": rank,
+                "agent_id": entry.agent_id,
+                "rating": round(entry.rating, 2),
+                "points": entry.points,
+                "wins": entry.wins,
+                "draws": entry.draws,
+                "losses": entry.losses,
+                "matches": entry.matches
+            }
+            for rank, entry in enumerate(self._sorted_ratings(), 1)
+        ]
+
+    def _pair_round(self) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+        """Pair agents with similar standings, avoiding rematches"""
+        ordered = [entry.agent_id for entry in sorted(
+            self.ratings.values(),
+            key=lambda entry: (entry.points, entry.rating),
+            reverse=True
+        )]
+
+        # With an odd field the lowest-ranked agent without a bye sits out
+        bye = None
+        if len(ordered) % 2:
+            candidates = [a for a in reversed(ordered) if not self.ratings[a].byes]
+            bye = candidates[0] if candidates else ordered[-1]
+            ordered.remove(bye)
+
+        pairs = []
+        unpaired = list(ordered)
+        while len(unpaired) > 1:
+            agent_id = unpaired.pop(0)
+            opponent = next(
+                (other for other in unpaired if self._pair_key(agent_id, other) not in self._played),
+                unpaired[0]
+            )
+            unpaired.remove(opponent)
+            pairs.append((agent_id, opponent))
+
+        return pairs, bye
+
+    async def _run_match(self,
+                         agent_a: str,
+                         agent_b: str,
+                         data_source: Any,
+                         metrics: List[str],
+                         semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+        """Run a head-to-head battle between two agents"""
+        options = {"round_evaluator": self.round_evaluator} if self.round_evaluator else {}
+        battle = self.battle_factory(
+            category=self.category,
+            max_rounds=self.rounds_per_match,
+            environment=self.environment,
+            **options
+        )
+        battle.register_agent(agent_a, self.agents[agent_a])
+        battle.register_agent(agent_b, self.agents[agent_b])
+
+        async with semaphore:
+            battle_results = await battle.run_competition(data_source, metrics)
+        self.telemetry.records.extend(battle.telemetry.records)
+
+        final_scores = battle_results["final_scores"]
+        score_a = self.score_fn(final_scores.get(agent_a))
+        score_b = self.score_fn(final_scores.get(agent_b))
+
+        if abs(score_a - score_b) <= self.draw_margin:
+            outcome = 0.5
+        else:
+            outcome = 1.0 if score_a > score_b else 0.0
+
+        return {
+            "agents": [agent_a, agent_b],
+            "scores": {agent_a: score_a, agent_b: score_b},
+            "outcome": outcome
+        }
+
+    def _record_match(self, match: Dict[str, Any]):
+        """Apply a match result to points and ratings"""
+        agent_a, agent_b = match["agents"]
+        a, b = self.ratings[agent_a], self.ratings[agent_b]
+        outcome = match["outcome"]
+
+        self.rating.update(a, b, outcome)
+        a.points += outcome
+        b.points += 1.0 - outcome
+
+        if outcome == 0.5:
+            a.draws += 1
+            b.draws += 1
+        elif outcome == 1.0:
+            a.wins += 1
+            b.losses += 1
+        else:
+            a.losses += 1
+            b.wins += 1
+
+        self._played.add(self._pair_key(agent_a, agent_b))
+
+    def _sorted_ratings(self) -> List[AgentRating]:
+        return sorted(
+            self.ratings.values(),
+            key=lambda entry: (entry.rating, entry.points),
+            reverse=True
+        )
+
+    @staticmethod
+    def _pair_key(agent_a: str, agent_b: str) -> Tuple[str, str]:
+        return tuple(sorted((agent_a, agent_b)))
+
+    @staticmethod
+    def _default_rounds(num_agents: int) -> int:
+        """Swiss rule of thumb: enough rounds to separate a single winner"""
+        return max(1, math.ceil(math.log2(max(num_agents, 2))) + 1)
+
+def _total_score(score: Any) -> float:
+    """Collapse a battle final score (number or metric dict) to one number"""
+    if score is None:
+        return 0.0
+    if isinstance(score, dict):
+        return float(sum(
+            value for value in score.values()
+            if isinstance(value, (int, float))
+        ))
+    return float(score)
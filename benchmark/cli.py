@@ -0,0 +1,412 @@
+"""Command-line entry point
+
+Usage::
+
+    python -m benchmark run nightly.yaml --output runs/nightly
+    python -m benchmark resume nightly.yaml --output runs/nightly
+    python -m benchmark rejudge nightly.yaml --output runs/nightly
+    python -m benchmark regress nightly.yaml --baseline runs/nightly --output runs/pr-123
+    python -m benchmark verify nightly.yaml
+    python -m benchmark battle nightly.yaml --profile
+    python -m benchmark loadtest nightly.yaml
+
+The YAML file uses the run configuration keys understood by
+``benchmark.config.build_run`` (``data_sources``, ``tasks``, ``judge``,
+``agent`` or ``agent_url``, ...) plus:
+
+``output``
+    Directory for results, used when ``--output`` is not given. Large
+    task outputs are spilled to ``<output>/blobs`` unless ``result_store``
+    is set. ``rejudge`` scores the stored outputs there again with the
+    configured judge and writes ``rejudged.json`` without calling the agent.
+    ``run`` records input fingerprints so its results can serve as a
+    regression baseline.
+``concurrency``
+    Limits: ``http_connections`` shared by HTTP agents, ``verification``
+    task re-runs in flight and concurrent ``battle`` matches.
+``verify``
+    ``submissions`` (submission ID to agent spec or URL), ``storage_path``,
+    ``max_task_runs``, ``seed`` and sequential ``test`` options.
+``battle``
+    ``agents`` (agent ID to spec or URL), ``data_source``, ``metrics``,
+    ``evaluator`` (object spec of an async callable scoring a round's
+    actions per agent and metric), ``rounds``, ``environment``,
+    ``turn_order``, ``tournament`` and ``log_path``. Head-to-head battles
+    share the run's ``response_cache``.
+``regression``
+    ``baseline`` (a run directory or its ``results.json``, overridden by
+    ``--baseline``) and the score ``tolerance`` of ``regress``, which only
+    re-runs or re-judges tasks whose inputs changed, writes ``diff.json``
+    and exits with status 1 when a task regressed.
+``load_test``
+    ``stages``, a ``ramp`` or a single ``qps``/``concurrency`` level with
+    ``duration`` (see ``benchmark.loadtest.stages_from_config``), plus
+    ``judge_sample_rate``, ``max_in_flight``, ``latency_slo``,
+    ``max_error_rate``, ``stop_on_saturation`` and ``seed``. Keep
+    ``concurrency.http_connections`` at or above the expected number of
+    requests in flight, or the connection pool queues them instead of the
+    agent.
+"""
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+import argparse
+import asyncio
+import json
+import os
+import aiohttp
+import yaml
+from benchmark.config import build_agent, build_run, build_runner, load_object
+from benchmark.profiling import PhaseProfiler
+from benchmark.response_cache import ResponseCache
+from benchmark.results import ResultStore, json_default
+from benchmark.sources import create_data_sources
+
+RESULTS_LOG = "results.jsonl"
+
+def load_config(path: str) -> Dict[str, Any]:
+    """Load a YAML run configuration"""
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
+
+async def run_command(config: Dict[str, Any],
+                      output: str,
+                      profiler: PhaseProfiler,
+                      resume: bool = False) -> Dict[str, Any]:
+    """Run the benchmark, skipping tasks already completed when resuming"""
+    log_path = os.path.join(output, RESULTS_LOG)
+    # Fingerprinted results can be the baseline of a regression run
+    config.setdefault("fingerprint_inputs", True)
+    # Large task outputs are spilled next to the results by default
+    store_options = config.setdefault("result_store", {"directory": os.path.join(output, "blobs")})
+    completed = _load_completed(log_path) if resume else []
+    _write_log(log_path, completed)
+    completed = ResultStore(**store_options).hydrate(completed)
+
+    async with _create_session(config) as session:
+        with profiler.phase("setup"):
+            runner, agent = build_run(config, session=session)
+
+        done = {entry["task_name"] for entry in completed}
+        remaining = [task for task in runner.tasks if task.name not in done]
+        print(f"Running {len(remaining)} of {len(runner.tasks)} tasks")
+
+        with open(log_path, "a") as log:
+            def on_task_complete(entry: Dict[str, Any]):
+                log.write(json.dumps(entry, default=json_default) + "\n")
+                log.flush()
+                status = "failed" if "error" in entry else "done"
+                print(f"  {entry['task_name']}: {status}")
+
+            try:
+                with profiler.phase("run"):
+                    results = await runner.run_benchmark(
+                        agent,
+                        tasks=remaining,
+                        on_task_complete=on_task_complete
+                    )
+            finally:
+                await _close(agent)
+
+    # Keep the suite's task order across resumed runs
+    order = {task.name: position for position, task in enumerate(runner.tasks)}
+    results["tasks"] = sorted(
+        completed + results["tasks"],
+        key=lambda entry: order.get(entry["task_name"], len(order))
+    )
+    with profiler.phase("save"):
+        _save(os.path.join(output, "results.json"), results)
+    return results
+
+async def resume_command(config: Dict[str, Any],
+                         output: str,
+                         profiler: PhaseProfiler) -> Dict[str, Any]:
+    return await run_command(config, output, profiler, resume=True)
+
+async def rejudge_command(config: Dict[str, Any],
+                          output: str,
+                          profiler: PhaseProfiler) -> Dict[str, Any]:
+    """Score the stored outputs of a run again, without the agent"""
+    store_options = config.setdefault("result_store", {"directory": os.path.join(output, "blobs")})
+    with open(os.path.join(output, "results.json")) as f:
+        results = ResultStore(**store_options).hydrate(json.load(f))
+
+    with profiler.phase("setup"):
+        runner = build_runner(config)
+    with profiler.phase("rejudge"):
+        results = await runner.rejudge(results)
+
+    with profiler.phase("save"):
+        _save(os.path.join(output, "rejudged.json"), results)
+    return results
+
+async def regress_command(config: Dict[str, Any],
+                          output: str,
+                          profiler: PhaseProfiler) -> Dict[str, Any]:
+    """Re-run only the tasks whose inputs changed since a baseline run"""
+    from benchmark.regression import RegressionRunner
+
+    regression_config = config.get("regression", {})
+    baseline = regression_config["baseline"]
+    if os.path.isdir(baseline):
+        baseline = os.path.join(baseline, "results.json")
+    with open(baseline) as f:
+        # The baseline's spilled outputs are adopted into this run's store
+        previous = ResultStore(os.path.join(os.path.dirname(baseline), "blobs")).hydrate(json.load(f))
+    config.setdefault("result_store", {"directory": os.path.join(output, "blobs")})
+
+    async with _create_session(config) as session:
+        with profiler.phase("setup"):
+            runner, agent = build_run(config, session=session)
+            regression = RegressionRunner(runner, tolerance=regression_config.get("tolerance", 0.0))
+
+        def on_task_complete(entry: Dict[str, Any]):
+            status = "failed" if "error" in entry else "done"
+            print(f"  {entry['task_name']}: {status}")
+
+        try:
+            with profiler.phase("regress"):
+                results = await regression.run(agent, previous, on_task_complete=on_task_complete)
+        finally:
+            await _close(agent)
+
+    counts = results["regression"]["counts"]
+    print(f"Reused {counts['reuse']}, re-judged {counts['rejudge']}, re-ran {counts['rerun']} tasks")
+    summary = results["diff"]["summary"]
+    print(f"Task statuses: {summary['statuses']}")
+    for name in results["diff"]["regressed"]:
+        print(f"  regressed: {name}")
+
+    with profiler.phase("save"):
+        _save(os.path.join(output, "results.json"), results)
+        _save(os.path.join(output, "diff.json"), results["diff"])
+    return results
+
+async def verify_command(config: Dict[str, Any],
+                         output: str,
+                         profiler: PhaseProfiler) -> Dict[str, Any]:
+    """Re-run submitted agents and check their results reproduce"""
+    from experiments.verification import SequentialTest, VerificationRunner
+
+    verify_config = config.get("verify", {})
+    concurrency = config.get("concurrency", {})
+
+    async with _create_session(config) as session:
+        with profiler.phase("setup"):
+            verifier = VerificationRunner(
+                build_runner(config),
+                storage_path=verify_config.get("storage_path", "submissions"),
+                test=SequentialTest(**verify_config.get("test", {}))
+            )
+            agents = {
+                submission_id: build_agent(spec, session=session)
+                for submission_id, spec in verify_config.get("submissions", {}).items()
+            }
+
+        try:
+            with profiler.phase("verify"):
+                results = await verifier.verify_pending(
+                    agents,
+                    max_task_runs=verify_config.get("max_task_runs"),
+                    max_concurrency=concurrency.get("verification", 4),
+                    seed=verify_config.get("seed")
+                )
+        finally:
+            for agent in agents.values():
+                await _close(agent)
+
+    with profiler.phase("save"):
+        _save(os.path.join(output, "verification.json"), results)
+    return results
+
+async def battle_command(config: Dict[str, Any],
+                         output: str,
+                         profiler: PhaseProfiler) -> Dict[str, Any]:
+    """Run a head-to-head competition or a tournament between agents"""
+    from benchmark.battle.core import AgentBattle
+
+    battle_config = config.get("battle", {})
+    concurrency = config.get("concurrency", {})
+
+    async with _create_session(config) as session:
+        with profiler.phase("setup"):
+            battle = AgentBattle(
+                category=config.get("category", "general_purpose"),
+                max_rounds=battle_config.get("rounds", 10),
+                environment=battle_config.get("environment", "competitive"),
+                turn_order=battle_config.get("turn_order"),
+                round_evaluator=load_object(battle_config.get("evaluator")),
+                response_cache=(
+                    ResponseCache(**config["response_cache"])
+                    if config.get("response_cache") else None
+                )
+            )
+            battle.check_round_evaluator()
+            for agent_id, spec in battle_config.get("agents", {}).items():
+                battle.register_agent(agent_id, build_agent(spec, session=session))
+
+            data_source = create_data_sources(
+                battle_config.get("data_source") or config.get("data_sources", {})
+            )[0]
+            await data_source.initialize()
+
+        metrics = battle_config.get("metrics", [])
+        try:
+            with profiler.phase("battle"):
+                if battle_config.get("tournament"):
+                    results = await battle.run_tournament(
+                        data_source,
+                        metrics,
+                        max_concurrency=concurrency.get("battle", 8)
+                    )
+                else:
+                    results = await battle.run_competition(
+                        data_source,
+                        metrics,
+                        log_path=battle_config.get("log_path"),
+                        trajectory_dir=config.get("trajectory_dir")
+                    )
+        finally:
+            for agent in battle.agents.values():
+                await _close(agent)
+
+    with profiler.phase("save"):
+        _save(os.path.join(output, "battle.json"), results)
+    return results
+
+async def loadtest_command(config: Dict[str, Any],
+                           output: str,
+                           profiler: PhaseProfiler) -> Dict[str, Any]:
+    """Drive the agent endpoint through a load profile"""
+    from benchmark.loadtest import LoadTester, stages_from_config
+
+    load_config = dict(config.get("load_test", {}))
+    stages = stages_from_config(load_config)
+    for key in ("stages", "ramp", "qps", "concurrency", "duration"):
+        load_config.pop(key, None)
+
+    async with _create_session(config) as session:
+        with profiler.phase("setup"):
+            runner, agent = build_run(config, session=session)
+            tester = LoadTester(runner, agent, stages, **load_config)
+
+        def on_stage_complete(report: Dict[str, Any]):
+            load = f"{report['qps']} qps" if report["qps"] is not None else f"{report['concurrency']} workers"
+            latency = report["latency"] or {}
+            line = (
+                f"  {load}: {report['throughput']:.1f} req/s, "
+                f"p50 {latency.get('p50', 0) * 1000:.0f}ms, "
+                f"p99 {latency.get('p99', 0) * 1000:.0f}ms, "
+                f"errors {report['error_rate']:.1%}"
+            )
+            if report["mean_score"] is not None:
+                line += f", score {report['mean_score']:.2f}"
+            if report["saturated"]:
+                line += f" (saturated: {', '.join(report['saturation_reasons'])})"
+            print(line)
+
+        try:
+            with profiler.phase("load"):
+                results = await tester.run(on_stage_complete=on_stage_complete)
+        finally:
+            await _close(agent)
+
+    with profiler.phase("save"):
+        _save(os.path.join(output, "load_test.json"), results)
+    return results
+
+COMMANDS = {
+    "run": (run_command, "Run the benchmark suite"),
+    "resume": (resume_command, "Finish an interrupted run, keeping completed tasks"),
+    "rejudge": (rejudge_command, "Score a finished run's outputs again with the current judge"),
+    "regress": (regress_command, "Re-run only changed work against a baseline and diff the scores"),
+    "verify": (verify_command, "Verify submissions by re-running their agents"),
+    "battle": (battle_command, "Run a competition or tournament between agents"),
+    "loadtest": (loadtest_command, "Measure latency, errors and quality under load")
+}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmark",
+        description="Run AI agent benchmarks from a YAML configuration"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, (_, help_text) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument("config", help="Path to the YAML run configuration")
+        subparser.add_argument("--output", help="Directory for results and profiles")
+        subparser.add_argument(
+            "--profile",
+            action="store_true",
+            help="Write cProfile and tracemalloc reports per phase to <output>/profile"
+        )
+        if name == "regress":
+            subparser.add_argument("--baseline", help="Run directory or results.json to compare with")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    if getattr(args, "baseline", None):
+        config.setdefault("regression", {})["baseline"] = args.baseline
+    output = (
+        args.output
+        or config.get("output")
+        or os.path.join("runs", datetime.now().strftime("%Y%m%d_%H%M%S"))
+    )
+    if args.command == "resume" and not os.path.exists(os.path.join(output, RESULTS_LOG)):
+        parser.error(f"No run to resume in {output}")
+    if args.command == "regress" and not config.get("regression", {}).get("baseline"):
+        parser.error("regress needs --baseline or regression.baseline in the config")
+    if args.command == "rejudge" and not os.path.exists(os.path.join(output, "results.json")):
+        parser.error(f"No finished run to re-judge in {output}")
+    os.makedirs(output, exist_ok=True)
+
+    profiler = PhaseProfiler(os.path.join(output, "profile"), enabled=args.profile)
+    command, _ = COMMANDS[args.command]
+    results = asyncio.run(command(config, output, profiler))
+
+    print(f"Results written to {output}")
+    for phase in profiler.summary():
+        line = f"  {phase['phase']}: {phase['wall_time']:.2f}s"
+        if "peak_memory" in phase:
+            line += f", peak {phase['peak_memory'] / 1024 / 1024:.1f} MiB"
+        print(line)
+    if args.command == "regress" and results["diff"]["regressed"]:
+        return 1
+    return 0
+
+def _create_session(config: Dict[str, Any]) -> aiohttp.ClientSession:
+    """HTTP session shared by every agent in the run"""
+    limit = config.get("concurrency", {}).get("http_connections", 100)
+    return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=limit))
+
+async def _close(agent: Any):
+    close = getattr(agent, "close", None)
+    if close is not None:
+        await close()
+
+def _load_completed(log_path: str) -> List[Dict[str, Any]]:
+    """Task entries of a previous run that finished without error"""
+    entries = []
+    with open(log_path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # The run was killed mid-write
+                continue
+            if "error" not in entry:
+                entries.append(entry)
+    return entries
+
+def _write_log(log_path: str, entries: List[Dict[str, Any]]):
+    """Start the results log with ``entries``, replacing it atomically"""
+    tmp_path = f"{log_path}.tmp"
+    with open(tmp_path, "w") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, default=json_default) + "\n")
+    os.replace(tmp_path, log_path)
+
+def _save(path: str, results: Dict[str, Any]):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, default=json_default)
@@ -0,0 +1,181 @@
+from typing import Dict, Any, List, Optional, Tuple
+import importlib
+import os
+from benchmark.core import BenchmarkRunner
+from benchmark.agents import HTTPAgent
+from benchmark.response_cache import ResponseCache
+from benchmark.results import ResultStore
+from benchmark.sources import create_data_sources, get_available_sources
+from benchmark.tasks.templates import ParametricTask
+
+DEFAULT_PROMPT = "Analyze the data and provide strategic recommendations"
+
+SERVER_CONFIG_ENV = "BENCHMARK_SERVER_CONFIG"
+
+def load_object(spec: Any) -> Any:
+    """Instantiate an object from a ``{"class": "module:Name", "options": {...}}`` spec
+
+    A plain ``"module:Name"`` string resolves to the attribute itself; any
+    other value is returned unchanged.
+    """
+    if isinstance(spec, str):
+        return _import(spec)
+    if isinstance(spec, dict) and "class" in spec:
+        return _import(spec["class"])(**spec.get("options", {}))
+    return spec
+
+def load_server_config(path: Optional[str] = None) -> Dict[str, Any]:
+    """Trusted settings of the web services
+
+    Read from the YAML file at ``path`` or ``$BENCHMARK_SERVER_CONFIG``:
+    ``judges`` (name to object spec), ``default_judge``, ``criteria_llm``
+    (name of the judge that parses custom criteria) and ``data_sources``
+    (source type to its config, as for ``create_data_sources``). Without a
+    file no judges or data sources are offered.
+    """
+    path = path or os.environ.get(SERVER_CONFIG_ENV)
+    if not path:
+        return {"judges": {}, "data_sources": {}}
+
+    import yaml
+    with open(path) as f:
+        config = yaml.safe_load(f) or {}
+    config.setdefault("judges", {})
+    config.setdefault("data_sources", {})
+    return config
+
+def validate_web_request(body: Any, server: Dict[str, Any]) -> Dict[str, Any]:
+    """Run request from an untrusted client, reduced to what it may choose
+
+    Only an HTTP(S) ``agent_url``, a ``category``, custom ``criteria`` text,
+    a ``judge`` name and ``data_sources`` names (a list, or a dict whose
+    keys are used) are accepted; judges and sources must be configured on
+    the server. Object specs, paths and every other key are never taken
+    from a client. Raises ValueError for anything invalid.
+    """
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object")
+
+    agent_url = body.get("agent_url")
+    if not isinstance(agent_url, str) or not agent_url.startswith(("http://", "https://")):
+        raise ValueError("agent_url must be an http(s) URL")
+
+    category = body.get("category") or "general_purpose"
+    criteria = body.get("criteria")
+    if not isinstance(category, str) or not isinstance(criteria, (str, type(None))):
+        raise ValueError("category and criteria must be strings")
+
+    judge = body.get("judge") or server.get("default_judge")
+    if judge is not None and (not isinstance(judge, str) or judge not in server["judges"]):
+        raise ValueError(f"Unknown judge: {judge}")
+
+    sources = body.get("data_sources") or []
+    if not isinstance(sources, (list, dict)):
+        raise ValueError("data_sources must be a list of source names")
+    unknown = [
+        name for name in sources
+        if not isinstance(name, str) or name not in server["data_sources"]
+    ]
+    if unknown:
+        raise ValueError(f"Unknown data sources: {unknown}")
+
+    return {
+        "agent_url": agent_url,
+        "category": category,
+        "criteria": criteria or None,
+        "judge": judge,
+        "data_sources": list(sources)
+    }
+
+def web_sources(server: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Schemas of the data sources a web client may pick"""
+    schemas = get_available_sources()
+    return {name: schemas.get(name, {}) for name in server["data_sources"]}
+
+def web_run_config(request: Dict[str, Any], server: Dict[str, Any]) -> Dict[str, Any]:
+    """build_run configuration for a validated web request
+
+    Judge and data source names are resolved against the server settings.
+    """
+    return dict(
+        request,
+        judge=server["judges"].get(request["judge"]),
+        data_sources={name: server["data_sources"][name] for name in request["data_sources"]}
+    )
+
+def _import(path: str) -> Any:
+    module_name, _, attribute = path.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute) if attribute else module
+
+def build_tasks(config: Dict[str, Any]) -> list:
+    """Build benchmark tasks from a run configuration"""
+    category = config.get("category", "general_purpose")
+    task_configs = config.get("tasks") or [{}]
+
+    tasks = []
+    for position, task_config in enumerate(task_configs):
+        if "class" in task_config:
+            tasks.append(load_object(task_config))
+            continue
+
+        tasks.append(ParametricTask(
+            name=task_config.get("name", f"{category}_task_{position}"),
+            description=task_config.get("description", f"{category} benchmark task"),
+            category=task_config.get("category", category),
+            prompt=task_config.get("prompt", DEFAULT_PROMPT),
+            data_query=task_config.get("data_query", {"type": "sales"}),
+            custom_criteria=task_config.get("criteria", config.get("criteria"))
+        ))
+    return tasks
+
+def build_run(config: Dict[str, Any],
+              data_sources: Optional[List[Any]] = None,
+              judge_llm: Any = None,
+              session: Any = None) -> Tuple[BenchmarkRunner, Any]:
+    """Build the runner and agent for a run configuration
+
+    Recognised keys: ``data_sources``, ``category``, ``criteria``,
+    ``tasks``, ``judge``, ``agent`` (object spec) or ``agent_url``,
+    ``mode``, ``trajectory_dir``, ``result_store`` (ResultStore options),
+    ``response_cache`` (ResponseCache options) and ``fingerprint_inputs``.
+    Long-running services pass already built ``data_sources``,
+    ``judge_llm`` and an HTTP ``session`` so they are shared across runs.
+    """
+    runner = build_runner(config, data_sources=data_sources, judge_llm=judge_llm)
+    agent = build_agent(config.get("agent") or config["agent_url"], session=session)
+    return runner, agent
+
+def build_runner(config: Dict[str, Any],
+                 data_sources: Optional[List[Any]] = None,
+                 judge_llm: Any = None) -> BenchmarkRunner:
+    """Build the runner for a run configuration, without an agent"""
+    if data_sources is None:
+        data_sources = create_data_sources(config.get("data_sources", {}))
+    if judge_llm is None:
+        judge_llm = load_object(config.get("judge"))
+
+    result_store = config.get("result_store")
+    response_cache = config.get("response_cache")
+    return BenchmarkRunner(
+        data_sources=data_sources,
+        tasks=build_tasks(config),
+        judge_llm=judge_llm,
+        mode=config.get("mode", "standard"),
+        trajectory_dir=config.get("trajectory_dir"),
+        result_store=ResultStore(**result_store) if result_store else None,
+        response_cache=ResponseCache(**response_cache) if response_cache else None,
+        fingerprint_inputs=config.get("fingerprint_inputs", False)
+    )
+
+def build_agent(spec: Any, session: Any = None) -> Any:
+    """Build an agent from an object spec or the URL of an HTTP agent
+
+    A dict with a ``url`` is taken as HTTPAgent options, e.g.
+    ``{"url": ..., "max_retries": 2}``.
+    """
+    if isinstance(spec, str) and spec.startswith(("http://", "https://")):
+        return HTTPAgent(spec, session=session)
+    if isinstance(spec, dict) and "url" in spec:
+        return HTTPAgent(session=session, **spec)
+    return load_object(spec)
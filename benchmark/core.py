@@ -1,10 +1,15 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable
 from abc import ABC, abstractmethod
+from datetime import datetime
 import logging
 import json
 from benchmark.evaluation.criteria_parser import CriteriaParser
 from benchmark.defaults.evaluation_criteria import BenchmarkDefaults
 from benchmark.battle.core import AgentBattle
+from benchmark.trajectories import TrajectoryWriter
+from benchmark.results import BlobRef, ResultStore, fingerprint
+from benchmark.fingerprints import DataRecorder, task_fingerprints
+from benchmark.telemetry import CallTelemetry
 
 class DataSource(ABC):
     """Abstract base class for data sources (synthetic or SaaS)"""
@@ -41,8 +46,27 @@ class BenchmarkTask(ABC):
         
     async def initialize(self, criteria_parser: CriteriaParser):
         """Initialize task including parsing evaluation criteria"""
+        # Kept for building judge prompts in evaluate
+        self.criteria_parser = criteria_parser
         self.criteria = await criteria_parser.parse_criteria(self.criteria_text)
         
+    def fingerprint(self) -> str:
+        """Content hash of what the agent is given for this task
+        
+        Evaluation criteria are left out, so re-weighting or re-judging a
+        task keeps its fingerprint.
+        """
+        return fingerprint(self.fingerprint_fields())
+        
+    def fingerprint_fields(self) -> Dict[str, Any]:
+        """Fields hashed by ``fingerprint``; subclasses add their inputs"""
+        return {
+            "class": f"{type(self).__module__}.{type(self).__qualname__}",
+            "name": self.name,
+            "description": self.description,
+            "category": self.category
+        }
+        
     async def evaluate(self, results: Dict[str, Any], judge_llm) -> Dict[str, Any]:
         """Evaluate task results using LLM judge and parsed criteria"""
         
@@ -69,12 +93,24 @@ class BenchmarkRunner:
                  tasks: List[BenchmarkTask],
                  judge_llm,
                  mode: str = "standard",
-                 logger: Optional[logging.Logger] = None):
+                 logger: Optional[logging.Logger] = None,
+                 trajectory_dir: Optional[str] = None,
+                 result_store: Optional[ResultStore] = None,
+                 response_cache=None,
+                 fingerprint_inputs: bool = False):
         self.data_sources = data_sources
         self.tasks = tasks
         self.judge_llm = judge_llm
         self.mode = mode
         self.logger = logger or logging.getLogger(__name__)
+        # Directory for the trajectory log (reasoning, actions, outputs)
+        self.trajectory_dir = trajectory_dir
+        # Large task outputs are spilled here instead of kept in memory
+        self.result_store = result_store
+        # Optional ResponseCache reusing answers of unchanged agent versions
+        self.response_cache = response_cache
+        # Record input fingerprints per task for incremental regression runs
+        self.fingerprint_inputs = fingerprint_inputs
         
         # Initialize battle system if needed
         if mode in ["battle", "team_battle"]:
@@ -82,35 +118,149 @@ class BenchmarkRunner:
                 category=tasks[0].category if tasks else "general"
             )
         
-    async def run_benchmark(self, agent) -> Dict[str, Any]:
-        """Run full benchmark suite"""
+    async def run_benchmark(self,
+                            agent,
+                            tasks: Optional[List[BenchmarkTask]] = None,
+                            on_task_complete: Optional[Callable[[Dict[str, Any]], None]] = None,
+                            initialize_sources: bool = True) -> Dict[str, Any]:
+        """Run full benchmark suite, or only ``tasks`` when given
+        
+        ``on_task_complete`` is called with each task entry as soon as it is
+        added to the results, for progress reporting. Every agent and judge
+        call is timed; each task entry gets its own ``telemetry`` and the
+        run-wide aggregates go to ``results["telemetry"]``. With a response
+        cache, cached agent answers are reused and only real calls are timed.
+        With ``fingerprint_inputs``, completed entries also record
+        ``fingerprints`` of their inputs and the ``data_queries`` made, for
+        incremental regression runs. Callers that already initialized the
+        data sources pass ``initialize_sources=False``.
+        """
         results = {
             "agent_id": agent.id,
             "timestamp": datetime.now().isoformat(),
             "tasks": []
         }
+        trajectories = TrajectoryWriter(self.trajectory_dir) if self.trajectory_dir else None
+        telemetry = CallTelemetry()
+        instrumented_agent = telemetry.instrument(agent, "agent")
+        judge_llm = telemetry.instrument(self.judge_llm, "judge")
+        cache_before = self.response_cache.stats() if self.response_cache else None
         
         # Initialize all data sources
-        for ds in self.data_sources:
-            await ds.initialize()
+        if initialize_sources:
+            for ds in self.data_sources:
+                await ds.initialize()
             
         # Run each task
-        for task in self.tasks:
-            try:
-                task_result = await task.run(agent, {"data_sources": self.data_sources})
-                evaluation = await task.evaluate(task_result, self.judge_llm)
+        try:
+            for task in (self.tasks if tasks is None else tasks):
+                trajectory = trajectories.recorder(task.name) if trajectories else None
+                context = {"data_sources": self.data_sources}
+                recorder = DataRecorder() if self.fingerprint_inputs else None
+                if recorder:
+                    # Digests of the data the task reads
+                    context["data_sources"] = recorder.wrap(self.data_sources)
+                if trajectory:
+                    # Tasks can log reasoning and actions as they go
+                    context["trajectory"] = trajectory
+                    trajectory.record("task_started", {"agent_id": agent.id})
+                start = telemetry.mark()
+                    
+                try:
+                    task_agent = (
+                        self.response_cache.wrap(instrumented_agent, task.fingerprint())
+                        if self.response_cache else instrumented_agent
+                    )
+                    task_result = await task.run(task_agent, context)
+                    # Large outputs live on disk; only the reference is kept
+                    stored_result = (
+                        self.result_store.spill(task_result)
+                        if self.result_store else task_result
+                    )
+                    if trajectory:
+                        trajectory.record("task_output", stored_result)
+                        
+                    evaluation = await task.evaluate(task_result, judge_llm)
+                    if trajectory:
+                        trajectory.record("evaluation", evaluation)
+                    
+                    entry = {
+                        "task_name": task.name,
+                        "result": stored_result,
+                        "evaluation": evaluation,
+                        "telemetry": telemetry.summary(since=start)
+                    }
+                    if recorder:
+                        entry["fingerprints"] = dict(
+                            task_fingerprints(task, agent, self.judge_llm),
+                            data=recorder.fingerprint()
+                        )
+                        entry["data_queries"] = recorder.queries
+                    results["tasks"].append(entry)
+                    
+                except Exception as e:
+                    self.logger.error(f"Error in task {task.name}: {str(e)}")
+                    if trajectory:
+                        trajectory.record("error", str(e))
+                    results["tasks"].append({
+                        "task_name": task.name,
+                        "error": str(e),
+                        "telemetry": telemetry.summary(since=start)
+                    })
+                    
+                if trajectory:
+                    trajectory.finish()
+                if on_task_complete:
+                    on_task_complete(results["tasks"][-1])
+        finally:
+            if trajectories:
+                trajectories.close()
                 
-                results["tasks"].append({
-                    "task_name": task.name,
-                    "result": task_result,
-                    "evaluation": evaluation
-                })
+        results["telemetry"] = telemetry.summary()
+        if self.response_cache:
+            cache_after = self.response_cache.stats()
+            results["response_cache"] = {
+                key: cache_after[key] - cache_before[key]
+                for key in ("hits", "misses", "bypassed")
+            }
+        if self.trajectory_dir:
+            results["trajectory_dir"] = self.trajectory_dir
+        return results
+        
+    async def rejudge(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """Evaluate the stored outputs of a run again with the current judge
+        
+        The agent is never called: task outputs come from ``results``,
+        loading spilled ones from the result store. Entries of failed or
+        unknown tasks are kept as they are.
+        """
+        tasks = {task.name: task for task in self.tasks}
+        telemetry = CallTelemetry()
+        judge_llm = telemetry.instrument(self.judge_llm, "judge")
+        
+        entries = []
+        for entry in results["tasks"]:
+            task = tasks.get(entry["task_name"])
+            if task is None or "result" not in entry:
+                entries.append(entry)
+                continue
+            start = telemetry.mark()
                 
+            task_result = entry["result"]
+            if isinstance(task_result, BlobRef):
+                task_result = task_result.load()
+            try:
+                evaluation = await task.evaluate(task_result, judge_llm)
             except Exception as e:
-                self.logger.error(f"Error in task {task.name}: {str(e)}")
-                results["tasks"].append({
-                    "task_name": task.name,
-                    "error": str(e)
-                })
-                
-        return results 
\ No newline at end of file
+                self.logger.error(f"Error re-judging task {task.name}: {str(e)}")
+                entries.append(dict(entry, rejudge_error=str(e)))
+                continue
+            entries.append(dict(
+                entry,
+                evaluation=evaluation,
+                telemetry=dict(entry.get("telemetry") or {}, **telemetry.summary(since=start))
+            ))
+            
+        rejudged = dict(results, tasks=entries, rejudged_at=datetime.now().isoformat())
+        rejudged["telemetry"] = dict(results.get("telemetry") or {}, **telemetry.summary())
+        return rejudged
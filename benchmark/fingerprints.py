@@ -0,0 +1,86 @@
+from typing import Dict, Any, List, Optional
+from benchmark.response_cache import agent_key
+from benchmark.results import fingerprint
+
+# Digest recorded for a data query that raised
+FAILED_QUERY = "error"
+
+def agent_fingerprint(agent: Any) -> Optional[str]:
+    """Identity of an agent version, or None when it has no version"""
+    if getattr(agent, "version", None) is None:
+        return None
+    return agent_key(agent)
+
+def judge_fingerprint(judge: Any) -> str:
+    """Identity of a judge: its class and any model or version it reports"""
+    identity = {"class": f"{type(judge).__module__}.{type(judge).__qualname__}"}
+    for attribute in ("id", "model", "version", "temperature"):
+        value = getattr(judge, attribute, None)
+        if value is not None:
+            identity[attribute] = value
+    return fingerprint(identity)
+
+def task_fingerprints(task: Any, agent: Any, judge: Any) -> Dict[str, Optional[str]]:
+    """Fingerprints of the inputs of a task run known before it starts"""
+    return {
+        "task": task.fingerprint(),
+        "criteria": fingerprint(task.criteria_text),
+        "agent": agent_fingerprint(agent),
+        "judge": judge_fingerprint(judge)
+    }
+
+class DataRecorder:
+    """Records the data queries a task makes and digests of their answers
+
+    ``wrap`` gives the task recording stand-ins for the data sources; the
+    queries can later be replayed with ``replay`` to tell whether the data
+    a task saw has changed.
+    """
+
+    def __init__(self):
+        self.queries: List[List[Any]] = []
+        self._digests: List[str] = []
+
+    def wrap(self, data_sources: List[Any]) -> List["RecordingSource"]:
+        return [RecordingSource(source, position, self) for position, source in enumerate(data_sources)]
+
+    def record(self, position: int, query: Any, digest: str):
+        self.queries.append([position, query])
+        self._digests.append(digest)
+
+    def fingerprint(self) -> str:
+        return fingerprint(self._digests)
+
+    @staticmethod
+    async def replay(data_sources: List[Any], queries: List[List[Any]]) -> str:
+        """Data fingerprint the recorded ``queries`` give on ``data_sources`` now"""
+        digests = []
+        for position, query in queries:
+            if position >= len(data_sources):
+                digests.append(FAILED_QUERY)
+                continue
+            try:
+                digests.append(fingerprint(await data_sources[position].get_data(query)))
+            except Exception:
+                digests.append(FAILED_QUERY)
+        return fingerprint(digests)
+
+class RecordingSource:
+    """Data source proxy reporting every ``get_data`` call to a DataRecorder"""
+
+    def __init__(self, source: Any, position: int, recorder: DataRecorder):
+        self._source = source
+        self._position = position
+        self._recorder = recorder
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._source, name)
+
+    async def get_data(self, query: Dict[str, Any]) -> Any:
+        try:
+            data = await self._source.get_data(query)
+        except Exception:
+            self._recorder.record(self._position, query, FAILED_QUERY)
+            raise
+        self._recorder.record(self._position, query, fingerprint(data))
+        return data
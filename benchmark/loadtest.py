@@ -0,0 +1,292 @@
+from typing import Dict, Any, List, Optional, Callable
+from dataclasses import dataclass
+from datetime import datetime
+import asyncio
+import itertools
+import random
+from benchmark.core import BenchmarkRunner, BenchmarkTask
+from benchmark.telemetry import CallTelemetry, distribution
+
+@dataclass
+class LoadStage:
+    """One step of a load profile
+
+    With ``qps``, requests arrive open-loop as a Poisson process at that
+    rate, whether or not earlier requests have finished. With
+    ``concurrency``, that many workers send requests back to back.
+    """
+    duration: float
+    qps: Optional[float] = None
+    concurrency: Optional[int] = None
+
+    def __post_init__(self):
+        if (self.qps is None) == (self.concurrency is None):
+            raise ValueError("A load stage needs exactly one of qps or concurrency")
+
+def ramp_stages(start: float,
+                stop: float,
+                step: float,
+                step_duration: float,
+                mode: str = "qps") -> List[LoadStage]:
+    """Stages stepping the load from ``start`` to ``stop`` inclusive"""
+    if mode not in ("qps", "concurrency"):
+        raise ValueError(f"Unknown ramp mode: {mode}")
+    if step <= 0:
+        raise ValueError("Ramp step must be positive")
+
+    stages = []
+    level = start
+    while level <= stop + 1e-9:
+        value = int(level) if mode == "concurrency" else level
+        stages.append(LoadStage(duration=step_duration, **{mode: value}))
+        level += step
+    return stages
+
+def stages_from_config(config: Dict[str, Any]) -> List[LoadStage]:
+    """Stages from a ``load_test`` config section
+
+    Accepts a list of ``stages`` (``duration`` plus ``qps`` or
+    ``concurrency``), a ``ramp`` (``start``, ``stop``, ``step``,
+    ``step_duration`` and ``mode``), or a single ``qps`` or ``concurrency``
+    level held for ``duration`` seconds.
+    """
+    if "stages" in config:
+        return [LoadStage(**stage) for stage in config["stages"]]
+    if "ramp" in config:
+        return ramp_stages(**config["ramp"])
+    return [LoadStage(
+        duration=config.get("duration", 60.0),
+        qps=config.get("qps"),
+        concurrency=config.get("concurrency")
+    )]
+
+class _StageStats:
+    """Outcomes of the requests sent during one stage"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self.dropped = 0
+        # (task, result) pairs picked for judging once the stage is over
+        self.sampled: List[tuple] = []
+        self.scores: List[float] = []
+        self.judge_errors = 0
+
+    @property
+    def completed(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+class LoadTester:
+    """Replays benchmark tasks against an agent under a load profile
+
+    Tasks of ``runner`` are sent in round-robin order through each stage.
+    Latency is measured from a request's scheduled arrival, so time spent
+    waiting behind a saturated agent is counted rather than hidden. A
+    ``judge_sample_rate`` fraction of successful responses is scored by the
+    runner's judge after the stage ends, showing how quality changes with
+    load without adding judge calls to the load itself.
+
+    Throughput is measured over the stage's arrival window; the time spent
+    waiting for requests still in flight when it closes is reported
+    separately as ``drain_time``. A stage is saturated when its error rate
+    exceeds ``max_error_rate``, its p99 latency exceeds ``latency_slo``
+    seconds, fewer than ``min_throughput_ratio`` of its arrivals were
+    served successfully, or arrivals were dropped because
+    ``max_in_flight`` requests were already outstanding. The ramp
+    stops at the first saturated stage unless ``stop_on_saturation`` is
+    off.
+    """
+
+    def __init__(self,
+                 runner: BenchmarkRunner,
+                 agent: Any,
+                 stages: List[LoadStage],
+                 judge_sample_rate: float = 0.0,
+                 judge_concurrency: int = 4,
+                 max_in_flight: int = 1000,
+                 latency_slo: Optional[float] = None,
+                 max_error_rate: float = 0.01,
+                 min_throughput_ratio: float = 0.9,
+                 stop_on_saturation: bool = True,
+                 seed: Optional[int] = None):
+        self.runner = runner
+        self.agent = agent
+        self.stages = stages
+        self.judge_sample_rate = judge_sample_rate
+        self.judge_concurrency = judge_concurrency
+        self.max_in_flight = max_in_flight
+        self.latency_slo = latency_slo
+        self.max_error_rate = max_error_rate
+        self.min_throughput_ratio = min_throughput_ratio
+        self.stop_on_saturation = stop_on_saturation
+        self._random = random.Random(seed)
+
+    async def run(self,
+                  on_stage_complete: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Run every stage and report latency, errors, quality and saturation"""
+        if not self.runner.tasks:
+            raise ValueError("Load testing needs at least one benchmark task")
+
+        results = {
+            "agent_id": getattr(self.agent, "id", None),
+            "timestamp": datetime.now().isoformat(),
+            "stages": [],
+            "saturation": None,
+            "max_sustained_qps": None
+        }
+        for ds in self.runner.data_sources:
+            await ds.initialize()
+        tasks = itertools.cycle(self.runner.tasks)
+
+        for position, stage in enumerate(self.stages):
+            report = await self._run_stage(position, stage, tasks)
+            results["stages"].append(report)
+            if on_stage_complete:
+                on_stage_complete(report)
+
+            if report["saturated"]:
+                results["saturation"] = {
+                    "stage": position,
+                    "qps": stage.qps,
+                    "concurrency": stage.concurrency,
+                    "reasons": report["saturation_reasons"]
+                }
+                if self.stop_on_saturation:
+                    break
+            elif results["saturation"] is None:
+                results["max_sustained_qps"] = report["throughput"]
+
+        return results
+
+    async def _run_stage(self, position: int, stage: LoadStage, tasks) -> Dict[str, Any]:
+        stats = _StageStats()
+        telemetry = CallTelemetry()
+        agent = telemetry.instrument(self.agent, "agent")
+        judge_llm = telemetry.instrument(self.runner.judge_llm, "judge")
+
+        def send(scheduled: float):
+            return self._request(next(tasks), agent, scheduled, stats)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if stage.qps is not None:
+            await self._open_loop(stage, send, stats)
+        else:
+            await self._closed_loop(stage, send)
+        elapsed = loop.time() - started
+
+        await self._judge(stats, judge_llm)
+        return self._report(position, stage, stats, telemetry, elapsed)
+
+    async def _open_loop(self, stage: LoadStage, send, stats: _StageStats):
+        """Poisson arrivals at ``stage.qps``, independent of completions"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        arrival = started
+        in_flight = set()
+
+        while True:
+            arrival += self._random.expovariate(stage.qps)
+            if arrival - started >= stage.duration:
+                break
+            await asyncio.sleep(max(0.0, arrival - loop.time()))
+            if len(in_flight) >= self.max_in_flight:
+                stats.dropped += 1
+                continue
+            request = asyncio.ensure_future(send(arrival))
+            in_flight.add(request)
+            request.add_done_callback(in_flight.discard)
+
+        # Requests still in flight count toward this stage
+        if in_flight:
+            await asyncio.wait(in_flight)
+
+    async def _closed_loop(self, stage: LoadStage, send):
+        """``stage.concurrency`` workers sending back to back"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + stage.duration
+
+        async def worker():
+            while loop.time() < deadline:
+                await send(loop.time())
+
+        await asyncio.gather(*[worker() for _ in range(stage.concurrency)])
+
+    async def _request(self,
+                       task: BenchmarkTask,
+                       agent: Any,
+                       scheduled: float,
+                       stats: _StageStats):
+        loop = asyncio.get_running_loop()
+        context = {"data_sources": self.runner.data_sources}
+        try:
+            result = await task.run(agent, context)
+        except Exception as e:
+            error = type(e).__name__
+            stats.errors[error] = stats.errors.get(error, 0) + 1
+            return
+        stats.latencies.append(loop.time() - scheduled)
+        if self._random.random() < self.judge_sample_rate:
+            stats.sampled.append((task, result))
+
+    async def _judge(self, stats: _StageStats, judge_llm: Any):
+        """Score the sampled responses of a stage"""
+        semaphore = asyncio.Semaphore(self.judge_concurrency)
+
+        async def judge(task: BenchmarkTask, result: Any):
+            async with semaphore:
+                try:
+                    evaluation = await task.evaluate(result, judge_llm)
+                except Exception as e:
+                    self.runner.logger.warning(f"Judging {task.name} failed: {e}")
+                    stats.judge_errors += 1
+                    return
+            stats.scores.append(sum(evaluation.values()))
+
+        await asyncio.gather(*[judge(task, result) for task, result in stats.sampled])
+        stats.sampled = []
+
+    def _report(self,
+                position: int,
+                stage: LoadStage,
+                stats: _StageStats,
+                telemetry: CallTelemetry,
+                elapsed: float) -> Dict[str, Any]:
+        completed = stats.completed
+        attempted = completed + stats.dropped
+        error_count = sum(stats.errors.values())
+        report = {
+            "stage": position,
+            "qps": stage.qps,
+            "concurrency": stage.concurrency,
+            "duration": elapsed,
+            "drain_time": max(0.0, elapsed - stage.duration),
+            "offered_qps": attempted / stage.duration if stage.duration else 0.0,
+            "requests": attempted,
+            "completed": completed,
+            "dropped": stats.dropped,
+            # Over the arrival window, like offered_qps, so draining the
+            # last requests does not count against the agent
+            "throughput": len(stats.latencies) / stage.duration if stage.duration else 0.0,
+            "error_rate": (error_count + stats.dropped) / attempted if attempted else 0.0,
+            "errors": stats.errors,
+            "latency": distribution(stats.latencies),
+            "judged": len(stats.scores),
+            "judge_errors": stats.judge_errors,
+            "mean_score": sum(stats.scores) / len(stats.scores) if stats.scores else None,
+            "telemetry": telemetry.summary()
+        }
+
+        reasons = []
+        if report["error_rate"] > self.max_error_rate:
+            reasons.append("error_rate")
+        if self.latency_slo is not None and report["latency"] and report["latency"]["p99"] > self.latency_slo:
+            reasons.append("latency")
+        # Compared with the arrivals actually drawn, not the nominal rate
+        if stage.qps is not None and len(stats.latencies) < attempted * self.min_throughput_ratio:
+            reasons.append("throughput")
+        if stats.dropped:
+            reasons.append("in_flight_limit")
+        report["saturated"] = bool(reasons)
+        report["saturation_reasons"] = reasons
+        return report
@@ -0,0 +1,91 @@
+from typing import Dict, Any, List, Optional
+from contextlib import contextmanager
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+
+class PhaseProfiler:
+    """Captures CPU and memory profiles for named phases of a run
+
+    Each phase gets a cProfile dump (``<phase>.prof``, loadable with
+    ``pstats`` or snakeviz) and a text report with the slowest functions by
+    cumulative time and the largest allocation sites seen by tracemalloc.
+    A disabled profiler only records wall time.
+    """
+
+    def __init__(self,
+                 directory: Optional[str] = None,
+                 enabled: bool = True,
+                 top: int = 30):
+        self.directory = directory
+        self.enabled = enabled and directory is not None
+        self.top = top
+        self.phases: List[Dict[str, Any]] = []
+        if self.enabled:
+            os.makedirs(directory, exist_ok=True)
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                self.phases.append({"phase": name, "wall_time": time.perf_counter() - started})
+            return
+
+        profile = cProfile.Profile()
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            wall_time = time.perf_counter() - started
+            after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if not tracing:
+                tracemalloc.stop()
+            self._report(name, profile, before, after, wall_time, peak)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Wall time (and peak traced memory when profiling) of every phase"""
+        return list(self.phases)
+
+    def _report(self,
+                name: str,
+                profile: cProfile.Profile,
+                before: tracemalloc.Snapshot,
+                after: tracemalloc.Snapshot,
+                wall_time: float,
+                peak: int):
+        profile.dump_stats(os.path.join(self.directory, f"{name}.prof"))
+
+        stats_text = io.StringIO()
+        stats = pstats.Stats(profile, stream=stats_text)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+
+        growth = after.compare_to(before, "lineno")[:self.top]
+        with open(os.path.join(self.directory, f"{name}.txt"), "w") as f:
+            f.write(f"Phase: {name}\n")
+            f.write(f"Wall time: {wall_time:.3f}s\n")
+            f.write(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB\n\n")
+            f.write("Top allocation growth:\n")
+            for stat in growth:
+                f.write(f"  {stat}\n")
+            f.write("\n")
+            f.write(stats_text.getvalue())
+
+        self.phases.append({
+            "phase": name,
+            "wall_time": wall_time,
+            "peak_memory": peak
+        })
@@ -0,0 +1,225 @@
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from datetime import datetime
+from benchmark.core import BenchmarkRunner, BenchmarkTask
+from benchmark.fingerprints import DataRecorder, task_fingerprints
+from benchmark.results import BlobRef
+
+REUSE = "reuse"
+REJUDGE = "rejudge"
+RERUN = "rerun"
+
+class RegressionRunner:
+    """Re-executes only the work whose inputs changed since a previous run
+
+    Every task entry of a run made with ``fingerprint_inputs`` records
+    fingerprints of the task definition, criteria text, data it read, agent
+    version and judge identity. Against such a baseline each task is:
+
+    - re-run when it is new, failed before, or its definition, agent
+      version or data changed (or the agent has no version to compare);
+    - re-judged from its stored output when only the criteria or the judge
+      changed;
+    - reused as is otherwise.
+
+    The results carry the plan under ``regression`` and a score diff
+    against the baseline under ``diff``.
+    """
+
+    def __init__(self, runner: BenchmarkRunner, tolerance: float = 0.0):
+        self.runner = runner
+        # Re-run entries must carry fingerprints for the next comparison
+        self.runner.fingerprint_inputs = True
+        self.tolerance = tolerance
+
+    async def run(self,
+                  agent,
+                  previous: Dict[str, Any],
+                  on_task_complete: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Bring ``previous`` up to date for ``agent`` and diff the scores"""
+        runner = self.runner
+        previous_entries = {entry["task_name"]: entry for entry in previous.get("tasks", [])}
+
+        # Initialized once, so data checks and re-runs see the same data
+        for ds in runner.data_sources:
+            await ds.initialize()
+
+        plan = {}
+        for task in runner.tasks:
+            action, reasons = await self._plan(task, agent, previous_entries.get(task.name))
+            plan[task.name] = {"action": action, "reasons": reasons}
+
+        entries = {}
+        for task in runner.tasks:
+            if plan[task.name]["action"] == REUSE:
+                entries[task.name] = self._adopt(previous_entries[task.name])
+
+        rejudge_tasks = [task for task in runner.tasks if plan[task.name]["action"] == REJUDGE]
+        if rejudge_tasks:
+            rejudged = await runner.rejudge({
+                "tasks": [self._adopt(previous_entries[task.name]) for task in rejudge_tasks]
+            })
+            for task, entry in zip(rejudge_tasks, rejudged["tasks"]):
+                if "rejudge_error" not in entry:
+                    # Only the judging inputs moved on
+                    current = task_fingerprints(task, agent, runner.judge_llm)
+                    entry["fingerprints"] = dict(
+                        entry["fingerprints"],
+                        criteria=current["criteria"],
+                        judge=current["judge"]
+                    )
+                entries[task.name] = entry
+                if on_task_complete:
+                    on_task_complete(entry)
+
+        rerun_tasks = [task for task in runner.tasks if plan[task.name]["action"] == RERUN]
+        fresh = None
+        if rerun_tasks:
+            fresh = await runner.run_benchmark(
+                agent,
+                tasks=rerun_tasks,
+                on_task_complete=on_task_complete,
+                initialize_sources=False
+            )
+            for entry in fresh["tasks"]:
+                entries[entry["task_name"]] = entry
+
+        counts = {REUSE: 0, REJUDGE: 0, RERUN: 0}
+        for step in plan.values():
+            counts[step["action"]] += 1
+
+        results = {
+            "agent_id": agent.id,
+            "timestamp": datetime.now().isoformat(),
+            "tasks": [entries[task.name] for task in runner.tasks],
+            # Latency is only measured for work actually re-run
+            "telemetry": fresh["telemetry"] if fresh else previous.get("telemetry", {}),
+            "regression": {
+                "baseline": previous.get("timestamp"),
+                "counts": counts,
+                "plan": plan
+            }
+        }
+        results["diff"] = diff_results(previous, results, self.tolerance)
+        return results
+
+    async def _plan(self,
+                    task: BenchmarkTask,
+                    agent,
+                    entry: Optional[Dict[str, Any]]) -> Tuple[str, List[str]]:
+        """Decide how to bring one task up to date, and why"""
+        if entry is None:
+            return RERUN, ["new task"]
+        if "error" in entry or "result" not in entry:
+            return RERUN, ["failed in baseline"]
+        recorded = entry.get("fingerprints")
+        if not recorded:
+            return RERUN, ["no fingerprints in baseline"]
+
+        current = task_fingerprints(task, agent, self.runner.judge_llm)
+        if current["agent"] is None:
+            return RERUN, ["agent has no version"]
+        if getattr(agent, "deterministic", True) is False:
+            return RERUN, ["agent is nondeterministic"]
+
+        changed = [key for key in ("task", "agent") if recorded.get(key) != current[key]]
+        if changed:
+            return RERUN, changed
+
+        data = await DataRecorder.replay(self.runner.data_sources, entry.get("data_queries", []))
+        if data != recorded.get("data"):
+            return RERUN, ["data"]
+
+        changed = [key for key in ("criteria", "judge") if recorded.get(key) != current[key]]
+        if changed:
+            return REJUDGE, changed
+        return REUSE, []
+
+    def _adopt(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Move a baseline entry's spilled output into this run's store"""
+        store = self.runner.result_store
+        if store is None or not isinstance(entry.get("result"), BlobRef):
+            return entry
+        return dict(entry, result=store.adopt(entry["result"]))
+
+def task_score(entry: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Weighted score of a task entry, None when it was not evaluated"""
+    if not entry or "evaluation" not in entry:
+        return None
+    return sum(entry["evaluation"].values())
+
+def diff_results(previous: Dict[str, Any],
+                 current: Dict[str, Any],
+                 tolerance: float = 0.0) -> Dict[str, Any]:
+    """Per-task and per-metric score changes between two runs
+
+    A task counts as improved or regressed when its weighted score moved by
+    more than ``tolerance``. Tasks only in one run are ``new`` or
+    ``removed``; tasks without a score on one side are ``failed`` or
+    ``fixed``.
+    """
+    previous_entries = {entry["task_name"]: entry for entry in previous.get("tasks", [])}
+    current_entries = {entry["task_name"]: entry for entry in current.get("tasks", [])}
+    names = list(current_entries) + [name for name in previous_entries if name not in current_entries]
+
+    tasks = []
+    for name in names:
+        before = previous_entries.get(name)
+        after = current_entries.get(name)
+        old_score, new_score = task_score(before), task_score(after)
+
+        if before is None:
+            status = "new"
+        elif after is None:
+            status = "removed"
+        elif new_score is None:
+            status = "unchanged" if old_score is None else "failed"
+        elif old_score is None:
+            status = "fixed"
+        elif new_score - old_score > tolerance:
+            status = "improved"
+        elif old_score - new_score > tolerance:
+            status = "regressed"
+        else:
+            status = "unchanged"
+
+        task_diff = {
+            "task_name": name,
+            "status": status,
+            "previous_score": old_score,
+            "score": new_score,
+            "delta": new_score - old_score if None not in (old_score, new_score) else None
+        }
+        if None not in (old_score, new_score):
+            old_metrics, new_metrics = before["evaluation"], after["evaluation"]
+            task_diff["metrics"] = {
+                metric: {
+                    "previous": old_metrics.get(metric),
+                    "score": new_metrics.get(metric),
+                    "delta": new_metrics.get(metric, 0.0) - old_metrics.get(metric, 0.0)
+                }
+                for metric in sorted(set(old_metrics) | set(new_metrics))
+                if old_metrics.get(metric) != new_metrics.get(metric)
+            }
+        tasks.append(task_diff)
+
+    statuses: Dict[str, int] = {}
+    for task_diff in tasks:
+        statuses[task_diff["status"]] = statuses.get(task_diff["status"], 0) + 1
+
+    return {
+        "summary": {
+            "previous_score": _mean_score(previous_entries.values()),
+            "score": _mean_score(current_entries.values()),
+            "statuses": statuses
+        },
+        "regressed": [
+            task_diff["task_name"]
+            for task_diff in tasks
+            if task_diff["status"] in ("regressed", "failed")
+        ],
+        "tasks": tasks
+    }
+
+def _mean_score(entries) -> Optional[float]:
+    scores = [score for score in map(task_score, entries) if score is not None]
+    return sum(scores) / len(scores) if scores else None
@@ -0,0 +1,230 @@
+from typing import Dict, Any, Optional, Tuple
+from contextlib import closing
+import json
+import logging
+import os
+import random
+import sqlite3
+import time
+import zlib
+from benchmark.results import fingerprint
+
+# Agent methods whose responses are cached
+CACHED_METHODS = ("analyze", "act")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access
+    ON responses (last_access);
+CREATE INDEX IF NOT EXISTS idx_responses_agent
+    ON responses (agent);
+CREATE TABLE IF NOT EXISTS nondeterministic (
+    agent TEXT PRIMARY KEY,
+    detected_at REAL NOT NULL
+);
+"""
+
+class ResponseCache:
+    """Opt-in on-disk cache of agent responses
+
+    Responses are keyed by agent ID and version, the fingerprint of the task
+    (or battle) they were produced for, the method and a hash of the call
+    arguments, i.e. the data snapshot and prompt the agent saw. Entries are
+    stored compressed in SQLite and evicted least recently used once the
+    cache exceeds ``max_bytes``.
+
+    Agents are only cached when they report a ``version`` and do not
+    declare ``deterministic = False`` or a non-zero ``temperature``. A
+    ``verify_rate`` fraction of hits (5% by default) is also sent to the
+    agent; an agent version whose answer differs is marked
+    nondeterministic, its entries are dropped and it bypasses the cache
+    from then on.
+    """
+
+    def __init__(self,
+                 path: str,
+                 max_bytes: int = 1024 * 1024 * 1024,
+                 verify_rate: float = 0.05,
+                 seed: Optional[int] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.verify_rate = verify_rate
+        self.logger = logger or logging.getLogger(__name__)
+        self._random = random.Random(seed)
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._nondeterministic = {
+                agent for (agent,) in conn.execute("SELECT agent FROM nondeterministic")
+            }
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def wrap(self, agent: Any, scope: str) -> Any:
+        """Agent whose calls for ``scope`` (e.g. a task fingerprint) are cached
+
+        Agents that cannot be cached are returned unchanged.
+        """
+        if not self.cacheable(agent):
+            return agent
+        return CachedAgent(agent, self, scope)
+
+    def cacheable(self, agent: Any) -> bool:
+        """Whether responses of ``agent`` can be reused"""
+        if getattr(agent, "version", None) is None:
+            return False
+        if getattr(agent, "deterministic", True) is False:
+            return False
+        if getattr(agent, "temperature", None):
+            return False
+        return not self.is_nondeterministic(agent_key(agent))
+
+    def is_nondeterministic(self, agent: str) -> bool:
+        return agent in self._nondeterministic
+
+    def should_verify(self) -> bool:
+        """Whether a hit should also be checked against the agent"""
+        return bool(self.verify_rate) and self._random.random() < self.verify_rate
+
+    def mark_nondeterministic(self, agent: str):
+        """Stop caching an agent version and drop its entries"""
+        self._nondeterministic.add(agent)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO nondeterministic (agent, detected_at) VALUES (?, ?)",
+                (agent, time.time())
+            )
+            conn.execute("DELETE FROM responses WHERE agent = ?", (agent,))
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """``(True, response)`` on a hit, ``(False, None)`` otherwise"""
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return False, None
+            conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                (time.time(), key)
+            )
+        return True, json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, agent: str, response: Any):
+        """Store a response, skipping values that do not round-trip as JSON"""
+        try:
+            encoded = json.dumps(response)
+        except (TypeError, ValueError):
+            return
+        value = zlib.compress(encoded.encode("utf-8"))
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, agent, value, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, agent, value, len(value), time.time())
+            )
+            self._evict(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        with closing(self._connect()) as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "entries": entries,
+            "bytes": size
+        }
+
+    def clear(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM nondeterministic")
+        self._nondeterministic.clear()
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently used entries until the cache fits ``max_bytes``"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            evicted.append((key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+class CachedAgent:
+    """Proxy serving ``analyze`` and ``act`` from a ResponseCache
+
+    Everything else is forwarded to the wrapped agent.
+    """
+
+    def __init__(self, agent: Any, cache: ResponseCache, scope: str):
+        self._agent = agent
+        self._cache = cache
+        self._scope = scope
+        self._agent_key = agent_key(agent)
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._agent, name)
+        if name not in CACHED_METHODS or not callable(attribute):
+            return attribute
+
+        async def cached(*args, **kwargs):
+            return await self._call(name, attribute, args, kwargs)
+        return cached
+
+    async def _call(self, method: str, function, args: tuple, kwargs: Dict[str, Any]) -> Any:
+        cache = self._cache
+        if cache.is_nondeterministic(self._agent_key):
+            # Detected by another call since this proxy was created
+            cache.bypassed += 1
+            return await function(*args, **kwargs)
+
+        key = fingerprint({
+            "agent": self._agent_key,
+            "scope": self._scope,
+            "method": method,
+            "arguments": [args, kwargs]
+        })
+        found, response = cache.get(key)
+        if not found:
+            cache.misses += 1
+            response = await function(*args, **kwargs)
+            cache.put(key, self._agent_key, response)
+            return response
+
+        cache.hits += 1
+        if cache.should_verify():
+            fresh = await function(*args, **kwargs)
+            if fingerprint(fresh) != fingerprint(response):
+                cache.logger.warning(
+                    f"{self._agent_key} returned a different response for a cached call; "
+                    "bypassing the response cache for it from now on"
+                )
+                cache.mark_nondeterministic(self._agent_key)
+                return fresh
+        return response
+
+def agent_key(agent: Any) -> str:
+    """Identity of an agent version, as used in cache keys"""
+    return f"{getattr(agent, 'id', type(agent).__name__)}@{getattr(agent, 'version', None)}"
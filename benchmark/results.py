@@ -0,0 +1,180 @@
+from typing import Dict, Any, Iterator, List
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+BLOB_KEY = "$blob"
+
+class BlobRef:
+    """Lazy reference to a payload spilled to a ResultStore
+
+    Serialized as ``{"$blob": <sha256>, "size": <bytes>}``; the payload is
+    only read back when ``load`` is called.
+    """
+
+    __slots__ = ("store", "digest", "size")
+
+    def __init__(self, store: "ResultStore", digest: str, size: int):
+        self.store = store
+        self.digest = digest
+        self.size = size
+
+    def load(self) -> Any:
+        return self.store.load(self.digest)
+
+    def iter_text(self, chunk_size: int = 64 * 1024) -> Iterator[str]:
+        """Stream the payload's JSON text without decoding it"""
+        with gzip.open(self.store.path(self.digest), "rt", encoding="utf-8") as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+
+    def to_json(self) -> Dict[str, Any]:
+        return {BLOB_KEY: self.digest, "size": self.size}
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, BlobRef) and other.digest == self.digest
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
+
+    def __repr__(self) -> str:
+        return f"BlobRef({self.digest[:12]}, {self.size} bytes)"
+
+class ResultStore:
+    """Content-addressed store for large task payloads
+
+    ``spill`` encodes a value incrementally; values whose JSON stays under
+    ``threshold`` bytes are returned unchanged, larger ones are streamed
+    gzip-compressed to ``blobs/<aa>/<sha256>.json.gz`` and replaced by a
+    BlobRef. Identical payloads share one blob, and neither path ever holds
+    a second full copy of the encoded payload in memory.
+    """
+
+    def __init__(self, directory: str, threshold: int = 64 * 1024):
+        self.directory = directory
+        self.threshold = threshold
+
+    def spill(self, value: Any) -> Any:
+        """Keep ``value`` inline if small, otherwise store it and return a BlobRef"""
+        if isinstance(value, BlobRef):
+            return value
+
+        chunks = json.JSONEncoder(default=json_default).iterencode(value)
+        head = []
+        size = 0
+        for chunk in chunks:
+            head.append(chunk)
+            size += len(chunk.encode("utf-8"))
+            if size >= self.threshold:
+                break
+        else:
+            return value
+
+        # Past the threshold: stream what was buffered and the rest to disk
+        digest = hashlib.sha256()
+        size = 0
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                for chunk in _chain(head, chunks):
+                    data = chunk.encode("utf-8")
+                    digest.update(data)
+                    size += len(data)
+                    f.write(data)
+            path = self.path(digest.hexdigest())
+            if os.path.exists(path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return BlobRef(self, digest.hexdigest(), size)
+
+    def load(self, digest: str) -> Any:
+        with gzip.open(self.path(digest), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}.json.gz")
+
+    def ref(self, digest: str, size: int = 0) -> BlobRef:
+        return BlobRef(self, digest, size)
+
+    def adopt(self, ref: BlobRef) -> BlobRef:
+        """Bring a blob from another store into this one"""
+        path = self.path(ref.digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                # Blobs are immutable, so a hard link is as good as a copy
+                os.link(ref.store.path(ref.digest), path)
+            except OSError:
+                shutil.copyfile(ref.store.path(ref.digest), path)
+        return BlobRef(self, ref.digest, ref.size)
+
+    def hydrate(self, data: Any) -> Any:
+        """Replace serialized blob markers with lazy BlobRefs into this store"""
+        if isinstance(data, dict):
+            if BLOB_KEY in data:
+                return self.ref(data[BLOB_KEY], data.get("size", 0))
+            return {key: self.hydrate(value) for key, value in data.items()}
+        if isinstance(data, list):
+            return [self.hydrate(value) for value in data]
+        return data
+
+def json_default(value: Any) -> Any:
+    """``default`` hook for json that writes BlobRefs as markers"""
+    if isinstance(value, BlobRef):
+        return value.to_json()
+    return str(value)
+
+def fingerprint(value: Any) -> str:
+    """Content hash of a JSON-like value, independent of key order"""
+    payload = json.dumps(value, sort_keys=True, default=json_default)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def find_refs(data: Any) -> List[BlobRef]:
+    """Every BlobRef in a results structure"""
+    if isinstance(data, BlobRef):
+        return [data]
+    if isinstance(data, dict):
+        return [ref for value in data.values() for ref in find_refs(value)]
+    if isinstance(data, (list, tuple)):
+        return [ref for value in data for ref in find_refs(value)]
+    return []
+
+def iter_json(data: Any) -> Iterator[str]:
+    """Encode JSON with every BlobRef's payload streamed inline"""
+    if isinstance(data, BlobRef):
+        yield from data.iter_text()
+    elif isinstance(data, dict):
+        yield "{"
+        for position, (key, value) in enumerate(data.items()):
+            yield (", " if position else "") + json.dumps(str(key)) + ": "
+            yield from iter_json(value)
+        yield "}"
+    elif isinstance(data, (list, tuple)):
+        yield "["
+        for position, value in enumerate(data):
+            if position:
+                yield ", "
+            yield from iter_json(value)
+        yield "]"
+    else:
+        yield json.dumps(data, default=str)
+
+def _chain(head: List[str], rest: Iterator[str]) -> Iterator[str]:
+    yield from head
+    yield from rest
@@ -0,0 +1,399 @@
+"""Self-benchmark of the framework's own overhead
+
+Drives the runner, the synthetic data source, the leaderboard, the battle
+engine and the criteria parser against in-process mock agents, judges and
+sources with configurable latency and payload sizes, so the numbers
+measure the framework rather than LLM calls::
+
+    python -m benchmark.selfbench --save-baseline
+    python -m benchmark.selfbench --scenario runner --latency 5
+
+Each scenario reports throughput, p50/p99 latency per operation and peak
+traced memory, and is compared against the stored baseline. The exit
+status is 1 when any metric regressed beyond the tolerance.
+"""
+from typing import Dict, Any, List, Callable, Awaitable, Tuple
+from dataclasses import dataclass, asdict
+import argparse
+import asyncio
+import atexit
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from benchmark.core import BenchmarkRunner, DataSource
+from benchmark.battle.core import AgentBattle
+from benchmark.evaluation.criteria_parser import CriteriaParser
+from benchmark.tasks.templates import ParametricTask
+
+DEFAULT_BASELINE = "selfbench_baseline.json"
+
+# Direction in which each metric improves
+METRICS = {
+    "throughput": 1,
+    "p50_ms": -1,
+    "p99_ms": -1,
+    "peak_memory_mb": -1
+}
+
+REGIONS = ["amer", "emea", "apac", "latam"]
+STAGES = ["prospect", "qualified", "proposal", "closed_won", "closed_lost"]
+
+@dataclass
+class SelfBenchConfig:
+    latency: float = 0.0
+    payload_size: int = 1024
+    records: int = 10000
+    tasks: int = 50
+    criteria: int = 8
+    agents: int = 4
+    rounds: int = 20
+    submissions: int = 200
+    iterations: int = 20
+    seed: int = 0
+
+class MockLLM:
+    """Stands in for both the criteria-parsing LLM and the judge"""
+
+    def __init__(self, criteria: int = 8, latency: float = 0.0, seed: int = 0):
+        self.criteria_names = [f"criterion_{i}" for i in range(criteria)]
+        self.latency = latency
+        self._random = random.Random(seed)
+
+    async def generate(self, prompt: str) -> str:
+        await _simulate(self.latency)
+        return json.dumps({"criteria": [
+            {
+                "name": name,
+                "description": f"How well the output satisfies {name}",
+                "scoring_guide": "1: poor, 5: adequate, 10: excellent",
+                "weight": 1.0
+            }
+            for name in self.criteria_names
+        ]})
+
+    async def evaluate(self, prompt: str) -> Dict[str, float]:
+        await _simulate(self.latency)
+        return {name: self._random.uniform(1, 10) for name in self.criteria_names}
+
+class MockAgent:
+    """Agent that answers after a fixed latency with a fixed-size payload"""
+
+    def __init__(self, agent_id: str, latency: float = 0.0, payload_size: int = 1024):
+        self.id = agent_id
+        self.latency = latency
+        self._payload = "x" * payload_size
+
+    async def analyze(self, data: Any, prompt: str) -> Dict[str, Any]:
+        await _simulate(self.latency)
+        return {"summary": self._payload, "data_points": len(data)}
+
+    async def act(self, data: Any, opponent_actions: Dict[str, Any] = None) -> Dict[str, Any]:
+        await _simulate(self.latency)
+        return {"action": self._payload, "opponents_seen": len(opponent_actions or {})}
+
+class MockDataSource(DataSource):
+    """Serves a fixed set of generated records after a fixed latency"""
+
+    def __init__(self, records: List[Dict[str, Any]], latency: float = 0.0):
+        self.records = records
+        self.latency = latency
+
+    async def initialize(self):
+        pass
+
+    async def get_data(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        await _simulate(self.latency)
+        return self.records
+
+class MockBattle(AgentBattle):
+    """Battle whose rounds are scored by the mock judge"""
+
+    def __init__(self, judge: MockLLM, **kwargs):
+        super().__init__(**kwargs)
+        self.judge = judge
+
+    async def _evaluate_round(self,
+                              agent_actions: Dict[str, Any],
+                              metrics: List[str]) -> Dict[str, Dict[str, float]]:
+        scores = await asyncio.gather(*[
+            self.judge.evaluate(json.dumps(action)) for action in agent_actions.values()
+        ])
+        return {
+            agent_id: {metric: score[self.judge.criteria_names[0]] for metric in metrics}
+            for agent_id, score in zip(agent_actions, scores)
+        }
+
+Operation = Callable[[], Awaitable[Any]]
+
+async def runner_scenario(config: SelfBenchConfig) -> Tuple[Operation, int]:
+    """A full BenchmarkRunner pass over ``tasks`` parametric tasks"""
+    llm = MockLLM(config.criteria, config.latency, config.seed)
+    parser = CriteriaParser(llm)
+    tasks = [
+        ParametricTask(
+            name=f"selfbench_task_{i}",
+            description="Self-benchmark task",
+            category="general_purpose",
+            prompt="Summarize the pipeline",
+            data_query={"type": "sales"}
+        )
+        for i in range(config.tasks)
+    ]
+    for task in tasks:
+        await task.initialize(parser)
+
+    runner = BenchmarkRunner(
+        data_sources=[MockDataSource(_records(config.records, config.seed), config.latency)],
+        tasks=tasks,
+        judge_llm=llm
+    )
+    agent = MockAgent("selfbench", config.latency, config.payload_size)
+    return lambda: runner.run_benchmark(agent), config.tasks
+
+async def synthetic_scenario(config: SelfBenchConfig) -> Tuple[Operation, int]:
+    """Filtered SyntheticDataSource.get_data over ``records`` rows"""
+    from benchmark.sources.synthetic import SyntheticDataSource
+
+    # Skip the generator so the dataset size is controlled here
+    source = SyntheticDataSource.__new__(SyntheticDataSource)
+    source.config = {}
+    source.data = {"sales": _records(config.records, config.seed)}
+    query = {"type": "sales", "filters": {"region": "emea", "stage": "qualified"}}
+    return lambda: source.get_data(query), config.records
+
+async def leaderboard_cold_scenario(config: SelfBenchConfig) -> Tuple[Operation, int]:
+    """Leaderboard.get_rankings with bootstrap statistics, caches cleared"""
+    from experiments.leaderboard import AgentCategory
+
+    leaderboard = _populate_leaderboard(config)
+
+    async def operation():
+        leaderboard._cache.clear()
+        return leaderboard.get_rankings(AgentCategory.GENERAL)
+
+    return operation, config.submissions
+
+async def leaderboard_warm_scenario(config: SelfBenchConfig) -> Tuple[Operation, int]:
+    """Leaderboard.get_rankings served from the read cache"""
+    from experiments.leaderboard import AgentCategory
+
+    leaderboard = _populate_leaderboard(config)
+
+    async def operation():
+        return leaderboard.get_rankings(AgentCategory.GENERAL)
+
+    return operation, config.submissions
+
+async def battle_scenario(config: SelfBenchConfig) -> Tuple[Operation, int]:
+    """AgentBattle.run_competition with ``agents`` agents over ``rounds`` rounds"""
+    battle = MockBattle(
+        MockLLM(config.criteria, config.latency, config.seed),
+        category="general_purpose",
+        max_rounds=config.rounds
+    )
+    for i in range(config.agents):
+        battle.register_agent(f"agent_{i}", MockAgent(f"agent_{i}", config.latency, config.payload_size))
+
+    source = MockDataSource(_records(config.records, config.seed), config.latency)
+    metrics = ["response_quality", "strategy_adaptation"]
+    return lambda: battle.run_competition(source, metrics), config.rounds
+
+async def criteria_parser_scenario(config: SelfBenchConfig) -> Tuple[Operation, int]:
+    """CriteriaParser.parse_criteria plus judge prompt generation"""
+    parser = CriteriaParser(MockLLM(config.criteria, config.latency, config.seed))
+
+    async def operation():
+        criteria = await parser.parse_criteria("Evaluate accuracy, clarity and depth")
+        return await parser.generate_judge_prompt(criteria)
+
+    return operation, 1
+
+SCENARIOS = {
+    "runner": runner_scenario,
+    "synthetic_get_data": synthetic_scenario,
+    "leaderboard_cold": leaderboard_cold_scenario,
+    "leaderboard_warm": leaderboard_warm_scenario,
+    "battle": battle_scenario,
+    "criteria_parser": criteria_parser_scenario
+}
+
+async def measure(operation: Operation, units: int, iterations: int) -> Dict[str, float]:
+    """Time ``iterations`` calls, then trace memory on one more"""
+    await operation()
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        await operation()
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    # Tracing slows allocation down, so memory gets its own pass
+    tracemalloc.start()
+    try:
+        await operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "throughput": units * iterations / elapsed,
+        "p50_ms": cuts[49] * 1000,
+        "p99_ms": cuts[98] * 1000,
+        "peak_memory_mb": peak / 1024 / 1024
+    }
+
+async def run_selfbench(config: SelfBenchConfig, scenarios: List[str] = None) -> Dict[str, Dict[str, float]]:
+    """Run the selected scenarios (all by default)"""
+    results = {}
+    for name in scenarios or list(SCENARIOS):
+        operation, units = await SCENARIOS[name](config)
+        results[name] = await measure(operation, units, max(config.iterations, 2))
+    return results
+
+def compare(results: Dict[str, Dict[str, float]],
+            baseline: Dict[str, Dict[str, float]],
+            tolerance: float = 0.1) -> List[Dict[str, Any]]:
+    """Relative change of every metric against the baseline"""
+    changes = []
+    for scenario, metrics in results.items():
+        for metric, direction in METRICS.items():
+            previous = baseline.get(scenario, {}).get(metric)
+            if not previous:
+                continue
+            change = (metrics[metric] - previous) / previous
+            changes.append({
+                "scenario": scenario,
+                "metric": metric,
+                "baseline": previous,
+                "current": metrics[metric],
+                "change": change,
+                "regression": change * direction < -tolerance
+            })
+    return changes
+
+def _populate_leaderboard(config: SelfBenchConfig):
+    from experiments import ExperimentRegistry
+    from experiments.leaderboard import Leaderboard
+
+    storage_path = tempfile.mkdtemp(prefix="selfbench-")
+    atexit.register(shutil.rmtree, storage_path, True)
+    registry = ExperimentRegistry(storage_path)
+    rng = random.Random(config.seed)
+    for i in range(config.submissions):
+        registry.register_submission(
+            f"agent_{i}",
+            {
+                "agent_name": f"agent_{i}",
+                "category": "general_purpose",
+                "submitted_at": "2024-01-01T00:00:00"
+            },
+            {"tasks": [
+                {
+                    "task_name": f"task_{j}",
+                    "evaluation": {
+                        "task_completion": rng.uniform(1, 10),
+                        "output_quality": rng.uniform(1, 10)
+                    }
+                }
+                for j in range(config.tasks)
+            ]}
+        )
+    return Leaderboard(storage_path)
+
+def _records(count: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "region": rng.choice(REGIONS),
+            "stage": rng.choice(STAGES),
+            "amount": round(rng.uniform(1000, 100000), 2)
+        }
+        for i in range(count)
+    ]
+
+async def _simulate(latency: float):
+    # Zero latency skips the sleep so only framework code is measured
+    if latency > 0:
+        await asyncio.sleep(latency)
+
+def main(argv: List[str] = None) -> int:
+    defaults = SelfBenchConfig()
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmark.selfbench",
+        description="Measure the framework's own overhead with mock agents and judges"
+    )
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="Scenario to run (repeatable, default all)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Simulated agent, judge and source latency in milliseconds")
+    parser.add_argument("--payload-size", type=int, default=defaults.payload_size,
+                        help="Bytes in each agent response")
+    for field in ("records", "tasks", "criteria", "agents", "rounds", "submissions", "iterations", "seed"):
+        parser.add_argument(f"--{field}", type=int, default=getattr(defaults, field))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="Relative change that counts as a regression")
+    parser.add_argument("--output", help="Also write the results as JSON here")
+    args = parser.parse_args(argv)
+
+    config = SelfBenchConfig(
+        latency=args.latency / 1000,
+        payload_size=args.payload_size,
+        records=args.records,
+        tasks=args.tasks,
+        criteria=args.criteria,
+        agents=args.agents,
+        rounds=args.rounds,
+        submissions=args.submissions,
+        iterations=args.iterations,
+        seed=args.seed
+    )
+    results = asyncio.run(run_selfbench(config, args.scenario))
+
+    print(f"{'scenario':<20} {'throughput/s':>14} {'p50 ms':>10} {'p99 ms':>10} {'peak MiB':>10}")
+    for name, metrics in results.items():
+        print(
+            f"{name:<20} {metrics['throughput']:>14.1f} {metrics['p50_ms']:>10.2f} "
+            f"{metrics['p99_ms']:>10.2f} {metrics['peak_memory_mb']:>10.2f}"
+        )
+
+    report = {"config": asdict(config), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != asdict(config):
+            print("Warning: baseline was recorded with a different configuration")
+
+        print("\nAgainst baseline:")
+        for change in compare(results, baseline.get("results", {}), args.tolerance):
+            flag = "  REGRESSION" if change["regression"] else ""
+            print(f"  {change['scenario']:<20} {change['metric']:<15} {change['change']:>+8.1%}{flag}")
+            if change["regression"]:
+                regressions.append(change)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
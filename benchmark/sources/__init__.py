@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 SOURCE_SCHEMAS = {
     "salesforce": {
@@ -121,4 +121,28 @@ SOURCE_SCHEMAS = {
 
 def get_available_sources() -> Dict[str, Dict[str, Any]]:
     """Get available data sources and their configuration schemas"""
-    return SOURCE_SCHEMAS 
\ No newline at end of file
+    return SOURCE_SCHEMAS
+
+def create_data_sources(configs: Dict[str, Dict[str, Any]]) -> List[Any]:
+    """Initialize data sources from configs"""
+    sources = []
+    for source_type, config in configs.items():
+        if source_type == 'salesforce':
+            from benchmark.sources.salesforce import SalesforceDataSource
+            sources.append(SalesforceDataSource(config))
+        elif source_type == 'hubspot':
+            from benchmark.sources.hubspot import HubspotDataSource
+            sources.append(HubspotDataSource(config))
+        elif source_type == 'gmail':
+            from benchmark.sources.google import GmailDataSource
+            sources.append(GmailDataSource(config))
+        elif source_type == 'google_drive':
+            from benchmark.sources.google import GoogleDriveDataSource
+            sources.append(GoogleDriveDataSource(config))
+        elif source_type == 'slack':
+            from benchmark.sources.slack import SlackDataSource
+            sources.append(SlackDataSource(config))
+        elif source_type == 'synthetic':
+            from benchmark.sources.synthetic import SyntheticDataSource
+            sources.append(SyntheticDataSource(config))
+    return sources
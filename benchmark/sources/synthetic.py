@@ -1,3 +1,4 @@
+from typing import Dict, Any
 from benchmark.core import DataSource
 from synthetic_data_generator import CompanyDataGenerator
 import asyncio
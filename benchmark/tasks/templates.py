@@ -0,0 +1,223 @@
+from typing import Dict, Any, List, Iterator, Optional, Callable
+from dataclasses import dataclass, field
+import hashlib
+import json
+import random
+import re
+from benchmark.core import BenchmarkTask
+
+# "{name}", optionally with a conversion and format spec, e.g. "{rate:.0%}"
+PLACEHOLDER = re.compile(r"\{(\w+)((?:![rsa])?(?::[^{}]*)?)\}")
+
+@dataclass
+class TaskVariant:
+    """A single point of an expanded parameter grid"""
+    index: int
+    params: Dict[str, Any]
+    fields: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def fingerprint(self) -> str:
+        """Content hash of the rendered variant, used for deduplication"""
+        content = {key: value for key, value in self.fields.items() if key != "name"}
+        payload = json.dumps(content, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ParametricTask(BenchmarkTask):
+    """Task instance generated from a TaskTemplate"""
+
+    def __init__(self,
+                 name: str,
+                 description: str,
+                 category: str,
+                 prompt: str,
+                 data_query: Dict[str, Any],
+                 params: Dict[str, Any] = None,
+                 custom_criteria: str = None):
+        super().__init__(
+            name=name,
+            description=description,
+            category=category,
+            custom_criteria=custom_criteria
+        )
+        self.prompt = prompt
+        self.data_query = data_query
+        self.params = params or {}
+
+    def fingerprint_fields(self) -> Dict[str, Any]:
+        return dict(
+            super().fingerprint_fields(),
+            prompt=self.prompt,
+            data_query=self.data_query,
+            params=self.params
+        )
+
+    async def run(self, agent, context: Dict[str, Any]) -> Dict[str, Any]:
+        # Get the data slice for this variant from available sources
+        data = []
+        for source in context["data_sources"]:
+            try:
+                source_data = await source.get_data(self.data_query)
+                data.extend(source_data)
+            except Exception:
+                continue
+
+        analysis = await agent.analyze(data=data, prompt=self.prompt)
+
+        return {
+            "analysis": analysis,
+            "data_points": len(data),
+            "params": self.params
+        }
+
+class TaskTemplate:
+    """Expands a parameter grid into benchmark tasks lazily
+
+    Each parameter maps to a list of values, e.g. ``category``,
+    ``data_slice``, ``prompt_variant`` and ``difficulty``. Placeholders
+    naming a parameter are replaced in every string field, so
+    ``"{difficulty}"`` in a prompt becomes the current difficulty value;
+    any other braces, such as JSON examples, are kept as written. Every
+    placeholder in ``category`` and ``data_query`` must name a parameter.
+    Grid points are addressed by index, so sampling and sharding never
+    build the full grid.
+    """
+
+    def __init__(self,
+                 name: str,
+                 description: str,
+                 prompt: str,
+                 parameters: Dict[str, List[Any]],
+                 category: str = "{category}",
+                 data_query: Dict[str, Any] = None,
+                 custom_criteria: str = None,
+                 task_factory: Callable[..., BenchmarkTask] = ParametricTask):
+        self.name = name
+        self.description = description
+        self.prompt = prompt
+        self.parameters = {key: list(values) for key, values in parameters.items()}
+        self.category = category
+        self.data_query = data_query or {"type": "{data_slice}"}
+        self.custom_criteria = custom_criteria
+        self.task_factory = task_factory
+
+        missing = sorted(_placeholders([self.category, self.data_query]) - set(self.parameters))
+        if missing:
+            raise ValueError(
+                f"Template {name} uses undeclared parameters in category or data_query: {missing}"
+            )
+
+        self._keys = list(self.parameters)
+        self._sizes = [len(self.parameters[key]) for key in self._keys]
+
+    def __len__(self) -> int:
+        size = 1
+        for dimension in self._sizes:
+            size *= dimension
+        return size
+
+    def variant(self, index: int) -> TaskVariant:
+        """Decode a grid index into its variant without expanding the grid"""
+        if not 0 <= index < len(self):
+            raise IndexError(f"Variant index out of range: {index}")
+
+        # Mixed-radix decode, last parameter varies fastest
+        params = {}
+        remainder = index
+        for key, size in reversed(list(zip(self._keys, self._sizes))):
+            remainder, position = divmod(remainder, size)
+            params[key] = self.parameters[key][position]
+        params = {key: params[key] for key in self._keys}
+
+        return TaskVariant(index=index, params=params, fields=self._render(params))
+
+    def expand(self,
+               shard: int = 0,
+               num_shards: int = 1,
+               sample_size: Optional[int] = None,
+               seed: int = 0,
+               deduplicate: bool = True) -> Iterator[BenchmarkTask]:
+        """Yield task instances for the grid, one at a time
+
+        ``sample_size`` draws a deterministic sample for ``seed``; variants
+        are assigned to shards by their content fingerprint, so shards are
+        disjoint, duplicates always land on the same shard, and together
+        they cover the same variants a single process would see.
+        """
+        for variant in self.variants(shard, num_shards, sample_size, seed, deduplicate):
+            yield self.build(variant)
+
+    def variants(self,
+                 shard: int = 0,
+                 num_shards: int = 1,
+                 sample_size: Optional[int] = None,
+                 seed: int = 0,
+                 deduplicate: bool = True) -> Iterator[TaskVariant]:
+        """Yield variants for the grid without instantiating tasks"""
+        if not 0 <= shard < num_shards:
+            raise ValueError(f"Invalid shard {shard} of {num_shards}")
+
+        seen = set()
+        for index in self._indices(sample_size, seed):
+            variant = self.variant(index)
+            if num_shards > 1 or deduplicate:
+                fingerprint = variant.fingerprint
+                if int(fingerprint, 16) % num_shards != shard:
+                    continue
+                if deduplicate:
+                    if fingerprint in seen:
+                        continue
+                    seen.add(fingerprint)
+
+            yield variant
+
+    def build(self, variant: TaskVariant) -> BenchmarkTask:
+        """Instantiate the task for a variant"""
+        return self.task_factory(params=variant.params, **variant.fields)
+
+    def _indices(self, sample_size: Optional[int], seed: int) -> Iterator[int]:
+        """Grid indices to visit, in a deterministic order"""
+        total = len(self)
+        if sample_size is None or sample_size >= total:
+            return iter(range(total))
+
+        # random.sample on a range does not materialize the population
+        return iter(random.Random(seed).sample(range(total), sample_size))
+
+    def _render(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Render the template fields for a grid point"""
+        name_suffix = "-".join(str(params[key]) for key in self._keys)
+        return {
+            "name": f"{self.name}[{name_suffix}]" if name_suffix else self.name,
+            "description": self._format(self.description, params),
+            "category": self._format(self.category, params),
+            "prompt": self._format(self.prompt, params),
+            "data_query": self._format(self.data_query, params),
+            "custom_criteria": self._format(self.custom_criteria, params)
+        }
+
+    def _format(self, value: Any, params: Dict[str, Any]) -> Any:
+        """Recursively substitute parameter placeholders in a template value"""
+        if isinstance(value, str):
+            return PLACEHOLDER.sub(
+                lambda match: (
+                    ("{0" + match.group(2) + "}").format(params[match.group(1)])
+                    if match.group(1) in params else match.group(0)
+                ),
+                value
+            )
+        if isinstance(value, dict):
+            return {key: self._format(item, params) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._format(item, params) for item in value]
+        return value
+
+def _placeholders(value: Any) -> set:
+    """Names of the placeholders in the strings of a template value"""
+    if isinstance(value, str):
+        return {match.group(1) for match in PLACEHOLDER.finditer(value)}
+    if isinstance(value, dict):
+        return set().union(*map(_placeholders, value.values()))
+    if isinstance(value, list):
+        return set().union(*map(_placeholders, value))
+    return set()
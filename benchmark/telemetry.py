@@ -0,0 +1,148 @@
+from typing import Dict, Any, List, Optional, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+import time
+
+# Methods timed on instrumented agents and judges
+INSTRUMENTED_METHODS = ("analyze", "act", "evaluate", "generate")
+
+PERCENTILES = (50, 90, 99)
+
+@dataclass
+class CallRecord:
+    """Timing and usage of a single agent or judge call"""
+    kind: str
+    participant: str
+    method: str
+    wall_time: float = 0.0
+    ttfb: Optional[float] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    retries: int = 0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+_current_call: ContextVar[Optional[CallRecord]] = ContextVar("current_call", default=None)
+
+def current_call() -> Optional[CallRecord]:
+    """Record of the instrumented call in progress, if any
+
+    Clients that know more than the wall clock (time to first byte, retries,
+    token usage) fill it in; outside an instrumented call this is None.
+    """
+    return _current_call.get()
+
+class CallTelemetry:
+    """Collects a CallRecord for every call made through ``instrument``"""
+
+    def __init__(self):
+        self.records: List[CallRecord] = []
+
+    def instrument(self, target: Any, kind: str, participant: Optional[str] = None) -> Any:
+        """Wrap ``target`` so its agent and judge methods are timed"""
+        if target is None or isinstance(target, InstrumentedClient):
+            return target
+        participant = participant or str(getattr(target, "id", None) or type(target).__name__)
+        return InstrumentedClient(target, self, kind, participant)
+
+    def mark(self) -> int:
+        """Position to pass to ``summary`` for the calls made from now on"""
+        return len(self.records)
+
+    def summary(self, since: int = 0) -> Dict[str, Dict[str, Any]]:
+        """Aggregates per call kind (``agent``, ``judge``)"""
+        by_kind: Dict[str, List[CallRecord]] = {}
+        for record in self.records[since:]:
+            by_kind.setdefault(record.kind, []).append(record)
+        return {kind: summarize(records) for kind, records in by_kind.items()}
+
+    def by_participant(self, kind: str = "agent") -> Dict[str, Dict[str, Any]]:
+        """Aggregates per participant for one call kind"""
+        by_participant: Dict[str, List[CallRecord]] = {}
+        for record in self.records:
+            if record.kind == kind:
+                by_participant.setdefault(record.participant, []).append(record)
+        return {
+            participant: summarize(records)
+            for participant, records in by_participant.items()
+        }
+
+class InstrumentedClient:
+    """Proxy that records a CallRecord around each agent or judge call
+
+    Everything except the methods in ``INSTRUMENTED_METHODS`` is forwarded
+    untouched, so the proxy can stand in for the wrapped object anywhere.
+    """
+
+    def __init__(self, target: Any, telemetry: CallTelemetry, kind: str, participant: str):
+        self._target = target
+        self._telemetry = telemetry
+        self._kind = kind
+        self._participant = participant
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._target, name)
+        if name not in INSTRUMENTED_METHODS or not callable(attribute):
+            return attribute
+
+        async def timed(*args, **kwargs):
+            return await self._call(name, attribute, *args, **kwargs)
+        return timed
+
+    async def _call(self, method: str, function, *args, **kwargs) -> Any:
+        record = CallRecord(self._kind, self._participant, method)
+        token = _current_call.set(record)
+        started = time.perf_counter()
+        try:
+            result = await function(*args, **kwargs)
+            _record_usage(record, result)
+            return result
+        except Exception as e:
+            record.error = type(e).__name__
+            raise
+        finally:
+            record.wall_time = time.perf_counter() - started
+            _current_call.reset(token)
+            self._telemetry.records.append(record)
+
+def summarize(records: Iterable[CallRecord]) -> Dict[str, Any]:
+    """Counts, token totals and latency percentiles of a set of calls"""
+    records = list(records)
+    input_tokens = [r.input_tokens for r in records if r.input_tokens is not None]
+    output_tokens = [r.output_tokens for r in records if r.output_tokens is not None]
+    return {
+        "calls": len(records),
+        "errors": sum(1 for r in records if r.error),
+        "retries": sum(r.retries for r in records),
+        "input_tokens": sum(input_tokens) if input_tokens else None,
+        "output_tokens": sum(output_tokens) if output_tokens else None,
+        "wall_time": distribution([r.wall_time for r in records]),
+        "ttfb": distribution([r.ttfb for r in records if r.ttfb is not None])
+    }
+
+def distribution(values: List[float]) -> Optional[Dict[str, float]]:
+    """Total, mean, max and nearest-rank percentiles of ``values``"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    result = {
+        "total": sum(ordered),
+        "mean": sum(ordered) / len(ordered),
+        "max": ordered[-1]
+    }
+    for percentile in PERCENTILES:
+        rank = max(1, -(-percentile * len(ordered) // 100))
+        result[f"p{percentile}"] = ordered[rank - 1]
+    return result
+
+def _record_usage(record: CallRecord, result: Any):
+    """Take token counts from an OpenAI/Anthropic style ``usage`` field"""
+    if record.input_tokens is not None or not isinstance(result, dict):
+        return
+    usage = result.get("usage")
+    if not isinstance(usage, dict):
+        return
+    record.input_tokens = usage.get("input_tokens", usage.get("prompt_tokens"))
+    record.output_tokens = usage.get("output_tokens", usage.get("completion_tokens"))
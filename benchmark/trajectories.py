@@ -0,0 +1,210 @@
+from typing import Dict, Any, List, Optional, Iterator, Tuple
+from datetime import datetime
+import json
+import os
+import zlib
+from benchmark.results import json_default
+
+LOG_FILENAME = "trajectories.log"
+INDEX_FILENAME = "trajectories.idx"
+
+class TrajectoryWriter:
+    """Streams trajectory events into a compressed append-only log
+
+    Events are buffered per (task, round) and written as independent zlib
+    frames once a buffer reaches ``frame_size`` bytes, the task (or round)
+    is finished, the task moves on to another round, or the writer is
+    closed. A JSON lines sidecar index records the task, round, step range,
+    offset and length of every frame, so a reader can decompress a single
+    task's frames without touching the rest of the log.
+
+    Reopening a directory appends to its log; step numbers continue from
+    the ones already indexed, so (task, round, step) stays unique.
+    """
+
+    def __init__(self, directory: str, frame_size: int = 256 * 1024):
+        self.directory = directory
+        self.frame_size = frame_size
+        os.makedirs(directory, exist_ok=True)
+        index_path = os.path.join(directory, INDEX_FILENAME)
+        _truncate_torn_line(index_path)
+        self._log = open(os.path.join(directory, LOG_FILENAME), "ab")
+        self._index = open(index_path, "a", encoding="utf-8")
+        self._buffers: Dict[Tuple[str, Optional[int]], List[bytes]] = {}
+        self._buffered_bytes: Dict[Tuple[str, Optional[int]], int] = {}
+        self._first_step: Dict[Tuple[str, Optional[int]], int] = {}
+        self._steps: Dict[Tuple[str, Optional[int]], int] = {}
+        # Latest round recorded per task, to flush rounds left behind
+        self._rounds: Dict[str, Optional[int]] = {}
+        self._resume_steps()
+
+    def record(self,
+               task: str,
+               event_type: str,
+               data: Any = None,
+               round: Optional[int] = None):
+        """Append one event to the trajectory of a task (and round)"""
+        key = (task, round)
+        if task in self._rounds and self._rounds[task] != round:
+            self._flush((task, self._rounds[task]))
+        self._rounds[task] = round
+        step = self._steps.get(key, 0)
+        self._steps[key] = step + 1
+
+        event = {
+            "task": task,
+            "round": round,
+            "step": step,
+            "type": event_type,
+            "timestamp": datetime.now().isoformat(),
+            "data": data
+        }
+        line = json.dumps(event, default=json_default).encode("utf-8") + b"\n"
+
+        self._first_step.setdefault(key, step)
+        self._buffers.setdefault(key, []).append(line)
+        self._buffered_bytes[key] = self._buffered_bytes.get(key, 0) + len(line)
+        if self._buffered_bytes[key] >= self.frame_size:
+            self._flush(key)
+
+    def recorder(self, task: str, round: Optional[int] = None) -> "TrajectoryRecorder":
+        """Recorder bound to one task, handed to tasks and agents"""
+        return TrajectoryRecorder(self, task, round)
+
+    def finish(self, task: str, round: Optional[int] = None):
+        """Write out the buffered events of a finished task (and round)"""
+        self._flush((task, round))
+
+    def flush(self):
+        for key in list(self._buffers):
+            self._flush(key)
+
+    def close(self):
+        self.flush()
+        self._log.close()
+        self._index.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _resume_steps(self):
+        """Continue step numbering after the frames already in the index"""
+        for entry in _read_index(os.path.join(self.directory, INDEX_FILENAME)):
+            key = (entry["task"], entry["round"])
+            self._steps[key] = max(self._steps.get(key, 0), entry["step_end"] + 1)
+
+    def _flush(self, key: Tuple[str, Optional[int]]):
+        lines = self._buffers.pop(key, None)
+        self._buffered_bytes.pop(key, None)
+        first_step = self._first_step.pop(key, 0)
+        if not lines:
+            return
+
+        frame = zlib.compress(b"".join(lines))
+        offset = self._log.tell()
+        self._log.write(frame)
+        self._log.flush()
+
+        # The index entry is written only once its frame is on disk
+        task, round = key
+        self._index.write(json.dumps({
+            "task": task,
+            "round": round,
+            "step_start": first_step,
+            "step_end": first_step + len(lines) - 1,
+            "offset": offset,
+            "length": len(frame)
+        }) + "\n")
+        self._index.flush()
+
+class TrajectoryRecorder:
+    """Records events for a single task through a shared writer"""
+
+    def __init__(self, writer: TrajectoryWriter, task: str, round: Optional[int] = None):
+        self.writer = writer
+        self.task = task
+        self.round = round
+
+    def record(self, event_type: str, data: Any = None):
+        self.writer.record(self.task, event_type, data, round=self.round)
+
+    def finish(self):
+        self.writer.finish(self.task, round=self.round)
+
+class TrajectoryReader:
+    """Random-access reader for trajectories written by TrajectoryWriter"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._entries = _read_index(os.path.join(directory, INDEX_FILENAME))
+
+    def tasks(self) -> List[str]:
+        """Tasks with recorded trajectories, in first-seen order"""
+        return list(dict.fromkeys(entry["task"] for entry in self._entries))
+
+    def rounds(self, task: str) -> List[Optional[int]]:
+        """Rounds recorded for a task"""
+        return list(dict.fromkeys(
+            entry["round"] for entry in self._entries if entry["task"] == task
+        ))
+
+    def get(self,
+            task: str,
+            round: Optional[int] = None,
+            step_start: int = 0,
+            step_end: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Events of one task, optionally narrowed to a round and step range"""
+        return list(self.iter_events(task, round, step_start, step_end))
+
+    def iter_events(self,
+                    task: str,
+                    round: Optional[int] = None,
+                    step_start: int = 0,
+                    step_end: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Stream matching events, decompressing only the frames that hold them"""
+        frames = [
+            entry for entry in self._entries
+            if entry["task"] == task
+            and (round is None or entry["round"] == round)
+            and entry["step_end"] >= step_start
+            and (step_end is None or entry["step_start"] <= step_end)
+        ]
+        frames.sort(key=lambda entry: (entry["round"] is not None, entry["round"] or 0, entry["step_start"]))
+
+        with open(os.path.join(self.directory, LOG_FILENAME), "rb") as log:
+            for entry in frames:
+                log.seek(entry["offset"])
+                for line in zlib.decompress(log.read(entry["length"])).splitlines():
+                    event = json.loads(line)
+                    if event["step"] < step_start:
+                        continue
+                    if step_end is not None and event["step"] > step_end:
+                        continue
+                    yield event
+
+def _read_index(path: str) -> List[Dict[str, Any]]:
+    """Index entries, skipping a torn final line left by an interrupted write"""
+    with open(path, encoding="utf-8") as f:
+        lines = [line for line in f if line.strip()]
+
+    entries = []
+    for position, line in enumerate(lines):
+        try:
+            entries.append(json.loads(line))
+        except ValueError:
+            if position < len(lines) - 1 or line.endswith("\n"):
+                raise
+    return entries
+
+def _truncate_torn_line(path: str):
+    """Cut an index back to its last complete line before appending to it"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
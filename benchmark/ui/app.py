@@ -1,18 +1,94 @@
 import streamlit as st
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from dataclasses import asdict
+import asyncio
+import threading
 import yaml
 from benchmark.evaluation.criteria_parser import CriteriaParser
 from benchmark.defaults.evaluation_criteria import BenchmarkDefaults
-from benchmark.core import BenchmarkRunner
+from benchmark.config import build_run
 from benchmark.sources import get_available_sources
 
+PROGRESS_INTERVAL = 1.0
+
+def _get_criteria_parser(llm_client) -> CriteriaParser:
+    """One parser per session's LLM client, kept across reruns
+    
+    Held in the session rather than a global cache keyed by ``id()``, which
+    is reused once a client is garbage collected and shared across
+    sessions. Criteria parsed with a previous client are dropped.
+    """
+    state = st.session_state
+    if state.get("criteria_llm") is not llm_client or "criteria_parser" not in state:
+        state["criteria_llm"] = llm_client
+        state["criteria_parser"] = CriteriaParser(llm_client)
+        state["parsed_criteria"] = {}
+    return state["criteria_parser"]
+
+@st.cache_data
+def _get_default_criteria(category: str) -> str:
+    return BenchmarkDefaults.get_criteria(category)
+
+@st.cache_data
+def _get_source_schemas() -> Dict[str, Dict[str, Any]]:
+    return get_available_sources()
+
+def _parse_criteria(criteria_text: str, parser: CriteriaParser) -> List[Dict[str, Any]]:
+    """Parse criteria once per text in a session, so previews don't re-call the LLM"""
+    parsed = st.session_state.setdefault("parsed_criteria", {})
+    if criteria_text not in parsed:
+        with st.spinner("Parsing criteria..."):
+            criteria = asyncio.run(parser.parse_criteria(criteria_text))
+        parsed[criteria_text] = [asdict(criterion) for criterion in criteria]
+    return parsed[criteria_text]
+
+class BackgroundRun:
+    """Benchmark run executing on its own thread and event loop
+    
+    Task entries are appended as each task completes, so the page can
+    render progress and partial results while the run continues.
+    """
+    
+    def __init__(self, runner, agent):
+        self.runner = runner
+        self.agent = agent
+        self.total = len(runner.tasks)
+        self.entries: List[Dict[str, Any]] = []
+        self.results: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+        
+    def start(self):
+        self._thread.start()
+        
+    def _run(self):
+        try:
+            self.results = asyncio.run(self._execute())
+        except Exception as e:
+            self.error = str(e)
+            
+    async def _execute(self) -> Dict[str, Any]:
+        try:
+            return await self.runner.run_benchmark(
+                self.agent,
+                on_task_complete=self.entries.append
+            )
+        finally:
+            close = getattr(self.agent, "close", None)
+            if close is not None:
+                await close()
+
 class BenchmarkUI:
     def __init__(self):
         st.set_page_config(
             page_title="AI Agent Benchmark Configuration",
             layout="wide"
         )
-        self.criteria_parser = CriteriaParser(st.session_state.get('llm_client'))
+        self.criteria_parser = _get_criteria_parser(st.session_state.get('llm_client'))
         
     def render(self):
         st.title("AI Agent Benchmark Configuration")
@@ -54,6 +130,7 @@ class BenchmarkUI:
         st.sidebar.selectbox(
             "Evaluation Mode",
             ["standard", "battle", "team_battle"],
+            key="mode",
             help="Choose how to evaluate agents"
         )
         
@@ -79,13 +156,14 @@ class BenchmarkUI:
                     "business_analyst",
                     "recruiter",
                     "general_purpose"
-                ]
+                ],
+                key="category"
             )
             
         with col2:
             st.metric(
                 "Default Criteria Count", 
-                len(BenchmarkDefaults.get_criteria(category).split("\n"))
+                len(_get_default_criteria(category).split("\n"))
             )
             
         # Show category description
@@ -94,12 +172,13 @@ class BenchmarkUI:
     def _render_data_sources(self):
         st.header("Configure Data Sources")
         
-        available_sources = get_available_sources()
+        available_sources = _get_source_schemas()
         
         # Data source selection
         selected_sources = st.multiselect(
             "Select Data Sources",
-            available_sources.keys()
+            available_sources.keys(),
+            key="data_sources"
         )
         
         # Configuration for each selected source
@@ -141,7 +220,7 @@ class BenchmarkUI:
         
         # Show default criteria
         with st.expander("Default Criteria", expanded=True):
-            default_criteria = BenchmarkDefaults.get_criteria(category)
+            default_criteria = _get_default_criteria(category)
             st.code(default_criteria)
         
         # Custom criteria input
@@ -149,12 +228,13 @@ class BenchmarkUI:
         custom_criteria = st.text_area(
             "Enter additional evaluation criteria",
             height=200,
+            key="custom_criteria",
             help="Add your company-specific evaluation criteria"
         )
         
         if custom_criteria:
             if st.button("Preview Parsed Criteria"):
-                criteria = self.criteria_parser.parse_criteria(custom_criteria)
+                criteria = _parse_criteria(custom_criteria, self.criteria_parser)
                 st.json(criteria)
     
     def _render_run_section(self):
@@ -163,40 +243,69 @@ class BenchmarkUI:
         col1, col2 = st.columns([3,1])
         
         with col1:
-            st.text_input("Agent Endpoint URL", help="API endpoint for your agent")
+            st.text_input("Agent Endpoint URL", key="agent_url", help="API endpoint for your agent")
             
+        run = st.session_state.get("benchmark_run")
+        running = run is not None and not run.done
+        
         with col2:
-            if st.button("Run Benchmark", type="primary"):
+            if st.button("Run Benchmark", type="primary", disabled=running):
                 self._run_benchmark()
+                running = True
+                
+        if "benchmark_run" in st.session_state:
+            # Poll only while the run is in progress
+            st.session_state["benchmark_polling"] = running
+            interval = PROGRESS_INTERVAL if running else None
+            st.fragment(run_every=interval)(self._render_progress)()
     
     def _run_benchmark(self):
-        """Execute benchmark with current configuration"""
+        """Start the benchmark with the current configuration in the background"""
         try:
-            # Create progress bar
-            progress = st.progress(0)
-            status = st.empty()
-            
-            # Get configuration
-            config = self._get_current_config()
-            
-            # Initialize runner
-            runner = BenchmarkRunner(**config)
-            
-            # Run benchmark
-            results = runner.run_benchmark(config["agent_url"])
-            
-            # Show results
-            st.json(results)
+            runner, agent = build_run(
+                self._get_current_config(),
+                judge_llm=st.session_state.get('llm_client')
+            )
+            run = BackgroundRun(runner, agent)
+            run.start()
+            st.session_state["benchmark_run"] = run
             
         except Exception as e:
             st.error(f"Error running benchmark: {str(e)}")
+            
+    def _render_progress(self):
+        """Show progress and the task results completed so far"""
+        run = st.session_state["benchmark_run"]
+        completed = len(run.entries)
+        
+        st.progress(
+            completed / run.total if run.total else 1.0,
+            text=f"{completed}/{run.total} tasks completed"
+        )
+        for entry in run.entries[:completed]:
+            with st.expander(entry["task_name"]):
+                st.json(entry)
+                
+        if not run.done:
+            return
+        if run.error:
+            st.error(f"Error running benchmark: {run.error}")
+        elif run.results is not None:
+            st.success("Benchmark complete")
+        if st.session_state.get("benchmark_polling"):
+            # Rerun the whole page once so the fragment stops polling
+            st.session_state["benchmark_polling"] = False
+            st.rerun()
     
     def _get_current_config(self) -> Dict[str, Any]:
         """Get current UI configuration"""
         return {
             "category": st.session_state.get("category"),
-            "data_sources": self._get_configured_sources(),
-            "evaluation_criteria": self._get_evaluation_criteria(),
+            "data_sources": {
+                source: st.session_state.get(f"{source}_config", {})
+                for source in st.session_state.get("data_sources", [])
+            },
+            "criteria": st.session_state.get("custom_criteria"),
             "mode": st.session_state.get("mode", "standard"),
             "agent_url": st.session_state.get("agent_url")
         }
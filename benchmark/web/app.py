@@ -1,17 +1,29 @@
-from flask import Flask, render_template, request, jsonify
+import asyncio
+import os
+from dataclasses import asdict
+from flask import Flask, render_template, request, jsonify, url_for
+from benchmark.config import (
+    load_object, load_server_config, validate_web_request, web_run_config, web_sources
+)
 from benchmark.evaluation.criteria_parser import CriteriaParser
 from benchmark.defaults.evaluation_criteria import BenchmarkDefaults
-from benchmark.core import BenchmarkRunner
-from benchmark.sources import get_available_sources
+from benchmark.web.jobs import LocalJobQueue
 
 app = Flask(__name__)
+# Judges and data sources clients may pick by name
+server_config = load_server_config()
+job_queue = LocalJobQueue(
+    storage_path=os.environ.get("BENCHMARK_JOBS_PATH", ".jobs"),
+    max_workers=int(os.environ.get("BENCHMARK_WORKERS", "2"))
+)
 
 @app.route('/')
 def index():
     """Main configuration page"""
     return render_template('index.html',
         categories=AGENT_CATEGORIES,
-        data_sources=get_available_sources()
+        data_sources=web_sources(server_config),
+        judges=list(server_config["judges"])
     )
 
 @app.route('/api/criteria/<category>')
@@ -24,29 +36,64 @@ def get_criteria(category):
 @app.route('/api/parse_criteria', methods=['POST'])
 def parse_criteria():
     """Parse and preview custom criteria"""
-    criteria_text = request.json.get('criteria')
-    parser = CriteriaParser(request.json.get('llm_config'))
-    parsed = parser.parse_criteria(criteria_text)
-    return jsonify(parsed)
+    criteria_text = (request.json or {}).get('criteria')
+    llm_name = server_config.get('criteria_llm')
+    if llm_name not in server_config['judges']:
+        return jsonify({'error': 'No criteria LLM configured'}), 400
+        
+    parser = CriteriaParser(load_object(server_config['judges'][llm_name]))
+    try:
+        parsed = asyncio.run(parser.parse_criteria(criteria_text))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify([asdict(criterion) for criterion in parsed])
 
 @app.route('/api/run_benchmark', methods=['POST'])
 def run_benchmark():
-    """Run benchmark with provided configuration"""
-    config = request.json
-    
+    """Queue a benchmark run with provided configuration"""
     try:
-        runner = BenchmarkRunner(
-            data_sources=_setup_data_sources(config['data_sources']),
-            category=config['category'],
-            evaluation_criteria=config['criteria'],
-            mode=config.get('mode', 'standard')
-        )
+        run_request = validate_web_request(request.json, server_config)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
         
-        results = runner.run_benchmark(config['agent_url'])
-        return jsonify(results)
+    job_id = job_queue.submit(web_run_config(run_request, server_config))
+    return jsonify({
+        'job_id': job_id,
+        'status_url': url_for('job_status', job_id=job_id)
+    }), 202
+
+@app.route('/api/jobs')
+def queue_depth():
+    """Number of queued and running benchmark jobs"""
+    return jsonify(job_queue.depth())
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """State and progress of a benchmark job"""
+    status = job_queue.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify(status)
+
+@app.route('/api/jobs/<job_id>/results')
+def job_results(job_id):
+    """Task results recorded so far, from an optional offset"""
+    if job_queue.status(job_id) is None:
+        return jsonify({'error': 'Unknown job'}), 404
         
-    except Exception as e:
-        return jsonify({'error': str(e)}), 400
+    offset = request.args.get('offset', 0, type=int)
+    tasks = job_queue.results(job_id, offset)
+    return jsonify({
+        'tasks': tasks,
+        'next_offset': offset + len(tasks)
+    })
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued or running benchmark job"""
+    if job_queue.status(job_id) is None:
+        return jsonify({'error': 'Unknown job'}), 404
+    return jsonify({'cancelled': job_queue.cancel(job_id)})
 
 AGENT_CATEGORIES = [
     {
@@ -81,29 +128,5 @@ AGENT_CATEGORIES = [
     }
 ]
 
-def _setup_data_sources(configs):
-    """Initialize data sources from configs"""
-    sources = []
-    for source_type, config in configs.items():
-        if source_type == 'salesforce':
-            from benchmark.sources.salesforce import SalesforceDataSource
-            sources.append(SalesforceDataSource(config))
-        elif source_type == 'hubspot':
-            from benchmark.sources.hubspot import HubspotDataSource
-            sources.append(HubspotDataSource(config))
-        elif source_type == 'gmail':
-            from benchmark.sources.google import GmailDataSource
-            sources.append(GmailDataSource(config))
-        elif source_type == 'google_drive':
-            from benchmark.sources.google import GoogleDriveDataSource
-            sources.append(GoogleDriveDataSource(config))
-        elif source_type == 'slack':
-            from benchmark.sources.slack import SlackDataSource
-            sources.append(SlackDataSource(config))
-        elif source_type == 'synthetic':
-            from benchmark.sources.synthetic import SyntheticDataSource
-            sources.append(SyntheticDataSource(config))
-    return sources
-
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
@@ -0,0 +1,318 @@
+"""Async variant of the benchmark web service
+
+Serves the same API as ``benchmark.web.app`` on an event loop, so a single
+process can keep many slow agent and judge calls in flight at once::
+
+    uvicorn benchmark.web.asgi:app --timeout-graceful-shutdown 60
+
+Runs execute as tasks on the server loop and report progress as
+server-sent events. Clients pick judges and data sources by name from the
+trusted server configuration (see ``benchmark.config.load_server_config``);
+each is built once, shared by every request with an aiohttp session and
+released on shutdown.
+"""
+from typing import Dict, Any, List, Optional, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from datetime import datetime
+import asyncio
+import inspect
+import json
+import os
+import uuid
+import aiohttp
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from benchmark.config import (
+    build_run, load_object, load_server_config, validate_web_request, web_sources
+)
+from benchmark.defaults.evaluation_criteria import BenchmarkDefaults
+from benchmark.evaluation.criteria_parser import CriteriaParser
+from benchmark.results import json_default
+from benchmark.sources import create_data_sources
+
+MAX_RUNS = int(os.environ.get("BENCHMARK_MAX_RUNS", "32"))
+MAX_CONNECTIONS = int(os.environ.get("BENCHMARK_MAX_CONNECTIONS", "256"))
+SHUTDOWN_TIMEOUT = float(os.environ.get("BENCHMARK_SHUTDOWN_TIMEOUT", "30"))
+RUN_RETENTION = float(os.environ.get("BENCHMARK_RUN_RETENTION", "3600"))
+KEEPALIVE_INTERVAL = 15.0
+
+class ResourcePool:
+    """Builds each configured object once, on first use, and shares it
+
+    Only names in ``specs`` can be requested, so the pool never grows past
+    the server configuration. With ``initialize``, objects that have an
+    ``initialize`` coroutine are initialized once when built, not by every
+    run that uses them.
+    """
+
+    def __init__(self,
+                 specs: Dict[str, Any],
+                 factory: Callable[[str, Any], Any],
+                 initialize: bool = False):
+        self.specs = specs
+        self.factory = factory
+        self.initialize = initialize
+        self._items: Dict[str, Any] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def get(self, name: str) -> Any:
+        if name not in self.specs:
+            raise KeyError(name)
+        if name not in self._items:
+            async with self._locks.setdefault(name, asyncio.Lock()):
+                if name not in self._items:
+                    item = self.factory(name, self.specs[name])
+                    if self.initialize:
+                        for resource in (item if isinstance(item, list) else [item]):
+                            initialize = getattr(resource, "initialize", None)
+                            if initialize is not None:
+                                await initialize()
+                    self._items[name] = item
+        return self._items[name]
+
+    async def close(self):
+        """Close every pooled object that knows how to close itself"""
+        for item in self._items.values():
+            for resource in (item if isinstance(item, list) else [item]):
+                close = getattr(resource, "close", None)
+                if close is None:
+                    continue
+                closing = close()
+                if inspect.isawaitable(closing):
+                    await closing
+        self._items.clear()
+
+class BenchmarkRun:
+    """A run executing on the server loop and the events it has published"""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.state = "queued"
+        self.submitted_at = datetime.now().isoformat()
+        self.summary: Optional[Dict[str, Any]] = None
+        self.task: Optional[asyncio.Task] = None
+        self.events: List[Dict[str, Any]] = []
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("completed", "failed", "cancelled")
+
+    def publish(self, event: str, data: Any = None):
+        self.events.append({"event": event, "data": data})
+        # Wake every subscriber, then start a fresh event for the next wait
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def finish(self, state: str, summary: Dict[str, Any]):
+        self.state = state
+        self.summary = summary
+        self.publish(state, summary)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "run_id": self.run_id,
+            "state": self.state,
+            "submitted_at": self.submitted_at,
+            "tasks_completed": sum(1 for e in self.events if e["event"] == "task"),
+            "summary": self.summary
+        }
+
+    async def stream(self, offset: int = 0):
+        """Yield server-sent events from ``offset`` until the run finishes"""
+        while True:
+            while offset < len(self.events):
+                event = self.events[offset]
+                yield (
+                    f"id: {offset}\n"
+                    f"event: {event['event']}\n"
+                    f"data: {json.dumps(event['data'], default=json_default)}\n\n"
+                )
+                offset += 1
+            if self.finished:
+                return
+
+            try:
+                await asyncio.wait_for(self._changed.wait(), KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
+                # Comment line keeps idle proxies from dropping the stream
+                yield ": keepalive\n\n"
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    state = app.state
+    state.session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=MAX_CONNECTIONS)
+    )
+    state.server_config = load_server_config()
+    state.judges = ResourcePool(
+        state.server_config["judges"],
+        lambda name, spec: load_object(spec)
+    )
+    state.data_sources = ResourcePool(
+        state.server_config["data_sources"],
+        lambda name, config: create_data_sources({name: config}),
+        initialize=True
+    )
+    state.run_slots = asyncio.Semaphore(MAX_RUNS)
+    state.runs = {}
+    state.accepting = True
+
+    try:
+        yield
+    finally:
+        # Stop taking runs, give running ones a chance to finish, then cancel
+        state.accepting = False
+        pending = [run.task for run in state.runs.values() if run.task and not run.task.done()]
+        if pending:
+            _, pending = await asyncio.wait(pending, timeout=SHUTDOWN_TIMEOUT)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        await state.judges.close()
+        await state.data_sources.close()
+        await state.session.close()
+
+async def get_criteria(request: Request):
+    """Get default criteria for category"""
+    return JSONResponse({
+        "default_criteria": BenchmarkDefaults.get_criteria(request.path_params["category"])
+    })
+
+async def get_sources(request: Request):
+    """Data sources configured on the server and their schemas"""
+    return JSONResponse(web_sources(request.app.state.server_config))
+
+async def parse_criteria(request: Request):
+    """Parse and preview custom criteria"""
+    state = request.app.state
+    body = await request.json()
+    llm_name = state.server_config.get("criteria_llm")
+    if llm_name not in state.judges.specs:
+        return JSONResponse({"error": "No criteria LLM configured"}, status_code=400)
+
+    try:
+        llm = await state.judges.get(llm_name)
+        parsed = await CriteriaParser(llm).parse_criteria(body.get("criteria"))
+    except Exception as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse([asdict(criterion) for criterion in parsed])
+
+async def run_benchmark(request: Request):
+    """Start a benchmark run on the server loop
+
+    Responds 202 with the run's status and event URLs, or streams the
+    run's events directly when the client accepts ``text/event-stream``.
+    """
+    state = request.app.state
+    if not state.accepting:
+        return JSONResponse({"error": "Server is shutting down"}, status_code=503)
+
+    try:
+        config = validate_web_request(await request.json(), state.server_config)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    run = BenchmarkRun(uuid.uuid4().hex)
+    state.runs[run.run_id] = run
+    run.task = asyncio.create_task(_execute_run(request.app, run, config))
+
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return _event_response(run, 0)
+    return JSONResponse({
+        "run_id": run.run_id,
+        "status_url": request.url_for("run_status", run_id=run.run_id).path,
+        "events_url": request.url_for("run_events", run_id=run.run_id).path
+    }, status_code=202)
+
+async def run_status(request: Request):
+    """State and progress of a benchmark run"""
+    run = request.app.state.runs.get(request.path_params["run_id"])
+    if run is None:
+        return JSONResponse({"error": "Unknown run"}, status_code=404)
+    return JSONResponse(run.status())
+
+async def run_events(request: Request):
+    """Stream a run's events, resuming after ``Last-Event-ID`` if sent"""
+    run = request.app.state.runs.get(request.path_params["run_id"])
+    if run is None:
+        return JSONResponse({"error": "Unknown run"}, status_code=404)
+
+    last_event_id = request.headers.get("last-event-id")
+    offset = int(last_event_id) + 1 if last_event_id and last_event_id.isdigit() else 0
+    return _event_response(run, offset)
+
+async def cancel_run(request: Request):
+    """Cancel a queued or running benchmark run"""
+    run = request.app.state.runs.get(request.path_params["run_id"])
+    if run is None:
+        return JSONResponse({"error": "Unknown run"}, status_code=404)
+    if run.finished:
+        return JSONResponse({"cancelled": False})
+    run.task.cancel()
+    return JSONResponse({"cancelled": True})
+
+def _event_response(run: BenchmarkRun, offset: int) -> StreamingResponse:
+    return StreamingResponse(
+        run.stream(offset),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _execute_run(app: Starlette, run: BenchmarkRun, config: Dict[str, Any]):
+    state = app.state
+    try:
+        async with state.run_slots:
+            run.state = "running"
+            run.publish("started", {"run_id": run.run_id})
+
+            data_sources = []
+            for name in config["data_sources"]:
+                data_sources.extend(await state.data_sources.get(name))
+            judge_llm = await state.judges.get(config["judge"]) if config["judge"] else None
+
+            runner, agent = build_run(
+                # Names were resolved above; nothing is built from the request
+                dict(config, judge=None, data_sources={}),
+                data_sources=data_sources,
+                judge_llm=judge_llm,
+                session=state.session
+            )
+            try:
+                # Pooled sources were initialized once when built
+                results = await runner.run_benchmark(
+                    agent,
+                    on_task_complete=lambda entry: run.publish("task", entry),
+                    initialize_sources=False
+                )
+            finally:
+                # HTTP agents on the shared session leave it open
+                close = getattr(agent, "close", None)
+                if close is not None:
+                    await close()
+
+        results.pop("tasks", None)
+        run.finish("completed", results)
+    except asyncio.CancelledError:
+        run.finish("cancelled", {"run_id": run.run_id})
+    except Exception as e:
+        run.finish("failed", {"error": str(e)})
+    finally:
+        # Keep finished runs around long enough for clients to collect them
+        asyncio.get_running_loop().call_later(RUN_RETENTION, state.runs.pop, run.run_id, None)
+
+routes = [
+    Route("/api/criteria/{category}", get_criteria),
+    Route("/api/sources", get_sources),
+    Route("/api/parse_criteria", parse_criteria, methods=["POST"]),
+    Route("/api/run_benchmark", run_benchmark, methods=["POST"]),
+    Route("/api/runs/{run_id}", run_status, name="run_status"),
+    Route("/api/runs/{run_id}/events", run_events, name="run_events"),
+    Route("/api/runs/{run_id}/cancel", cancel_run, methods=["POST"])
+]
+
+app = Starlette(routes=routes, lifespan=lifespan)
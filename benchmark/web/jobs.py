@@ -0,0 +1,215 @@
+from typing import Dict, Any, List, Optional, Callable
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, Future
+from datetime import datetime
+import asyncio
+import json
+import os
+import threading
+import uuid
+from benchmark.config import build_run
+from benchmark.results import json_default
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+class JobCancelled(Exception):
+    """Raised inside a worker when its job has been cancelled"""
+
+class JobQueue(ABC):
+    """Queue of benchmark runs executed outside the web request"""
+
+    @abstractmethod
+    def submit(self, config: Dict[str, Any]) -> str:
+        """Queue a run and return its job ID"""
+        pass
+
+    @abstractmethod
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current state and progress of a job"""
+        pass
+
+    @abstractmethod
+    def results(self, job_id: str, offset: int = 0) -> List[Dict[str, Any]]:
+        """Task results recorded so far, starting at ``offset``"""
+        pass
+
+    @abstractmethod
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job"""
+        pass
+
+    @abstractmethod
+    def depth(self) -> Dict[str, int]:
+        """Number of queued and running jobs"""
+        pass
+
+class LocalJobQueue(JobQueue):
+    """Job queue backed by a local process pool
+
+    Stands in for a distributed queue on a single machine. Each job runs its
+    benchmark on an event loop inside a worker process and reports through
+    its job directory: ``status.json`` holds the state and progress, and
+    ``results.jsonl`` gets one line per completed task. Cancelling a running
+    job drops a marker file that the worker checks after every task.
+    """
+
+    def __init__(self,
+                 storage_path: str = ".jobs",
+                 max_workers: int = 2,
+                 run_factory: Callable = build_run):
+        self.storage_path = storage_path
+        self.max_workers = max_workers
+        self.run_factory = run_factory
+        self._executor = None
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        os.makedirs(storage_path, exist_ok=True)
+
+    def submit(self, config: Dict[str, Any]) -> str:
+        job_id = uuid.uuid4().hex
+        job_path = self._job_path(job_id)
+        os.makedirs(job_path)
+        _write_status(job_path, {
+            "job_id": job_id,
+            "state": QUEUED,
+            "submitted_at": datetime.now().isoformat(),
+            "tasks_completed": 0
+        })
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            future = self._executor.submit(_execute_job, job_path, config, self.run_factory)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda done: self._on_done(job_id, done))
+
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self._job_path(job_id), "status.json")
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def results(self, job_id: str, offset: int = 0) -> List[Dict[str, Any]]:
+        path = os.path.join(self._job_path(job_id), "results.jsonl")
+        if not os.path.exists(path):
+            return []
+
+        entries = []
+        with open(path) as f:
+            for position, line in enumerate(f):
+                if position >= offset and line.strip():
+                    entries.append(json.loads(line))
+        return entries
+
+    def cancel(self, job_id: str) -> bool:
+        status = self.status(job_id)
+        if status is None or status["state"] in FINISHED_STATES:
+            return False
+
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            # Never started, so the worker will not report it
+            _write_status(self._job_path(job_id), dict(status, state=CANCELLED))
+            return True
+
+        # Running: the worker stops after its current task
+        open(os.path.join(self._job_path(job_id), "cancel"), "w").close()
+        return True
+
+    def depth(self) -> Dict[str, int]:
+        counts = {QUEUED: 0, RUNNING: 0}
+        with self._lock:
+            job_ids = list(self._futures)
+        for job_id in job_ids:
+            status = self.status(job_id)
+            if status and status["state"] in counts:
+                counts[status["state"]] += 1
+        return counts
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=not wait)
+                self._executor = None
+
+    def _on_done(self, job_id: str, future: Future):
+        if not future.cancelled() and future.exception() is not None:
+            # The worker died before it could record the failure itself
+            status = self.status(job_id) or {"job_id": job_id}
+            if status.get("state") not in FINISHED_STATES:
+                _write_status(self._job_path(job_id), dict(
+                    status,
+                    state=FAILED,
+                    error=str(future.exception())
+                ))
+        with self._lock:
+            self._futures.pop(job_id, None)
+
+    def _job_path(self, job_id: str) -> str:
+        return os.path.join(self.storage_path, os.path.basename(job_id))
+
+def _write_status(job_path: str, status: Dict[str, Any]):
+    """Replace a job's status file atomically"""
+    path = os.path.join(job_path, "status.json")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(status, f, default=json_default)
+    os.replace(tmp_path, path)
+
+async def _run(runner, agent, on_task_complete: Callable) -> Dict[str, Any]:
+    try:
+        return await runner.run_benchmark(agent, on_task_complete=on_task_complete)
+    finally:
+        # Release agent resources such as HTTP sessions on the same loop
+        close = getattr(agent, "close", None)
+        if close is not None:
+            await close()
+
+def _execute_job(job_path: str, config: Dict[str, Any], run_factory: Callable):
+    """Worker process entry point"""
+    with open(os.path.join(job_path, "status.json")) as f:
+        status = json.load(f)
+
+    if os.path.exists(os.path.join(job_path, "cancel")):
+        _write_status(job_path, dict(status, state=CANCELLED))
+        return
+
+    status.update(state=RUNNING, started_at=datetime.now().isoformat())
+    _write_status(job_path, status)
+
+    results_file = open(os.path.join(job_path, "results.jsonl"), "a")
+
+    def on_task_complete(entry: Dict[str, Any]):
+        results_file.write(json.dumps(entry, default=json_default) + "\n")
+        results_file.flush()
+        status["tasks_completed"] += 1
+        _write_status(job_path, status)
+        if os.path.exists(os.path.join(job_path, "cancel")):
+            raise JobCancelled()
+
+    try:
+        runner, agent = run_factory(config)
+        status["tasks_total"] = len(runner.tasks)
+        _write_status(job_path, status)
+
+        results = asyncio.run(_run(runner, agent, on_task_complete))
+        results.pop("tasks", None)
+        status.update(state=COMPLETED, summary=results)
+    except JobCancelled:
+        status.update(state=CANCELLED)
+    except Exception as e:
+        status.update(state=FAILED, error=str(e))
+    finally:
+        results_file.close()
+        status["finished_at"] = datetime.now().isoformat()
+        _write_status(job_path, status)
@@ -52,13 +52,31 @@ const app = Vue.createApp({
         async runBenchmark() {
             this.loading = true
             try {
-                const response = await axios.post('/api/run_benchmark', this.config)
-                this.results = JSON.stringify(response.data, null, 2)
+                const response = await axios.post('/api/run_benchmark', {
+                    agent_url: this.config.agentUrl,
+                    category: this.config.category,
+                    criteria: this.config.customCriteria || null,
+                    data_sources: Object.keys(this.config.sources)
+                })
+                const job = await this.waitForJob(response.data.status_url)
+                this.results = JSON.stringify(job, null, 2)
             } catch (error) {
                 console.error('Error running benchmark:', error)
             } finally {
                 this.loading = false
             }
+        },
+        
+        async waitForJob(statusUrl) {
+            // Poll until the background run finishes
+            while (true) {
+                const response = await axios.get(statusUrl)
+                this.results = JSON.stringify(response.data, null, 2)
+                if (['completed', 'failed', 'cancelled'].includes(response.data.state)) {
+                    return response.data
+                }
+                await new Promise(resolve => setTimeout(resolve, 2000))
+            }
         }
     },
     async mounted() {
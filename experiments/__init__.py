@@ -1,17 +1,24 @@
 from typing import Dict, Any
-import json
+from datetime import datetime
 import os
+import shutil
+from benchmark.results import ResultStore, find_refs, json_default
+from experiments.storage import write_json
+
+BLOBS_DIRNAME = "blobs"
 
 class ExperimentRegistry:
     """Registry for tracking agent submissions and results"""
     
-    def __init__(self, storage_path: str = "submissions"):
+    def __init__(self, storage_path: str = "submissions", compress_results: bool = False):
         self.storage_path = storage_path
+        self.compress_results = compress_results
         
     def register_submission(self, 
                           agent_name: str,
                           metadata: Dict[str, Any],
-                          results: Dict[str, Any]) -> str:
+                          results: Dict[str, Any],
+                          trajectory_dir: str = None) -> str:
         """Register a new agent submission"""
         # Generate submission ID
         submission_id = f"{datetime.now().strftime('%Y%m%d')}_{agent_name}"
@@ -20,11 +27,35 @@ class ExperimentRegistry:
         submission_path = os.path.join(self.storage_path, submission_id)
         os.makedirs(submission_path, exist_ok=True)
         
-        # Save metadata and results
-        with open(os.path.join(submission_path, "metadata.json"), "w") as f:
-            json.dump(metadata, f, indent=2)
+        # Spilled task outputs travel with the submission; the results file
+        # keeps only references to them
+        blob_store = ResultStore(os.path.join(submission_path, BLOBS_DIRNAME))
+        for ref in find_refs(results):
+            blob_store.adopt(ref)
+            
+        # Save metadata and results; each file is replaced atomically so
+        # readers never see a partial write
+        write_json(os.path.join(submission_path, "metadata.json"), metadata, indent=2)
+        write_json(
+            os.path.join(submission_path, "results.json"),
+            results,
+            compress=self.compress_results,
+            default=json_default
+        )
+        
+        # Trajectory logs are already compressed, so they are copied as is
+        if trajectory_dir:
+            shutil.copytree(
+                trajectory_dir,
+                os.path.join(submission_path, "trajectories"),
+                dirs_exist_ok=True
+            )
             
-        with open(os.path.join(submission_path, "results.json"), "w") as f:
-            json.dump(results, f, indent=2)
+        # Keep the rankings index in step with the submission
+        from experiments.leaderboard import Leaderboard
+        try:
+            Leaderboard(self.storage_path).index_submission(submission_id, metadata, results)
+        except Exception as e:
+            print(f"Error indexing submission {submission_id}: {e}")
             
         return submission_id 
\ No newline at end of file
@@ -0,0 +1,37 @@
+from typing import Any, Callable, Hashable
+from collections import OrderedDict
+import threading
+
+class ReadCache:
+    """Small thread-safe LRU cache whose entries are tied to a version
+
+    An entry is only returned while the version it was loaded under is still
+    current; any change to the version reloads it.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key`` or load it for ``version``"""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == version:
+                self._entries.move_to_end(key)
+                return cached[1]
+
+        value = loader()
+
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,238 @@
+from typing import Dict, Any, List, Callable, Iterator, NamedTuple
+from datetime import datetime
+import argparse
+import hashlib
+import json
+import math
+import os
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+from benchmark.results import find_refs, iter_json
+from experiments.leaderboard import Leaderboard, AgentCategory
+from experiments.storage import atomic_open, write_json, find_json, read_json
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "web", "templates", "export")
+STYLESHEET_PATH = os.path.join(os.path.dirname(__file__), "web", "static", "style.css")
+MANIFEST_FILENAME = "manifest.json"
+
+class Page(NamedTuple):
+    """A group of output files rendered from the same inputs"""
+    key: str
+    inputs: Any
+    render: Callable[[], Dict[str, Any]]
+
+class LeaderboardExporter:
+    """Renders the leaderboard into static HTML and JSON files
+
+    Every page is fingerprinted from the data it shows and the export
+    templates. A manifest of fingerprints is kept next to the output, so
+    later exports only rewrite pages whose inputs changed and remove pages
+    of submissions that no longer exist.
+    """
+
+    def __init__(self,
+                 leaderboard: Leaderboard,
+                 output_path: str = "docs/leaderboard",
+                 per_page: int = 100):
+        self.leaderboard = leaderboard
+        self.output_path = output_path
+        self.per_page = per_page
+        self.env = Environment(
+            loader=FileSystemLoader(TEMPLATE_PATH),
+            autoescape=select_autoescape(["html"])
+        )
+        self._template_digest = self._digest_templates()
+        self._generated_at = None
+
+    def export(self, force: bool = False) -> Dict[str, int]:
+        """Write changed pages and return counts of written, unchanged and removed"""
+        os.makedirs(self.output_path, exist_ok=True)
+        previous = {} if force else self._load_manifest()
+        manifest = {}
+        counts = {"written": 0, "unchanged": 0, "removed": 0}
+        self._generated_at = datetime.now().isoformat(timespec="seconds")
+
+        for page in self._pages():
+            fingerprint = self._fingerprint(page.inputs)
+            entry = previous.get(page.key)
+            if entry and entry["fingerprint"] == fingerprint and all(
+                os.path.exists(os.path.join(self.output_path, path))
+                for path in entry["files"]
+            ):
+                manifest[page.key] = entry
+                counts["unchanged"] += 1
+                continue
+
+            files = page.render()
+            for path, content in files.items():
+                self._write(path, content)
+            manifest[page.key] = {"fingerprint": fingerprint, "files": sorted(files)}
+            counts["written"] += 1
+
+        # Drop pages of deleted submissions and shrunken categories
+        for key, entry in previous.items():
+            if key in manifest:
+                continue
+            for path in entry["files"]:
+                full_path = os.path.join(self.output_path, path)
+                if os.path.exists(full_path):
+                    os.remove(full_path)
+                self._prune(os.path.dirname(full_path))
+            counts["removed"] += 1
+
+        write_json(os.path.join(self.output_path, MANIFEST_FILENAME), {
+            "generated_at": self._generated_at,
+            "pages": manifest
+        }, indent=2)
+        return counts
+
+    def _pages(self) -> Iterator[Page]:
+        with open(STYLESHEET_PATH, encoding="utf-8") as f:
+            stylesheet = f.read()
+        yield Page("style", stylesheet, lambda: {"style.css": stylesheet})
+
+        top = {
+            category.value: rankings
+            for category, rankings in self.leaderboard.get_top_rankings(limit=3).items()
+        }
+        yield Page("index", top, lambda: {
+            "index.html": self._render(
+                "index.html", "",
+                category_rankings=list(top.items())
+            ),
+            "index.json": top
+        })
+
+        for category in AgentCategory:
+            yield from self._category_pages(category)
+
+        for entry in self.leaderboard.get_rankings():
+            yield self._submission_page(entry)
+
+    def _category_pages(self, category: AgentCategory) -> Iterator[Page]:
+        rankings = self.leaderboard.get_rankings(category)
+        pages = max(math.ceil(len(rankings) / self.per_page), 1)
+
+        yield Page(
+            f"{category.value}/rankings",
+            rankings,
+            lambda: {f"{category.value}/rankings.json": rankings}
+        )
+
+        for page in range(1, pages + 1):
+            chunk = rankings[(page - 1) * self.per_page:page * self.per_page]
+            if page == 1:
+                directory, root = f"{category.value}/", "../"
+            else:
+                directory, root = f"{category.value}/page/{page}/", "../../../"
+
+            yield Page(
+                directory,
+                {"rankings": chunk, "page": page, "pages": pages, "total": len(rankings)},
+                self._category_renderer(category, directory, root, chunk, page, pages, len(rankings))
+            )
+
+    def _category_renderer(self,
+                           category: AgentCategory,
+                           directory: str,
+                           root: str,
+                           rankings: List[Dict[str, Any]],
+                           page: int,
+                           pages: int,
+                           total: int) -> Callable[[], Dict[str, Any]]:
+        return lambda: {
+            directory + "index.html": self._render(
+                "category.html", root,
+                category=category.value,
+                rankings=rankings,
+                page=page,
+                pages=pages,
+                per_page=self.per_page,
+                total=total
+            )
+        }
+
+    def _submission_page(self, entry: Dict[str, Any]) -> Page:
+        submission_id = entry["submission_id"]
+        directory = f"submissions/{submission_id}/"
+
+        def render():
+            details = self.leaderboard.get_submission_details(submission_id)
+            return {
+                directory + "index.html": self._render("submission.html", "../../", details=details),
+                directory + "details.json": details
+            }
+
+        # File modification times stand in for the submission's contents
+        inputs = {
+            "entry": entry,
+            "version": self.leaderboard.get_submission_version(submission_id)
+        }
+        return Page(directory, inputs, render)
+
+    def _render(self, template: str, root: str, **context) -> str:
+        return self.env.get_template(template).render(
+            root=root,
+            generated_at=self._generated_at,
+            **context
+        )
+
+    def _write(self, path: str, content: Any):
+        full_path = os.path.join(self.output_path, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        if path.endswith(".json") and find_refs(content):
+            # Spilled task outputs are streamed into the file from their blobs
+            with atomic_open(full_path) as f:
+                for chunk in iter_json(content):
+                    f.write(chunk)
+            return
+        if path.endswith(".json"):
+            write_json(full_path, content)
+            return
+        with atomic_open(full_path) as f:
+            f.write(content)
+
+    def _prune(self, directory: str):
+        """Remove directories left empty under the output path"""
+        root = os.path.abspath(self.output_path)
+        directory = os.path.abspath(directory)
+        while directory != root and directory.startswith(root) and not os.listdir(directory):
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
+
+    def _fingerprint(self, inputs: Any) -> str:
+        payload = json.dumps([self._template_digest, inputs], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _digest_templates(self) -> str:
+        digest = hashlib.sha256()
+        for name in sorted(os.listdir(TEMPLATE_PATH)):
+            digest.update(name.encode("utf-8"))
+            with open(os.path.join(TEMPLATE_PATH, name), "rb") as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        path = os.path.join(self.output_path, MANIFEST_FILENAME)
+        if find_json(path) is None:
+            return {}
+        return read_json(path).get("pages", {})
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the leaderboard as static pages")
+    parser.add_argument("--storage-path", default="submissions")
+    parser.add_argument("--output-path", default="docs/leaderboard")
+    parser.add_argument("--per-page", type=int, default=100)
+    parser.add_argument("--force", action="store_true", help="Rewrite every page")
+    args = parser.parse_args()
+
+    exporter = LeaderboardExporter(
+        Leaderboard(args.storage_path),
+        output_path=args.output_path,
+        per_page=args.per_page
+    )
+    counts = exporter.export(force=args.force)
+    print(
+        f"Wrote {counts['written']} pages, "
+        f"{counts['unchanged']} unchanged, "
+        f"{counts['removed']} removed"
+    )
@@ -0,0 +1,261 @@
+from typing import Dict, Any, List, Optional, Tuple
+from contextlib import closing
+from array import array
+import heapq
+import sqlite3
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    submission_id TEXT PRIMARY KEY,
+    agent_name TEXT NOT NULL,
+    category TEXT NOT NULL,
+    submitted_at TEXT,
+    score REAL NOT NULL,
+    verified INTEGER NOT NULL DEFAULT 0,
+    task_count INTEGER NOT NULL DEFAULT 0,
+    latency_p50 REAL,
+    latency_p99 REAL,
+    tokens_per_task REAL
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_category_score
+    ON submissions (category, score DESC);
+CREATE INDEX IF NOT EXISTS idx_submissions_score
+    ON submissions (score DESC);
+CREATE TABLE IF NOT EXISTS metrics (
+    submission_id TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (submission_id, metric)
+);
+CREATE TABLE IF NOT EXISTS task_scores (
+    submission_id TEXT PRIMARY KEY,
+    scores BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('updated_at', 0);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('populated', 0);
+"""
+
+RANKING_COLUMNS = [
+    "submission_id",
+    "agent_name",
+    "category",
+    "submitted_at",
+    "score",
+    "verified",
+    "task_count",
+    "latency_p50",
+    "latency_p99",
+    "tokens_per_task"
+]
+
+# Columns added after the first release, with their types, so older index
+# files are migrated in place; ``rebuild`` backfills them
+ADDED_COLUMNS = {
+    "latency_p50": "REAL",
+    "latency_p99": "REAL",
+    "tokens_per_task": "REAL"
+}
+
+class LeaderboardIndex:
+    """SQLite index of submissions with precomputed scores"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._migrate(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A short-lived connection per operation keeps the index safe to use
+        # from threaded web servers
+        return sqlite3.connect(self.path, timeout=30)
+
+    def count(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM submissions").fetchone()[0]
+
+    def version(self) -> Tuple[int, float]:
+        """Change counter and time of the last change to the index"""
+        with closing(self._connect()) as conn:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+        return int(meta["generation"]), meta["updated_at"]
+
+    def populated(self) -> bool:
+        """Whether the index has been filled by ``replace_all`` at least once"""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'populated'").fetchone()
+        return bool(row[0])
+
+    def upsert(self, entry: Dict[str, Any]):
+        """Insert or replace a submission entry"""
+        with closing(self._connect()) as conn, conn:
+            self._upsert(conn, entry)
+            self._bump(conn)
+
+    def replace_all(self, entries: List[Dict[str, Any]]):
+        """Replace the whole index in a single transaction"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM submissions")
+            conn.execute("DELETE FROM metrics")
+            conn.execute("DELETE FROM task_scores")
+            for entry in entries:
+                self._upsert(conn, entry)
+            conn.execute("UPDATE meta SET value = 1 WHERE key = 'populated'")
+            self._bump(conn)
+
+    def set_verified(self, submission_id: str, verified: bool):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE submissions SET verified = ? WHERE submission_id = ?",
+                (int(verified), submission_id)
+            )
+            self._bump(conn)
+
+    def rankings(self,
+                 category: Optional[str] = None,
+                 limit: Optional[int] = None,
+                 offset: int = 0) -> List[Dict[str, Any]]:
+        """Submissions ordered by score, optionally for one category"""
+        query = f"SELECT {', '.join(RANKING_COLUMNS)} FROM submissions"
+        params = []
+        if category:
+            query += " WHERE category = ?"
+            params.append(category)
+        query += " ORDER BY score DESC, submission_id"
+        if limit is not None or offset:
+            query += " LIMIT ? OFFSET ?"
+            params.extend([-1 if limit is None else limit, offset])
+
+        with closing(self._connect()) as conn:
+            return [self._to_entry(row) for row in conn.execute(query, params)]
+
+    def category_count(self, category: Optional[str] = None) -> int:
+        """Number of submissions, optionally for one category"""
+        query = "SELECT COUNT(*) FROM submissions"
+        params = (category,) if category else ()
+        if category:
+            query += " WHERE category = ?"
+
+        with closing(self._connect()) as conn:
+            return conn.execute(query, params).fetchone()[0]
+
+    def metric_rows(self, category: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """Metric means per submission, optionally for one category"""
+        query = (
+            "SELECT m.submission_id, m.metric, m.value FROM metrics m "
+            "JOIN submissions s ON s.submission_id = m.submission_id"
+        )
+        params = ()
+        if category:
+            query += " WHERE s.category = ?"
+            params = (category,)
+
+        rows: Dict[str, Dict[str, float]] = {}
+        with closing(self._connect()) as conn:
+            for submission_id, metric, value in conn.execute(query, params):
+                rows.setdefault(submission_id, {})[metric] = value
+
+            # Submissions without evaluated tasks still get an all-zero row
+            query = "SELECT submission_id FROM submissions"
+            if category:
+                query += " WHERE category = ?"
+            for (submission_id,) in conn.execute(query, params):
+                rows.setdefault(submission_id, {})
+
+        return rows
+
+    def task_scores(self, category: Optional[str] = None) -> Dict[str, List[float]]:
+        """Per-task scores of every submission, optionally for one category"""
+        query = (
+            "SELECT t.submission_id, t.scores FROM task_scores t "
+            "JOIN submissions s ON s.submission_id = t.submission_id"
+        )
+        params = ()
+        if category:
+            query += " WHERE s.category = ?"
+            params = (category,)
+
+        with closing(self._connect()) as conn:
+            return {
+                submission_id: array("d", scores).tolist()
+                for submission_id, scores in conn.execute(query, params)
+            }
+
+    def top_by_category(self, k: int) -> Dict[str, List[Dict[str, Any]]]:
+        """Top ``k`` submissions of every category from a single scan
+
+        Each category keeps a bounded min-heap, so memory stays at ``k``
+        entries per category regardless of the number of submissions.
+        """
+        if k <= 0:
+            return {}
+
+        heaps: Dict[str, List] = {}
+        query = f"SELECT {', '.join(RANKING_COLUMNS)} FROM submissions ORDER BY submission_id"
+
+        with closing(self._connect()) as conn:
+            for position, row in enumerate(conn.execute(query)):
+                entry = self._to_entry(row)
+                # Earlier submission IDs win ties, matching rankings()
+                item = (entry["score"], -position, entry)
+                heap = heaps.setdefault(entry["category"], [])
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, item)
+
+        return {
+            category: [item[2] for item in sorted(heap, key=lambda item: item[:2], reverse=True)]
+            for category, heap in heaps.items()
+        }
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(submissions)")}
+        for column, column_type in ADDED_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE submissions ADD COLUMN {column} {column_type}")
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection):
+        """Advance the change counter inside the caller's transaction"""
+        conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'updated_at'", (time.time(),))
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, entry: Dict[str, Any]):
+        conn.execute(
+            f"INSERT OR REPLACE INTO submissions ({', '.join(RANKING_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in RANKING_COLUMNS)})",
+            tuple(
+                int(entry[column]) if column == "verified" else entry.get(column)
+                for column in RANKING_COLUMNS
+            )
+        )
+        if "metrics" in entry:
+            conn.execute("DELETE FROM metrics WHERE submission_id = ?", (entry["submission_id"],))
+            conn.executemany(
+                "INSERT INTO metrics (submission_id, metric, value) VALUES (?, ?, ?)",
+                [
+                    (entry["submission_id"], metric, value)
+                    for metric, value in entry["metrics"].items()
+                ]
+            )
+        if "task_scores" in entry:
+            conn.execute(
+                "INSERT OR REPLACE INTO task_scores (submission_id, scores) VALUES (?, ?)",
+                (entry["submission_id"], array("d", entry["task_scores"]).tobytes())
+            )
+
+    @staticmethod
+    def _to_entry(row) -> Dict[str, Any]:
+        entry = dict(zip(RANKING_COLUMNS, row))
+        entry["verified"] = bool(entry["verified"])
+        return entry
@@ -1,8 +1,15 @@
-from typing import List, Dict, Any
-import json
+from typing import List, Dict, Any, Tuple, Optional
 import os
 from datetime import datetime
 from enum import Enum
+import argparse
+from benchmark.results import ResultStore
+from experiments import BLOBS_DIRNAME
+from experiments.cache import ReadCache
+from experiments.index import LeaderboardIndex
+from experiments.storage import read_json, find_json
+from experiments.scoring import ScoreMatrix, efficiency, metric_means
+from experiments.significance import BootstrapEngine, significance_bands
 
 class AgentCategory(Enum):
     SDR = "sales_development"
@@ -12,15 +19,224 @@ class AgentCategory(Enum):
     RECRUITER = "recruiter"
     GENERAL = "general_purpose"
 
+CATEGORY_WEIGHTS = {
+    "sales_development": {
+        "conversation_quality": 2.0,
+        "lead_qualification": 2.0,
+        "response_relevance": 1.5,
+        "follow_up_strategy": 1.5
+    },
+    "marketing": {
+        "content_quality": 2.0,
+        "audience_targeting": 2.0,
+        "campaign_strategy": 1.5,
+        "creativity": 1.5
+    },
+    "customer_support": {
+        "resolution_quality": 2.0,
+        "response_time": 1.5,
+        "empathy": 2.0,
+        "accuracy": 1.5
+    },
+    "business_analyst": {
+        "insight_depth": 2.0,
+        "data_coverage": 1.5,
+        "actionability": 2.0,
+        "methodology": 1.5
+    },
+    "recruiter": {
+        "candidate_matching": 2.0,
+        "communication": 1.5,
+        "evaluation_quality": 2.0,
+        "process_efficiency": 1.5
+    },
+    "general_purpose": {
+        "task_completion": 1.0,
+        "output_quality": 1.0,
+        "efficiency": 1.0,
+        "adaptability": 1.0
+    }
+}
+
+# Per-entry bootstrap statistics of get_rankings, tied to category weights
+STATISTIC_KEYS = ("ci_low", "ci_high", "score_std", "band", "p_beats_next")
+
 class Leaderboard:
     """Manages agent rankings and leaderboard by category"""
     
-    def __init__(self, storage_path: str = "submissions"):
+    def __init__(self, storage_path: str = "submissions", index_path: str = None):
         self.storage_path = storage_path
+        self.index = LeaderboardIndex(
+            index_path or os.path.join(storage_path, "leaderboard.db")
+        )
+        self._cache = ReadCache()
+        self.bootstrap = BootstrapEngine()
+        
+    def get_rankings(self,
+                     category: AgentCategory = None,
+                     limit: int = None,
+                     offset: int = 0) -> List[Dict[str, Any]]:
+        """Get current agent rankings, optionally filtered by category
+        
+        Within a category, entries also carry a bootstrap confidence
+        interval, a significance band shared by statistically tied ranks,
+        and the probability of beating the next-ranked submission.
+        """
+        category_value = category.value if category else None
+        generation = self.get_version()[0]
+        
+        def load():
+            rankings = self.index.rankings(category_value, limit, offset)
+            if category:
+                statistics = self.get_statistics(category)
+                rankings = [
+                    dict(entry, **statistics.get(entry["submission_id"], {}))
+                    for entry in rankings
+                ]
+            return rankings
+            
+        return self._cache.get(("rankings", category_value, limit, offset), generation, load)
+    
+    def get_statistics(self, category: AgentCategory) -> Dict[str, Dict[str, Any]]:
+        """Bootstrap statistics for every submission in a category"""
+        return self._cache.get(
+            ("statistics", category.value),
+            self.get_version()[0],
+            lambda: self._compute_statistics(category)
+        )
+    
+    def _compute_statistics(self, category: AgentCategory) -> Dict[str, Dict[str, Any]]:
+        ranked_ids = [
+            entry["submission_id"]
+            for entry in self.index.rankings(category.value)
+        ]
+        task_scores = self.index.task_scores(category.value)
+        ranked_ids = [submission_id for submission_id in ranked_ids if submission_id in task_scores]
+        if not ranked_ids:
+            return {}
+            
+        summaries = self.bootstrap.summarize({
+            submission_id: task_scores[submission_id]
+            for submission_id in ranked_ids
+        })
+        statistics = {
+            submission_id: {
+                "ci_low": summaries[submission_id].ci_low,
+                "ci_high": summaries[submission_id].ci_high,
+                "score_std": summaries[submission_id].std
+            }
+            for submission_id in ranked_ids
+        }
         
-    def get_rankings(self, category: AgentCategory = None) -> List[Dict[str, Any]]:
-        """Get current agent rankings, optionally filtered by category"""
-        rankings = []
+        bands = significance_bands([statistics[submission_id] for submission_id in ranked_ids])
+        for submission_id, band, next_id in zip(ranked_ids, bands, ranked_ids[1:] + [None]):
+            statistics[submission_id]["band"] = band
+            statistics[submission_id]["p_beats_next"] = (
+                float(self.bootstrap.win_probabilities(summaries, [submission_id, next_id])[0, 1])
+                if next_id else None
+            )
+            
+        return statistics
+    
+    def get_win_probabilities(self, category: AgentCategory) -> Dict[str, Any]:
+        """Pairwise probabilities that one submission outscores another"""
+        task_scores = self.index.task_scores(category.value)
+        submission_ids = list(task_scores)
+        summaries = self.bootstrap.summarize(task_scores)
+        return {
+            "submission_ids": submission_ids,
+            "probabilities": self.bootstrap.win_probabilities(summaries, submission_ids).tolist()
+        }
+    
+    def get_top_rankings(self, limit: int = 3) -> Dict[AgentCategory, List[Dict[str, Any]]]:
+        """Get the top rankings of every category in a single pass"""
+        top = self._cache.get(
+            ("top", limit),
+            self.get_version()[0],
+            lambda: self.index.top_by_category(limit)
+        )
+        return {category: top.get(category.value, []) for category in AgentCategory}
+    
+    def count_submissions(self, category: AgentCategory = None) -> int:
+        """Number of ranked submissions, optionally filtered by category"""
+        category_value = category.value if category else None
+        return self._cache.get(
+            ("count", category_value),
+            self.get_version()[0],
+            lambda: self.index.category_count(category_value)
+        )
+    
+    def get_score_matrix(self, category: AgentCategory) -> ScoreMatrix:
+        """Dense metric matrix of every submission in a category"""
+        return self._cache.get(
+            ("matrix", category.value),
+            self.get_version()[0],
+            lambda: ScoreMatrix.from_rows(self.index.metric_rows(category.value))
+        )
+    
+    def rerank(self,
+               category: AgentCategory,
+               weights: Dict[str, float] = None) -> List[Dict[str, Any]]:
+        """Rank a category under a different weight vector
+        
+        Scores are a single weighted reduction over the cached metric
+        matrix, so exploring what-if weights never rereads submissions.
+        Metrics without a weight count with 1.0, as in category scoring.
+        Bootstrap statistics are only kept under the category weights they
+        were computed with.
+        """
+        default_weights = weights is None
+        if default_weights:
+            weights = self._get_category_weights(category.value)
+            
+        entries = {
+            entry["submission_id"]: (
+                entry if default_weights else {
+                    key: value for key, value in entry.items()
+                    if key not in STATISTIC_KEYS
+                }
+            )
+            for entry in self.get_rankings(category)
+        }
+        return [
+            dict(entries[ranked["submission_id"]], score=ranked["score"])
+            for ranked in self.get_score_matrix(category).rank(weights)
+        ]
+    
+    def get_version(self) -> Tuple[int, float]:
+        """Change counter and last-modified time of the rankings
+        
+        The counter is bumped whenever a submission is registered or
+        verified, so it can be used to validate caches and ETags.
+        """
+        self._ensure_populated()
+        return self.index.version()
+    
+    def _ensure_populated(self):
+        """Fill a fresh index from the submissions on disk, once
+        
+        Tracked by an explicit flag rather than the change counter, which a
+        submission registered before the first read has already bumped.
+        """
+        if not self.index.populated():
+            self.rebuild_index()
+    
+    def index_submission(self,
+                         submission_id: str,
+                         metadata: Dict[str, Any] = None,
+                         results: Dict[str, Any] = None):
+        """Add or refresh a single submission in the rankings index"""
+        self._ensure_populated()
+        self.index.upsert(self._build_entry(submission_id, metadata, results))
+        
+    def update_verification(self, submission_id: str, passed: bool):
+        """Record a submission's verification status in the index"""
+        self._ensure_populated()
+        self.index.set_verified(submission_id, passed)
+        
+    def rebuild_index(self) -> int:
+        """Rebuild the rankings index from the submissions on disk"""
+        entries = []
         
         for submission_id in os.listdir(self.storage_path):
             submission_path = os.path.join(self.storage_path, submission_id)
@@ -29,120 +245,122 @@ class Leaderboard:
                 continue
                 
             try:
-                # Load metadata
-                with open(os.path.join(submission_path, "metadata.json")) as f:
-                    metadata = json.load(f)
-                    
-                # Skip if category doesn't match
-                if category and metadata.get("category") != category.value:
-                    continue
-                    
-                # Load results    
-                with open(os.path.join(submission_path, "results.json")) as f:
-                    results = json.load(f)
-                    
-                # Check verification status
-                verification_path = os.path.join(submission_path, "verification.json")
-                verified = os.path.exists(verification_path)
-                if verified:
-                    with open(verification_path) as f:
-                        verification = json.load(f)
-                        verified = verification["passed"]
-                
-                rankings.append({
-                    "submission_id": submission_id,
-                    "agent_name": metadata["agent_name"],
-                    "category": metadata["category"],
-                    "submitted_at": metadata["submitted_at"],
-                    "score": self._calculate_category_score(results, metadata["category"]),
-                    "verified": verified,
-                    "task_count": len(results["tasks"])
-                })
-                
+                entries.append(self._build_entry(submission_id))
             except Exception as e:
                 print(f"Error loading submission {submission_id}: {e}")
                 continue
                 
-        # Sort by score
-        rankings.sort(key=lambda x: x["score"], reverse=True)
-        return rankings
-
-    def _calculate_category_score(self, results: Dict[str, Any], category: str) -> float:
-        """Calculate score based on category-specific metrics"""
-        scores = []
+        self.index.replace_all(entries)
+        return len(entries)
+    
+    def _build_entry(self,
+                     submission_id: str,
+                     metadata: Dict[str, Any] = None,
+                     results: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Build an index entry, loading anything not passed in from disk"""
+        submission_path = os.path.join(self.storage_path, submission_id)
         
-        for task in results["tasks"]:
-            if "evaluation" in task:
-                # Weight different metrics based on category
-                weights = self._get_category_weights(category)
-                weighted_score = sum(
-                    score * weights.get(metric, 1.0)
-                    for metric, score in task["evaluation"].items()
-                )
-                scores.append(weighted_score / sum(weights.values()))
+        if metadata is None:
+            metadata = read_json(os.path.join(submission_path, "metadata.json"))
+                
+        if results is None:
+            results = read_json(os.path.join(submission_path, "results.json"))
+                
+        # Check verification status
+        verification_path = os.path.join(submission_path, "verification.json")
+        verified = find_json(verification_path) is not None
+        if verified:
+            verified = read_json(verification_path)["passed"]
                 
-        return sum(scores) / len(scores) if scores else 0
+        means = metric_means(results)
+        return {
+            "submission_id": submission_id,
+            "agent_name": metadata["agent_name"],
+            "category": metadata["category"],
+            "submitted_at": metadata["submitted_at"],
+            "score": self._calculate_category_score(results, metadata["category"], means),
+            "verified": verified,
+            "task_count": len(results["tasks"]),
+            "metrics": means,
+            "task_scores": self._calculate_task_scores(results, metadata["category"]),
+            **efficiency(results)
+        }
 
+    def _calculate_category_score(self,
+                                  results: Dict[str, Any],
+                                  category: str,
+                                  means: Dict[str, float] = None) -> float:
+        """Calculate score based on category-specific metrics"""
+        if means is None:
+            means = metric_means(results)
+            
+        # The weighted mean of per-metric means equals the mean of the
+        # per-task weighted scores
+        weights = self._get_category_weights(category)
+        weighted_score = sum(
+            mean * weights.get(metric, 1.0)
+            for metric, mean in means.items()
+        )
+        return weighted_score / sum(weights.values())
+
+    def _calculate_task_scores(self, results: Dict[str, Any], category: str) -> List[float]:
+        """Weighted score of every evaluated task, averaged into the category score"""
+        weights = self._get_category_weights(category)
+        total_weight = sum(weights.values())
+        return [
+            sum(score * weights.get(metric, 1.0) for metric, score in task["evaluation"].items())
+            / total_weight
+            for task in results["tasks"]
+            if "evaluation" in task
+        ]
+        
     def _get_category_weights(self, category: str) -> Dict[str, float]:
         """Get metric weights for different categories"""
-        weights = {
-            "sales_development": {
-                "conversation_quality": 2.0,
-                "lead_qualification": 2.0,
-                "response_relevance": 1.5,
-                "follow_up_strategy": 1.5
-            },
-            "marketing": {
-                "content_quality": 2.0,
-                "audience_targeting": 2.0,
-                "campaign_strategy": 1.5,
-                "creativity": 1.5
-            },
-            "customer_support": {
-                "resolution_quality": 2.0,
-                "response_time": 1.5,
-                "empathy": 2.0,
-                "accuracy": 1.5
-            },
-            "business_analyst": {
-                "insight_depth": 2.0,
-                "data_coverage": 1.5,
-                "actionability": 2.0,
-                "methodology": 1.5
-            },
-            "recruiter": {
-                "candidate_matching": 2.0,
-                "communication": 1.5,
-                "evaluation_quality": 2.0,
-                "process_efficiency": 1.5
-            },
-            "general_purpose": {
-                "task_completion": 1.0,
-                "output_quality": 1.0,
-                "efficiency": 1.0,
-                "adaptability": 1.0
-            }
-        }
-        return weights.get(category, weights["general_purpose"])
+        return CATEGORY_WEIGHTS.get(category, CATEGORY_WEIGHTS["general_purpose"])
         
     def get_submission_details(self, submission_id: str) -> Dict[str, Any]:
         """Get detailed results for a submission"""
+        return self._cache.get(
+            ("details", submission_id),
+            self.get_submission_version(submission_id),
+            lambda: self._load_submission_details(submission_id)
+        )
+    
+    def get_submission_version(self, submission_id: str) -> Tuple[Optional[float], ...]:
+        """Modification times of a submission's files, used for cache validation"""
+        submission_path = os.path.join(self.storage_path, submission_id)
+        mtimes = []
+        for filename in ("metadata.json", "results.json", "verification.json"):
+            path = find_json(os.path.join(submission_path, filename))
+            mtimes.append(os.stat(path).st_mtime if path else None)
+        return tuple(mtimes)
+    
+    def _load_submission_details(self, submission_id: str) -> Dict[str, Any]:
         submission_path = os.path.join(self.storage_path, submission_id)
         
-        with open(os.path.join(submission_path, "metadata.json")) as f:
-            metadata = json.load(f)
-            
-        with open(os.path.join(submission_path, "results.json")) as f:
-            results = json.load(f)
+        metadata = read_json(os.path.join(submission_path, "metadata.json"))
+        # Spilled task outputs stay on disk until a BlobRef is loaded
+        results = ResultStore(os.path.join(submission_path, BLOBS_DIRNAME)).hydrate(
+            read_json(os.path.join(submission_path, "results.json"))
+        )
             
         verification_path = os.path.join(submission_path, "verification.json")
         verification = None
-        if os.path.exists(verification_path):
-            with open(verification_path) as f:
-                verification = json.load(f)
+        if find_json(verification_path):
+            verification = read_json(verification_path)
                 
         return {
             "metadata": metadata,
             "results": results,
             "verification": verification
-        } 
\ No newline at end of file
+        }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the leaderboard index")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--storage-path", default="submissions")
+    args = parser.parse_args()
+    
+    if args.command == "rebuild":
+        count = Leaderboard(args.storage_path).rebuild_index()
+        print(f"Indexed {count} submissions")
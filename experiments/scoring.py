@@ -0,0 +1,92 @@
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
+import numpy as np
+
+def metric_means(results: Dict[str, Any]) -> Dict[str, float]:
+    """Mean of every metric over the evaluated tasks of a submission
+
+    A metric missing from some task evaluations counts as zero for those
+    tasks, so a weighted sum of these means equals the mean of the per-task
+    weighted sums.
+    """
+    totals: Dict[str, float] = {}
+    evaluated = 0
+
+    for task in results["tasks"]:
+        if "evaluation" in task:
+            evaluated += 1
+            for metric, score in task["evaluation"].items():
+                totals[metric] = totals.get(metric, 0.0) + score
+
+    if not evaluated:
+        return {}
+    return {metric: total / evaluated for metric, total in totals.items()}
+
+def efficiency(results: Dict[str, Any]) -> Dict[str, Optional[float]]:
+    """Measured agent latency and token usage of a submission
+
+    Latency percentiles come from the run-wide agent call telemetry; tokens
+    per task average the per-task telemetry of tasks that reported usage.
+    Submissions recorded without telemetry get None for everything.
+    """
+    wall_time = (results.get("telemetry", {}).get("agent") or {}).get("wall_time") or {}
+
+    tokens = []
+    for task in results["tasks"]:
+        usage = (task.get("telemetry") or {}).get("agent") or {}
+        counts = [usage.get("input_tokens"), usage.get("output_tokens")]
+        if any(count is not None for count in counts):
+            tokens.append(sum(count or 0 for count in counts))
+
+    return {
+        "latency_p50": wall_time.get("p50"),
+        "latency_p99": wall_time.get("p99"),
+        "tokens_per_task": sum(tokens) / len(tokens) if tokens else None
+    }
+
+@dataclass
+class ScoreMatrix:
+    """Dense submissions x metrics matrix of metric means for one category"""
+    submission_ids: List[str]
+    metrics: List[str]
+    values: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Dict[str, Dict[str, float]]) -> "ScoreMatrix":
+        """Build the matrix from ``{submission_id: {metric: mean}}``"""
+        submission_ids = list(rows)
+        metrics = sorted({metric for means in rows.values() for metric in means})
+        columns = {metric: position for position, metric in enumerate(metrics)}
+
+        values = np.zeros((len(submission_ids), len(metrics)))
+        for row, submission_id in enumerate(submission_ids):
+            for metric, mean in rows[submission_id].items():
+                values[row, columns[metric]] = mean
+
+        return cls(submission_ids, metrics, values)
+
+    def weight_vector(self, weights: Dict[str, float], default: float = 1.0) -> np.ndarray:
+        """Align a weights dict with the matrix columns"""
+        return np.array([weights.get(metric, default) for metric in self.metrics])
+
+    def scores(self, weights: Dict[str, float], normalizer: Optional[float] = None) -> np.ndarray:
+        """Weighted scores for every submission as one matrix-vector product
+
+        ``normalizer`` defaults to the sum of ``weights``, matching how
+        category scores are normalised.
+        """
+        if normalizer is None:
+            normalizer = sum(weights.values())
+        if not self.metrics:
+            return np.zeros(len(self.submission_ids))
+        return self.values @ self.weight_vector(weights) / normalizer
+
+    def rank(self, weights: Dict[str, float], normalizer: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Submission IDs and scores ordered best first"""
+        scores = self.scores(weights, normalizer)
+        # Stable sort on the negated scores keeps ties in submission order
+        order = np.argsort(-scores, kind="stable")
+        return [
+            {"submission_id": self.submission_ids[row], "score": float(scores[row])}
+            for row in order
+        ]
@@ -0,0 +1,128 @@
+from typing import Dict, Any, List
+from dataclasses import dataclass
+import hashlib
+import threading
+import numpy as np
+
+@dataclass
+class BootstrapSummary:
+    """Bootstrap distribution of a submission's mean task score"""
+    mean: float
+    std: float
+    ci_low: float
+    ci_high: float
+    quantiles: np.ndarray
+
+class BootstrapEngine:
+    """Vectorized bootstrap confidence intervals over per-task scores
+
+    Resampling is expressed as a multinomial count matrix shared by every
+    submission with the same number of tasks, so the bootstrap means of a
+    whole batch are one matrix product. Only a quantile sketch of each
+    distribution is kept, cached per submission and recomputed only when
+    its scores change.
+    """
+
+    def __init__(self,
+                 resamples: int = 10000,
+                 confidence: float = 0.95,
+                 sketch_size: int = 201,
+                 seed: int = 0,
+                 chunk_elements: int = 4_000_000):
+        self.resamples = resamples
+        self.confidence = confidence
+        self.seed = seed
+        self.chunk_elements = chunk_elements
+        self._levels = np.linspace(0.0, 1.0, sketch_size)
+        self._cache: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def summarize(self, task_scores: Dict[str, np.ndarray]) -> Dict[str, BootstrapSummary]:
+        """Bootstrap summaries for every submission, reusing cached ones"""
+        summaries = {}
+        pending: Dict[int, List[tuple]] = {}
+
+        with self._lock:
+            for submission_id, scores in task_scores.items():
+                scores = np.asarray(scores, dtype=float)
+                fingerprint = hashlib.sha1(scores.tobytes()).hexdigest()
+                cached = self._cache.get(submission_id)
+                if cached and cached[0] == fingerprint:
+                    summaries[submission_id] = cached[1]
+                else:
+                    pending.setdefault(len(scores), []).append((submission_id, fingerprint, scores))
+
+        for size, batch in pending.items():
+            computed = self._summarize_batch(size, [scores for _, _, scores in batch])
+            with self._lock:
+                for (submission_id, fingerprint, _), summary in zip(batch, computed):
+                    self._cache[submission_id] = (fingerprint, summary)
+                    summaries[submission_id] = summary
+
+        return summaries
+
+    def win_probabilities(self,
+                          summaries: Dict[str, BootstrapSummary],
+                          submission_ids: List[str]) -> np.ndarray:
+        """Matrix of P(mean of row submission > mean of column submission)"""
+        grids = np.stack([summaries[submission_id].quantiles for submission_id in submission_ids])
+        probabilities = np.empty((len(submission_ids), len(submission_ids)))
+
+        for column, grid in enumerate(grids):
+            # Share of each row's distribution above this column's, ties split
+            below = np.searchsorted(grid, grids, side="left")
+            at_or_below = np.searchsorted(grid, grids, side="right")
+            probabilities[:, column] = ((below + at_or_below) / (2 * len(grid))).mean(axis=1)
+
+        np.fill_diagonal(probabilities, 0.5)
+        return probabilities
+
+    def _summarize_batch(self, size: int, batch: List[np.ndarray]) -> List[BootstrapSummary]:
+        """Bootstrap all submissions that share the same number of tasks"""
+        if size == 0:
+            empty = BootstrapSummary(0.0, 0.0, 0.0, 0.0, np.zeros(len(self._levels)))
+            return [empty] * len(batch)
+
+        # One resampling plan per task count keeps results independent of
+        # which other submissions happen to be in the batch
+        rng = np.random.default_rng([self.seed, size])
+        counts = rng.multinomial(size, np.full(size, 1.0 / size), size=self.resamples)
+        weights = counts.T / size
+
+        scores = np.stack(batch)
+        alpha = (1.0 - self.confidence) / 2
+        rows_per_chunk = max(1, self.chunk_elements // self.resamples)
+        summaries = []
+
+        for start in range(0, len(scores), rows_per_chunk):
+            means = scores[start:start + rows_per_chunk] @ weights
+            sketches = np.quantile(means, self._levels, axis=1).T
+            bounds = np.quantile(means, [alpha, 1.0 - alpha], axis=1).T
+            spreads = means.std(axis=1)
+            rows = scores[start:start + rows_per_chunk]
+            for row, sketch, (low, high), spread in zip(rows, sketches, bounds, spreads):
+                summaries.append(BootstrapSummary(
+                    mean=float(row.mean()),
+                    std=float(spread),
+                    ci_low=float(low),
+                    ci_high=float(high),
+                    quantiles=sketch
+                ))
+
+        return summaries
+
+def significance_bands(entries: List[Dict[str, Any]]) -> List[int]:
+    """Group score-ordered entries into bands of statistically tied ranks
+
+    An entry joins the current band while its upper bound reaches the band
+    leader's lower bound; otherwise it starts a new band.
+    """
+    bands = []
+    band = 0
+    leader_low = None
+    for entry in entries:
+        if leader_low is None or entry["ci_high"] < leader_low:
+            band += 1
+            leader_low = entry["ci_low"]
+        bands.append(band)
+    return bands
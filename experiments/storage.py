@@ -0,0 +1,81 @@
+from typing import Any, Callable, Optional
+from contextlib import contextmanager
+import gzip
+import io
+import json
+import os
+import tempfile
+
+COMPRESSED_SUFFIX = ".gz"
+
+@contextmanager
+def atomic_open(path: str, compress: bool = False):
+    """Open a text file that only appears at ``path`` once fully written
+
+    Data goes to a temporary file in the same directory, which is flushed,
+    fsynced and renamed over ``path`` on success and removed on failure, so
+    readers never see a partially written file.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            stream = gzip.GzipFile(fileobj=raw, mode="wb") if compress else raw
+            text = io.TextIOWrapper(stream, encoding="utf-8")
+            yield text
+            text.flush()
+            text.detach()
+            if compress:
+                stream.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+        # mkstemp creates owner-only files; submissions are meant to be shared
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def write_json(path: str,
+               data: Any,
+               compress: bool = False,
+               indent: Optional[int] = None,
+               default: Callable[[Any], Any] = str) -> str:
+    """Atomically write JSON, streaming it chunk by chunk
+
+    With ``compress`` the file is gzipped and stored as ``path + ".gz"``;
+    any copy in the other format is removed so readers see one version.
+    Returns the path written.
+    """
+    target = path + COMPRESSED_SUFFIX if compress else path
+    stale = path if compress else path + COMPRESSED_SUFFIX
+
+    encoder = json.JSONEncoder(indent=indent, default=default)
+    with atomic_open(target, compress=compress) as f:
+        for chunk in encoder.iterencode(data):
+            f.write(chunk)
+
+    if os.path.exists(stale):
+        os.remove(stale)
+    return target
+
+def find_json(path: str) -> Optional[str]:
+    """Locate a JSON file stored plain or compressed"""
+    if os.path.exists(path):
+        return path
+    if os.path.exists(path + COMPRESSED_SUFFIX):
+        return path + COMPRESSED_SUFFIX
+    return None
+
+def read_json(path: str) -> Any:
+    """Read JSON written by write_json, decompressing transparently"""
+    found = find_json(path)
+    if found is None:
+        raise FileNotFoundError(path)
+
+    if found.endswith(COMPRESSED_SUFFIX):
+        with gzip.open(found, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    with open(found, encoding="utf-8") as f:
+        return json.load(f)
@@ -1,80 +1,246 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass
+import asyncio
+import math
 import random
-import json
 import os
 from datetime import datetime
+from experiments.leaderboard import Leaderboard
+from experiments.storage import read_json, write_json
+
+@dataclass
+class SequentialTest:
+    """Wald sequential probability ratio test on task reproducibility
+
+    Each re-run task either reproduces its submitted score within
+    ``tolerance`` or not. The test weighs H0 (a share ``p_reproduce`` of
+    tasks reproduce) against H1 (only ``p_fail`` do) and stops as soon as
+    the evidence crosses the bounds set by ``alpha`` and ``beta``.
+    """
+    tolerance: float = 0.1
+    p_reproduce: float = 0.9
+    p_fail: float = 0.5
+    alpha: float = 0.05
+    beta: float = 0.05
+
+    @property
+    def fail_bound(self) -> float:
+        return math.log((1 - self.beta) / self.alpha)
+
+    @property
+    def pass_bound(self) -> float:
+        return math.log(self.beta / (1 - self.alpha))
+
+    def update(self, log_ratio: float, reproduced: bool) -> float:
+        """Add one task outcome to the log-likelihood ratio of H1 over H0"""
+        if reproduced:
+            return log_ratio + math.log(self.p_fail / self.p_reproduce)
+        return log_ratio + math.log((1 - self.p_fail) / (1 - self.p_reproduce))
+
+    def decide(self, log_ratio: float) -> Optional[str]:
+        if log_ratio >= self.fail_bound:
+            return "fail"
+        if log_ratio <= self.pass_bound:
+            return "pass"
+        return None
+
+class VerificationBudget:
+    """Task re-run budget shared by concurrent verifications"""
+
+    def __init__(self, max_task_runs: Optional[int] = None):
+        self.remaining = max_task_runs
+
+    def acquire(self) -> bool:
+        if self.remaining is None:
+            return True
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
 
 class VerificationRunner:
     """Runs verification checks on submitted results"""
     
-    def __init__(self, benchmark_runner, storage_path: str = "submissions"):
+    def __init__(self,
+                 benchmark_runner,
+                 storage_path: str = "submissions",
+                 test: SequentialTest = None):
         self.benchmark_runner = benchmark_runner
         self.storage_path = storage_path
+        self.test = test or SequentialTest()
         
     async def verify_submission(self,
                               submission_id: str,
                               agent,
-                              sample_size: int = 3) -> Dict[str, Any]:
-        """Verify a submission by re-running subset of tasks"""
+                              sample_size: int = None,
+                              budget: VerificationBudget = None,
+                              semaphore: asyncio.Semaphore = None,
+                              seed: int = None,
+                              initialize_sources: bool = True) -> Dict[str, Any]:
+        """Verify a submission by re-running tasks until the test decides
+        
+        Tasks are re-run one at a time in random order and fed into the
+        sequential test, stopping as soon as it passes or fails the
+        submission. ``sample_size`` caps the number of re-runs.
+        
+        Only a pass or fail decision is saved and reaches the leaderboard;
+        an inconclusive or budget-exhausted verification leaves the
+        submission pending and reports ``passed`` as None. Data sources
+        are initialized once up front unless ``initialize_sources`` is off.
+        """
         
         # Load submitted results
         results_path = os.path.join(self.storage_path, submission_id, "results.json")
-        with open(results_path) as f:
-            submitted_results = json.load(f)
+        submitted_results = read_json(results_path)
+        submitted_scores = self._extract_task_scores(submitted_results)
             
-        # Sample tasks to verify
-        tasks = self.benchmark_runner.tasks
-        verify_tasks = random.sample(tasks, min(sample_size, len(tasks)))
-        
-        # Run verification
-        verify_results = await self.benchmark_runner.run_benchmark(
-            agent,
-            tasks=verify_tasks
-        )
+        # Only tasks with a submitted score can be compared
+        tasks = [t for t in self.benchmark_runner.tasks if t.name in submitted_scores]
+        random.Random(seed).shuffle(tasks)
+        if sample_size is not None:
+            tasks = tasks[:sample_size]
+            
+        if initialize_sources:
+            for ds in self.benchmark_runner.data_sources:
+                await ds.initialize()
+                
+        budget = budget or VerificationBudget()
+        log_ratio = 0.0
+        decision = None
+        verified_scores = {}
+        
+        for task in tasks:
+            if not budget.acquire():
+                decision = "budget_exhausted"
+                break
+                
+            # Run verification
+            if semaphore:
+                async with semaphore:
+                    verify_results = await self.benchmark_runner.run_benchmark(
+                        agent, tasks=[task], initialize_sources=False
+                    )
+            else:
+                verify_results = await self.benchmark_runner.run_benchmark(
+                    agent, tasks=[task], initialize_sources=False
+                )
+                
+            score = self._extract_task_scores(verify_results).get(task.name)
+            verified_scores[task.name] = score
+            log_ratio = self.test.update(
+                log_ratio,
+                self._reproduced(submitted_scores[task.name], score)
+            )
+            
+            decision = self.test.decide(log_ratio)
+            if decision:
+                break
+                
+        decided = decision in ("pass", "fail")
+        passed = decision == "pass" if decided else None
         
         # Compare results
-        comparison = self._compare_results(submitted_results, verify_results)
+        comparison = self._compare_results(submitted_scores, verified_scores)
+        comparison["log_likelihood_ratio"] = log_ratio
         
         # Save verification results
         verification = {
             "timestamp": datetime.now().isoformat(),
-            "tasks_verified": [t.name for t in verify_tasks],
+            "tasks_verified": list(verified_scores),
             "comparison": comparison,
-            "passed": comparison["score_diff"] <= 0.1  # Within 10% tolerance
+            "decision": decision or "inconclusive",
+            "passed": passed
         }
         
-        self._save_verification(submission_id, verification)
+        if decided:
+            self._save_verification(submission_id, verification)
         
         return verification
+    
+    async def verify_pending(self,
+                             agents: Dict[str, Any],
+                             max_task_runs: int = None,
+                             max_concurrency: int = 4,
+                             seed: int = None) -> Dict[str, Dict[str, Any]]:
+        """Verify many submissions concurrently under one shared budget
+        
+        ``agents`` maps submission IDs to the agents to re-run. At most
+        ``max_concurrency`` task re-runs are in flight at once across all
+        submissions, and ``max_task_runs`` bounds the total re-runs.
+        """
+        budget = VerificationBudget(max_task_runs)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        # Shared by every verification, so initialized once for all of them
+        for ds in self.benchmark_runner.data_sources:
+            await ds.initialize()
+        
+        submission_ids = list(agents)
+        outcomes = await asyncio.gather(*[
+            self.verify_submission(
+                submission_id,
+                agents[submission_id],
+                budget=budget,
+                semaphore=semaphore,
+                seed=seed,
+                initialize_sources=False
+            )
+            for submission_id in submission_ids
+        ], return_exceptions=True)
+        
+        verifications = {}
+        for submission_id, outcome in zip(submission_ids, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"Error verifying submission {submission_id}: {outcome}")
+                continue
+            verifications[submission_id] = outcome
+        return verifications
+        
+    def _reproduced(self, submitted: float, verified: Optional[float]) -> bool:
+        """Whether a re-run score is within tolerance of the submitted one"""
+        if verified is None:
+            return False
+        return abs(submitted - verified) <= self.test.tolerance * max(abs(submitted), 1e-9)
         
     def _compare_results(self,
-                        submitted: Dict[str, Any],
-                        verified: Dict[str, Any]) -> Dict[str, Any]:
-        """Compare submitted vs verified results"""
+                        submitted: Dict[str, float],
+                        verified: Dict[str, Optional[float]]) -> Dict[str, Any]:
+        """Compare submitted vs verified scores of the re-run tasks"""
         
-        submitted_scores = self._extract_scores(submitted)
-        verified_scores = self._extract_scores(verified)
+        compared = [name for name, score in verified.items() if score is not None]
+        submitted_scores = [submitted[name] for name in compared]
+        verified_scores = [verified[name] for name in compared]
+        
+        submitted_avg = sum(submitted_scores) / len(submitted_scores) if compared else 0.0
+        verified_avg = sum(verified_scores) / len(verified_scores) if compared else 0.0
         
         return {
-            "submitted_avg": sum(submitted_scores) / len(submitted_scores),
-            "verified_avg": sum(verified_scores) / len(verified_scores),
-            "score_diff": abs(submitted_scores[0] - verified_scores[0]) / submitted_scores[0],
+            "submitted_avg": submitted_avg,
+            "verified_avg": verified_avg,
+            "score_diff": (
+                abs(submitted_avg - verified_avg) / submitted_avg
+                if submitted_avg else abs(verified_avg)
+            ),
             "details": {
-                "submitted": submitted_scores,
-                "verified": verified_scores
+                "submitted": {name: submitted[name] for name in verified},
+                "verified": verified
             }
         }
         
-    def _extract_scores(self, results: Dict[str, Any]) -> List[float]:
-        """Extract evaluation scores from results"""
-        scores = []
+    def _extract_task_scores(self, results: Dict[str, Any]) -> Dict[str, float]:
+        """Extract evaluation scores from results, keyed by task name"""
+        scores = {}
         for task in results["tasks"]:
-            if "evaluation" in task:
-                scores.append(sum(task["evaluation"].values()) / len(task["evaluation"]))
+            if "evaluation" in task and task["evaluation"]:
+                scores[task["task_name"]] = sum(task["evaluation"].values()) / len(task["evaluation"])
         return scores
         
     def _save_verification(self, submission_id: str, verification: Dict[str, Any]):
         """Save verification results"""
         path = os.path.join(self.storage_path, submission_id, "verification.json")
-        with open(path, "w") as f:
-            json.dump(verification, f, indent=2) 
\ No newline at end of file
+        write_json(path, verification, indent=2)
+            
+        Leaderboard(self.storage_path).update_verification(
+            submission_id,
+            verification["passed"]
+        )
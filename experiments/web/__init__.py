@@ -1,28 +1,78 @@
-from flask import Flask, render_template, request
+from datetime import datetime, timezone
+from flask import Flask, render_template, request, make_response
 from experiments.leaderboard import Leaderboard, AgentCategory
 
 app = Flask(__name__)
 leaderboard = Leaderboard()
 
+def _conditional_response(etag: str, last_modified: float, render):
+    """Answer conditional GETs with 304 before doing any rendering"""
+    response = make_response("")
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = datetime.fromtimestamp(last_modified, tz=timezone.utc)
+
+    response.make_conditional(request)
+    if response.status_code != 304:
+        response.set_data(render())
+    return response
+
 @app.route("/")
 def index():
-    # Show overview of all categories
-    categories = [category for category in AgentCategory]
-    category_rankings = {
-        category: leaderboard.get_rankings(category)[:3]  # Top 3 per category
-        for category in categories
-    }
-    return render_template("index.html", category_rankings=category_rankings)
+    # Show overview of all categories, top 3 per category
+    generation, updated_at = leaderboard.get_version()
+    return _conditional_response(
+        f"index-{generation}",
+        updated_at,
+        lambda: render_template(
+            "index.html",
+            category_rankings=leaderboard.get_top_rankings(limit=3)
+        )
+    )
 
 @app.route("/leaderboard/<category>")
 def category_leaderboard(category):
     try:
         category_enum = AgentCategory(category)
-        rankings = leaderboard.get_rankings(category_enum)
-        return render_template(
-            "category_leaderboard.html",
-            category=category_enum,
-            rankings=rankings
+        page = max(request.args.get("page", 1, type=int), 1)
+        per_page = min(max(request.args.get("per_page", 50, type=int), 1), 500)
+        generation, updated_at = leaderboard.get_version()
+
+        def render():
+            rankings = leaderboard.get_rankings(
+                category_enum,
+                limit=per_page,
+                offset=(page - 1) * per_page
+            )
+            return render_template(
+                "category_leaderboard.html",
+                category=category_enum,
+                rankings=rankings,
+                page=page,
+                per_page=per_page,
+                total=leaderboard.count_submissions(category_enum)
+            )
+
+        return _conditional_response(
+            f"{category}-{page}-{per_page}-{generation}",
+            updated_at,
+            render
         )
     except ValueError:
-        return "Invalid category", 404 
\ No newline at end of file
+        return "Invalid category", 404
+
+@app.route("/submission/<submission_id>")
+def submission_details(submission_id):
+    version = leaderboard.get_submission_version(submission_id)
+    if version[0] is None:
+        return "Unknown submission", 404
+
+    mtimes = [mtime for mtime in version if mtime is not None]
+    return _conditional_response(
+        f"{submission_id}-" + "-".join(f"{mtime:.6f}" for mtime in mtimes),
+        max(mtimes),
+        lambda: render_template(
+            "submission.html",
+            details=leaderboard.get_submission_details(submission_id)
+        )
+    )
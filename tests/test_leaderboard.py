@@ -0,0 +1,60 @@
+import os
+from experiments import ExperimentRegistry
+from experiments.leaderboard import Leaderboard, AgentCategory
+from experiments.storage import write_json
+
+def _results(score: float):
+    return {
+        "tasks": [
+            {"task_name": f"task_{i}", "evaluation": {"task_completion": score + i % 2}}
+            for i in range(4)
+        ]
+    }
+
+def _metadata(agent_name: str):
+    return {
+        "agent_name": agent_name,
+        "category": "general_purpose",
+        "submitted_at": "2024-01-01T00:00:00"
+    }
+
+def _write_submission(storage_path: str, submission_id: str, score: float):
+    path = os.path.join(storage_path, submission_id)
+    os.makedirs(path)
+    write_json(os.path.join(path, "metadata.json"), _metadata(submission_id))
+    write_json(os.path.join(path, "results.json"), _results(score))
+
+def test_index_bootstraps_submissions_on_disk_before_first_upsert(tmp_path):
+    storage_path = str(tmp_path)
+    _write_submission(storage_path, "20240101_old", 5.0)
+
+    submission_id = ExperimentRegistry(storage_path).register_submission(
+        "new", _metadata("new"), _results(7.0)
+    )
+
+    rankings = Leaderboard(storage_path).get_rankings()
+    assert [entry["submission_id"] for entry in rankings] == [submission_id, "20240101_old"]
+
+def test_index_is_populated_once(tmp_path):
+    storage_path = str(tmp_path)
+    _write_submission(storage_path, "20240101_old", 5.0)
+    leaderboard = Leaderboard(storage_path)
+
+    generation = leaderboard.get_version()[0]
+    assert leaderboard.index.populated()
+    # Later reads do not rebuild, so the change counter stays put
+    assert leaderboard.get_version()[0] == generation
+    assert leaderboard.count_submissions() == 1
+
+def test_rerank_with_custom_weights_drops_statistics(tmp_path):
+    storage_path = str(tmp_path)
+    _write_submission(storage_path, "20240101_a", 5.0)
+    _write_submission(storage_path, "20240101_b", 7.0)
+    leaderboard = Leaderboard(storage_path)
+
+    default = leaderboard.rerank(AgentCategory.GENERAL)
+    assert all("ci_low" in entry for entry in default)
+
+    custom = leaderboard.rerank(AgentCategory.GENERAL, {"task_completion": 2.0})
+    assert [entry["submission_id"] for entry in custom] == ["20240101_b", "20240101_a"]
+    assert not any("ci_low" in entry or "band" in entry for entry in custom)
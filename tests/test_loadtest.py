@@ -0,0 +1,42 @@
+import asyncio
+import logging
+from benchmark.loadtest import LoadStage, LoadTester
+
+class Task:
+    name = "task"
+
+    async def run(self, agent, context):
+        return await agent.analyze(data=[], prompt="")
+
+    async def evaluate(self, result, judge_llm):
+        return {"quality": 1.0}
+
+class Runner:
+    def __init__(self):
+        self.tasks = [Task()]
+        self.data_sources = []
+        self.judge_llm = None
+        self.logger = logging.getLogger(__name__)
+
+class SlowAgent:
+    """Keeps up with any rate, answering each request after ``latency``"""
+
+    id = "slow"
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def analyze(self, data, prompt):
+        await asyncio.sleep(self.latency)
+        return {"analysis": "ok"}
+
+def test_slow_agent_that_keeps_up_is_not_saturated():
+    stage = LoadStage(duration=1.0, qps=20)
+    tester = LoadTester(Runner(), SlowAgent(0.4), [stage], seed=3)
+    results = asyncio.run(tester.run())
+    report = results["stages"][0]
+
+    assert report["drain_time"] > 0.2
+    assert report["throughput"] == report["completed"] / stage.duration
+    assert not report["saturated"], report["saturation_reasons"]
+    assert results["max_sustained_qps"] == report["throughput"]
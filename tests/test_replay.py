@@ -0,0 +1,24 @@
+from benchmark.battle.replay import ReplayWriter, ReplayReader
+
+def test_replay_writer_truncates_a_previous_run(tmp_path):
+    path = str(tmp_path / "rounds.log")
+    for run in range(2):
+        with ReplayWriter(path) as writer:
+            for round_num in range(3):
+                writer.append({"run": run, "round": round_num})
+
+    reader = ReplayReader(path)
+    assert len(reader) == 3
+    assert [record["run"] for record in reader] == [1, 1, 1]
+
+def test_replay_writer_appends_when_resuming(tmp_path):
+    path = str(tmp_path / "rounds.log")
+    with ReplayWriter(path) as writer:
+        writer.append({"round": 0})
+    # A torn offset from an interrupted append is dropped
+    with open(f"{path}.idx", "ab") as index:
+        index.write(b"\x00\x00")
+    with ReplayWriter(path, resume=True) as writer:
+        writer.append({"round": 1})
+
+    assert [record["round"] for record in ReplayReader(path)] == [0, 1]
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import pytest
+from benchmark.battle.teams import TeamBattle, AITeam, BusinessScenario
+
+STAGES = 3
+
+class Agent:
+    def __init__(self, answer: int):
+        self.answer = answer
+        self.calls = 0
+
+    async def act(self, data):
+        self.calls += 1
+        return {"answer": self.answer}
+
+class Scenario(BusinessScenario):
+    async def get_stage_data(self, stage: int):
+        return {"stage": stage}
+
+class Battle(TeamBattle):
+    """Fixed-length scenario scoring each team by its agents' answers"""
+
+    fail_at = None
+
+    def _parse_duration(self, duration: str) -> int:
+        return STAGES
+
+    async def _evaluate_stage(self, team_actions, objectives):
+        if self.fail_at is not None and len(os.listdir(self.checkpoint_dir)) == self.fail_at:
+            raise RuntimeError("judge unavailable")
+        return {
+            team: {"score": float(sum(action["answer"] for action in actions.values()))}
+            for team, actions in team_actions.items()
+        }
+
+def _battle(checkpoint_dir: str, agent: Agent) -> Battle:
+    return Battle(
+        teams=[AITeam("team", {"lead": agent}, "solo")],
+        scenario=Scenario("launch", "3 stages", ["grow"], {}),
+        collaboration_enabled=False,
+        checkpoint_dir=checkpoint_dir
+    )
+
+def test_completed_scenario_leaves_no_checkpoints(tmp_path):
+    agent = Agent(1)
+    asyncio.run(_battle(str(tmp_path), agent).execute())
+    assert os.listdir(tmp_path) == []
+
+    # Running it again calls the agents instead of replaying old stages
+    asyncio.run(_battle(str(tmp_path), agent).execute())
+    assert agent.calls == 2 * STAGES
+
+def test_interrupted_scenario_resumes_from_checkpoints(tmp_path):
+    battle = _battle(str(tmp_path), Agent(1))
+    battle.fail_at = 2
+    with pytest.raises(RuntimeError):
+        asyncio.run(battle.execute())
+    assert len(os.listdir(tmp_path)) == 2
+
+    agent = Agent(1)
+    results = asyncio.run(_battle(str(tmp_path), agent).execute())
+    assert agent.calls == 1
+    assert [stage["stage"] for stage in results["stages"]] == [0, 1, 2]
+
+def test_checkpoints_of_another_line_up_are_ignored(tmp_path):
+    battle = _battle(str(tmp_path), Agent(1))
+    battle.fail_at = 2
+    with pytest.raises(RuntimeError):
+        asyncio.run(battle.execute())
+
+    other = Agent(5)
+    other.version = "2"
+    results = asyncio.run(_battle(str(tmp_path), other).execute())
+    assert other.calls == STAGES
+    assert results["teams"]["team"]["score"]["mean"] == 5.0
@@ -0,0 +1,75 @@
+import pytest
+from benchmark.tasks.templates import TaskTemplate
+
+def _template():
+    # "noise" never appears in a rendered field, so every difficulty has ten
+    # identical variants
+    return TaskTemplate(
+        name="template",
+        description="Analyze {data_slice}",
+        prompt="Difficulty {difficulty}",
+        parameters={
+            "category": ["general_purpose"],
+            "data_slice": ["sales", "support"],
+            "difficulty": [1, 2, 3],
+            "noise": list(range(10))
+        }
+    )
+
+def test_shards_cover_the_deduplicated_grid_once():
+    template = _template()
+    single = [variant.fingerprint for variant in template.variants()]
+    shards = [
+        [variant.fingerprint for variant in template.variants(shard, 4)]
+        for shard in range(4)
+    ]
+    combined = [fingerprint for shard in shards for fingerprint in shard]
+
+    assert len(single) == 6
+    assert sorted(combined) == sorted(single)
+
+def test_duplicates_land_on_the_same_shard():
+    template = _template()
+    for shard in range(3):
+        variants = list(template.variants(shard, 3, deduplicate=False))
+        for variant in variants:
+            assert int(variant.fingerprint, 16) % 3 == shard
+    total = sum(len(list(template.variants(shard, 3, deduplicate=False))) for shard in range(3))
+    assert total == len(template)
+
+def test_sampled_shards_match_a_single_process():
+    template = _template()
+    single = {variant.index for variant in template.variants(sample_size=20, seed=7)}
+    sharded = {
+        variant.index
+        for shard in range(2)
+        for variant in template.variants(shard, 2, sample_size=20, seed=7)
+    }
+    assert sharded == single
+
+def test_literal_braces_are_kept():
+    template = TaskTemplate(
+        name="json",
+        description="Difficulty {difficulty}, unknown {placeholder}",
+        prompt='Return JSON like {"a": 1} at {rate:.0%}',
+        parameters={
+            "category": ["general_purpose"],
+            "data_slice": ["sales"],
+            "difficulty": [2],
+            "rate": [0.5]
+        }
+    )
+    fields = template.variant(0).fields
+
+    assert fields["prompt"] == 'Return JSON like {"a": 1} at 50%'
+    assert fields["description"] == "Difficulty 2, unknown {placeholder}"
+    assert fields["data_query"] == {"type": "sales"}
+
+def test_undeclared_required_placeholders_are_rejected():
+    with pytest.raises(ValueError, match="data_slice"):
+        TaskTemplate(
+            name="missing",
+            description="d",
+            prompt="p",
+            parameters={"category": ["general_purpose"]}
+        )
@@ -0,0 +1,53 @@
+import asyncio
+import pytest
+from benchmark.battle.core import AgentBattle
+from benchmark.battle.tournament import SwissTournament
+
+class Agent:
+    def __init__(self, quality: float):
+        self.quality = quality
+        self.calls = 0
+
+    async def act(self, data, opponent_actions=None):
+        self.calls += 1
+        return {"quality": self.quality}
+
+class Source:
+    async def get_data(self, query):
+        return {"round": query["round"]}
+
+async def score_quality(agent_actions, metrics):
+    return {
+        agent_id: {metric: action["quality"] for metric in metrics}
+        for agent_id, action in agent_actions.items()
+    }
+
+class QualityBattle(AgentBattle):
+    async def _evaluate_round(self, agent_actions, metrics):
+        return await score_quality(agent_actions, metrics)
+
+def _battle(battle_class=AgentBattle, **options) -> AgentBattle:
+    battle = battle_class(category="general_purpose", max_rounds=2, **options)
+    for position in range(4):
+        battle.register_agent(f"agent_{position}", Agent(float(position)))
+    return battle
+
+def test_tournament_ranks_agents_with_a_round_evaluator():
+    battle = _battle(round_evaluator=score_quality)
+    results = asyncio.run(battle.run_tournament(Source(), ["quality"]))
+    assert results["standings"][0]["agent_id"] == "agent_3"
+
+def test_tournament_uses_a_subclass_evaluation():
+    results = asyncio.run(_battle(QualityBattle).run_tournament(Source(), ["quality"]))
+    assert results["standings"][-1]["agent_id"] == "agent_0"
+
+def test_missing_evaluator_fails_before_any_agent_call():
+    battle = _battle()
+    with pytest.raises(ValueError):
+        asyncio.run(battle.run_tournament(Source(), ["quality"]))
+    with pytest.raises(ValueError):
+        asyncio.run(battle.run_competition(Source(), ["quality"]))
+    assert all(agent.calls == 0 for agent in battle.agents.values())
+
+    with pytest.raises(ValueError):
+        SwissTournament(category="general_purpose", agents=battle.agents)
@@ -0,0 +1,40 @@
+from benchmark.trajectories import TrajectoryWriter, TrajectoryReader
+
+def test_trajectory_steps_continue_after_reopen(tmp_path):
+    directory = str(tmp_path)
+    with TrajectoryWriter(directory) as writer:
+        writer.record("task", "started")
+        writer.record("task", "output")
+    with TrajectoryWriter(directory) as writer:
+        writer.record("task", "started")
+
+    events = TrajectoryReader(directory).get("task")
+    assert [event["step"] for event in events] == [0, 1, 2]
+
+def test_trajectory_frames_flush_when_round_changes_or_finishes(tmp_path):
+    writer = TrajectoryWriter(str(tmp_path))
+    writer.record("agent", "action", round=0)
+    writer.record("agent", "action", round=1)
+    assert list(writer._buffers) == [("agent", 1)]
+
+    writer.finish("agent", round=1)
+    assert not writer._buffers
+    # Finished frames are readable before the writer is closed
+    assert TrajectoryReader(str(tmp_path)).rounds("agent") == [0, 1]
+    writer.close()
+
+def test_torn_index_line_is_skipped_and_repaired(tmp_path):
+    directory = str(tmp_path)
+    with TrajectoryWriter(directory) as writer:
+        writer.record("task", "started")
+    with open(tmp_path / "trajectories.idx", "a", encoding="utf-8") as index:
+        index.write('{"task": "task", "ro')
+
+    # Readers skip the torn line left by an interrupted append
+    assert [event["step"] for event in TrajectoryReader(directory).get("task")] == [0]
+
+    # Writers cut it off instead of appending onto it
+    with TrajectoryWriter(directory) as writer:
+        writer.record("task", "output")
+    events = TrajectoryReader(directory).get("task")
+    assert [(event["step"], event["type"]) for event in events] == [(0, "started"), (1, "output")]
@@ -0,0 +1,95 @@
+import asyncio
+import os
+from experiments.verification import VerificationRunner, SequentialTest
+from experiments.storage import write_json
+
+SUBMITTED_SCORE = 5.0
+
+class Task:
+    def __init__(self, name: str):
+        self.name = name
+
+class Runner:
+    """Re-runs every task with a fixed score"""
+
+    def __init__(self, task_count: int, score: float):
+        self.tasks = [Task(f"task_{i}") for i in range(task_count)]
+        self.score = score
+        self.data_sources = []
+
+    async def run_benchmark(self, agent, tasks=None, initialize_sources=True):
+        return {
+            "tasks": [
+                {"task_name": task.name, "evaluation": {"metric": self.score}}
+                for task in tasks
+            ]
+        }
+
+def _submit(storage_path: str, submission_id: str = "submission", task_count: int = 30) -> str:
+    path = os.path.join(storage_path, submission_id)
+    os.makedirs(path)
+    write_json(os.path.join(path, "metadata.json"), {
+        "agent_name": submission_id,
+        "category": "general_purpose",
+        "submitted_at": "2024-01-01T00:00:00"
+    })
+    write_json(os.path.join(path, "results.json"), {
+        "tasks": [
+            {"task_name": f"task_{i}", "evaluation": {"metric": SUBMITTED_SCORE}}
+            for i in range(task_count)
+        ]
+    })
+    return path
+
+def _verify(storage_path: str, runner: Runner, **options):
+    verifier = VerificationRunner(runner, storage_path=storage_path, test=SequentialTest())
+    return asyncio.run(verifier.verify_submission("submission", agent=None, **options))
+
+def test_reproduced_scores_pass(tmp_path):
+    path = _submit(str(tmp_path))
+    verification = _verify(str(tmp_path), Runner(30, SUBMITTED_SCORE))
+
+    assert verification["decision"] == "pass"
+    assert verification["passed"] is True
+    assert os.path.exists(os.path.join(path, "verification.json"))
+
+def test_diverging_scores_fail(tmp_path):
+    path = _submit(str(tmp_path))
+    verification = _verify(str(tmp_path), Runner(30, SUBMITTED_SCORE * 2))
+
+    assert verification["decision"] == "fail"
+    assert verification["passed"] is False
+    assert os.path.exists(os.path.join(path, "verification.json"))
+
+def test_inconclusive_verification_stays_pending(tmp_path):
+    path = _submit(str(tmp_path))
+    verification = _verify(str(tmp_path), Runner(30, SUBMITTED_SCORE), sample_size=2)
+
+    assert verification["decision"] == "inconclusive"
+    assert verification["passed"] is None
+    assert not os.path.exists(os.path.join(path, "verification.json"))
+
+def test_exhausted_budget_stays_pending(tmp_path):
+    path = _submit(str(tmp_path))
+    verifier = VerificationRunner(Runner(30, SUBMITTED_SCORE), storage_path=str(tmp_path))
+    verifications = asyncio.run(verifier.verify_pending({"submission": None}, max_task_runs=0))
+
+    assert verifications["submission"]["decision"] == "budget_exhausted"
+    assert verifications["submission"]["passed"] is None
+    assert not os.path.exists(os.path.join(path, "verification.json"))
+
+def test_data_sources_are_initialized_once_per_batch(tmp_path):
+    class Source:
+        initialized = 0
+
+        async def initialize(self):
+            Source.initialized += 1
+
+    for submission_id in ("a", "b"):
+        _submit(str(tmp_path), submission_id)
+    runner = Runner(30, SUBMITTED_SCORE)
+    runner.data_sources = [Source()]
+
+    verifier = VerificationRunner(runner, storage_path=str(tmp_path))
+    asyncio.run(verifier.verify_pending({"a": None, "b": None}))
+    assert Source.initialized == 1